@@ -0,0 +1,407 @@
+#
+# (c) 2026 Yoichi Tanibayashi
+#
+"""Benchmarks of the hot paths.
+
+端末なしで実行でき、結果を JSON で保存して、コミット間で比較できる。
+
+```bash
+uv run python benchmarks/bench.py -o bench-old.json
+(変更)
+uv run python benchmarks/bench.py -o bench-new.json
+uv run python benchmarks/bench.py --compare bench-old.json bench-new.json
+```
+"""
+
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import timeit
+from collections.abc import Callable
+from typing import TextIO
+
+import click
+from loguru import logger
+
+from tmr import __version__
+from tmr.base_timer import BaseTimer
+from tmr.clock import VirtualClock
+from tmr.core import TimerCore
+from tmr.multi import MultiTimer
+from tmr.pomodoro import PomodoroConfig, PomodoroTimer
+from tmr.schedule import DeadlineQueue, ScheduleItem, ScheduleTimer
+from tmr.tty_writer import TtyWriter
+
+DISPLAY_WIDTHS = [40, 80, 160, 320]
+PBAR_LENS = [100, 1_000, 10_000]
+KEYS = ["KEY_RIGHT", "KEY_LEFT", "KEY_UP", "KEY_DOWN", " ", " "]
+BURST_KEYS = 100
+MULTI_TIMERS = [10, 100, 500]
+CORE_TIMERS = 10_000
+SCHEDULE_ITEMS = 10_000
+STARTUP_ARGS = [["--version"], ["--help"], ["t", "--help"]]
+
+DEF_THRESHOLD = 0.10  # 10% 以上遅くなったら regression
+
+
+def measure(fn: Callable[[], object], number: int, repeat: int) -> dict:
+    """Measure fn.
+
+    Returns:
+        dict: 1回あたりの時間 (usec) など。
+    """
+    times = timeit.Timer(fn).repeat(repeat=repeat, number=number)
+    per_call = [t / number * 1e6 for t in times]
+    return {
+        "number": number,
+        "repeat": repeat,
+        "min_us": min(per_call),
+        "median_us": statistics.median(per_call),
+    }
+
+
+def mk_timer(
+    stream: TextIO, title: str = "WORK       ", limit: float = 1500.0
+) -> BaseTimer:
+    """Timer that writes to stream (/dev/null)."""
+    timer = BaseTimer((title, "cyan"), limit)
+    timer.out = TtyWriter(stream=stream)
+    timer.pbar.out = timer.out
+    timer.is_active = True
+    return timer
+
+
+def set_width(timer: BaseTimer, width: int):
+    """Resize without SIGWINCH."""
+    timer.width = width
+    timer._layout_cache.clear()
+    timer.renderer.invalidate()
+
+
+def bench_display(quick: bool) -> dict:
+    """BaseTimer.display() at several terminal widths."""
+    ret = {}
+    with open(os.devnull, "w") as devnull:
+        for width in DISPLAY_WIDTHS:
+            timer = mk_timer(devnull)
+            set_width(timer, width)
+            step = 1.0 / timer.fps
+
+            def frame(timer=timer, step=step):
+                timer.t_elapsed = (timer.t_elapsed + step) % timer.t_limit
+                timer.display()
+
+            res = measure(frame, 200 if quick else 2_000, 3 if quick else 5)
+            res["bytes_per_frame"] = timer.out.bytes_written / (
+                res["number"] * res["repeat"]
+            )
+            ret[f"display_w{width}"] = res
+    return ret
+
+
+def bench_pbar(quick: bool) -> dict:
+    """ProgressBar.get_str() at large bar lengths."""
+    ret = {}
+    for bar_len in PBAR_LENS:
+        pbar = mk_timer(io.StringIO()).pbar  # 書き込まない
+        vals = [pbar.total * i / 97 for i in range(97)]
+        i = 0
+
+        def get_str(pbar=pbar, vals=vals, bar_len=bar_len):
+            nonlocal i
+            i = (i + 1) % len(vals)
+            pbar.get_str(vals[i], bar_len=bar_len)
+
+        ret[f"pbar_get_str_{bar_len}"] = measure(
+            get_str, 200 if quick else 2_000, 3 if quick else 5
+        )
+    return ret
+
+
+def bench_keys(quick: bool) -> dict:
+    """Key dispatch through key_map, and a burst of keys."""
+    with open(os.devnull, "w") as devnull:
+        timer = mk_timer(devnull)
+        key_map = timer.key_map
+
+        def dispatch():
+            for k in KEYS:
+                if k in key_map:
+                    key_map[k]()
+
+        res = measure(dispatch, 200 if quick else 5_000, 3 if quick else 5)
+        # キー1つあたりに直す
+        res["min_us"] /= len(KEYS)
+        res["median_us"] /= len(KEYS)
+
+        # キーリピートや貼り付け: 溜まったキーをまとめて処理して1回表示する
+        burst = ["KEY_RIGHT"] * BURST_KEYS
+
+        def burst_frame():
+            timer.t_start = timer.clock.monotonic()
+            timer.dispatch(burst)
+            timer.display()
+
+        res_burst = measure(
+            burst_frame, 100 if quick else 1_000, 3 if quick else 5
+        )
+        return {"key_dispatch": res, f"key_burst_{BURST_KEYS}": res_burst}
+
+
+def bench_pomodoro(quick: bool) -> dict:
+    """A whole Pomodoro session, frame by frame.
+
+    既定の設定 (25/5/15分 x 4) の全フェーズを、fps ごとに display() する。
+    """
+    config = PomodoroConfig(
+        work_sec=25 * 60.0,
+        break_sec=5 * 60.0,
+        long_break_sec=15 * 60.0,
+        cycles=1 if quick else 4,
+    )
+    phases = PomodoroTimer(config).phases()
+    with open(os.devnull, "w") as devnull:
+        timer = mk_timer(devnull)
+        frames = 0
+
+        def session():
+            nonlocal frames
+            frames = 0
+            for title, seconds, color in phases:
+                timer.reset((title, color), seconds)
+                timer.is_active = True
+                n = int(seconds * timer.fps)
+                for i in range(n + 1):
+                    timer.t_elapsed = seconds * i / n
+                    timer.display()
+                frames += n + 1
+
+        res = measure(session, 1, 1 if quick else 3)
+        res["frames"] = frames
+        res["us_per_frame"] = res["min_us"] / frames
+        return {"pomodoro_session": res}
+
+
+def bench_multi(quick: bool) -> dict:
+    """MultiTimer.display() with many timers on a 100x50 screen.
+
+    全ての行の風車が回る場合 (最悪の場合) の、1フレームの時間。
+    """
+    ret = {}
+    with open(os.devnull, "w") as devnull:
+        for n in MULTI_TIMERS:
+            clock = VirtualClock()
+            mt = MultiTimer(
+                [(f"timer{i}", 60.0 * (i + 1)) for i in range(n)],
+                clock=clock,
+            )
+            mt.out = TtyWriter(stream=devnull)
+            mt.width, mt.height = 100, 50
+            for row in mt.rows:
+                row.is_active = True
+            mt.redraw()
+            step = 1.0 / BaseTimer.DEF_FPS
+
+            def frame(clock=clock, mt=mt, step=step):
+                clock.t += step
+                mt.display()
+
+            res = measure(frame, 20 if quick else 200, 3 if quick else 5)
+            res["bytes_per_frame"] = mt.out.bytes_written / (
+                res["number"] * res["repeat"]
+            )
+            ret[f"multi_{n}"] = res
+    return ret
+
+
+def bench_core(quick: bool) -> dict:
+    """TimerCore.tick() of many timers (without display).
+
+    端末なしで、多数のタイマーを1つのループで進める場合の1周の時間。
+    """
+    cores = [TimerCore(60.0 * (i % 60 + 1)) for i in range(CORE_TIMERS)]
+    for core in cores:
+        core.start(0.0)
+    t = 0.0
+
+    def loop():
+        nonlocal t
+        t += 0.1
+        for core in cores:
+            core.tick(t)
+
+    res = measure(loop, 10 if quick else 100, 3 if quick else 5)
+    res["ns_per_tick"] = res["min_us"] * 1000 / CORE_TIMERS
+    return {f"core_tick_{CORE_TIMERS}": res}
+
+
+def bench_schedule(quick: bool) -> dict:
+    """DeadlineQueue and ScheduleTimer with many items.
+
+    締め切りの追加と取り消しの1回の時間と、予定が何千件あっても
+    待っているだけの間の、1フレームの時間。
+    """
+    ret = {}
+
+    q = DeadlineQueue()
+    for i in range(SCHEDULE_ITEMS):
+        q.add(float(i), i)
+
+    def add_cancel():
+        q.cancel(q.add(SCHEDULE_ITEMS / 2, None))
+
+    res = measure(add_cancel, 1000 if quick else 10000, 3 if quick else 5)
+    ret[f"deadline_add_cancel_{SCHEDULE_ITEMS}"] = res
+
+    with open(os.devnull, "w") as devnull:
+        clock = VirtualClock()
+        st = ScheduleTimer(
+            [
+                ScheduleItem(3600.0 + i, 60.0, f"item{i}", "cyan")
+                for i in range(SCHEDULE_ITEMS)
+            ],
+            clock=clock,
+        )
+        st.out = TtyWriter(stream=devnull)
+        st.begin(clock.monotonic())
+        st.redraw()
+
+        def frame():
+            clock.t += 1.0
+            st.display()
+            st.next_timeout()
+
+        res = measure(frame, 20 if quick else 200, 3 if quick else 5)
+    ret[f"schedule_idle_{SCHEDULE_ITEMS}"] = res
+    return ret
+
+
+def bench_startup(quick: bool) -> dict:
+    """CLI cold start."""
+    ret = {}
+    for args in STARTUP_ARGS:
+        cmd = [sys.executable, "-c", "from tmr.__main__ import cli; cli()"]
+
+        def run(cmd=cmd, args=args):
+            subprocess.run(cmd + args, check=True, capture_output=True)
+
+        ret["startup_" + "_".join(a.strip("-") for a in args)] = measure(
+            run, 1, 3 if quick else 10
+        )
+    return ret
+
+
+BENCHES = {
+    "display": bench_display,
+    "pbar": bench_pbar,
+    "keys": bench_keys,
+    "pomodoro": bench_pomodoro,
+    "multi": bench_multi,
+    "core": bench_core,
+    "schedule": bench_schedule,
+    "startup": bench_startup,
+}
+
+
+def git_commit() -> str:
+    """Current commit."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def compare(old: dict, new: dict, threshold: float) -> bool:
+    """Print the ratio of each result.
+
+    Returns:
+        bool: regression があれば True
+    """
+    regressed = False
+    click.echo(f"old: {old['commit']} {old['time']}")
+    click.echo(f"new: {new['commit']} {new['time']}")
+    for name, res in new["results"].items():
+        if name not in old["results"]:
+            continue
+        t_old = old["results"][name]["min_us"]
+        ratio = res["min_us"] / t_old if t_old > 0 else 1.0
+        mark = ""
+        if ratio > 1 + threshold:
+            mark = " REGRESSION"
+            regressed = True
+        click.echo(
+            f"{name:<24} {t_old:12.2f}us -> {res['min_us']:12.2f}us"
+            f" x{ratio:.2f}{mark}"
+        )
+    return regressed
+
+
+@click.command()
+@click.option("--output", "-o", type=click.Path(), help="JSON file")
+@click.option("--quick", "-q", is_flag=True, help="fewer iterations")
+@click.option(
+    "--only",
+    type=click.Choice(list(BENCHES)),
+    multiple=True,
+    help="run only these benchmarks",
+)
+@click.option(
+    "--compare",
+    "compare_files",
+    type=click.Path(exists=True),
+    nargs=2,
+    help="compare OLD.json NEW.json",
+)
+@click.option(
+    "--threshold",
+    type=float,
+    default=DEF_THRESHOLD,
+    show_default=True,
+    help="slowdown ratio regarded as a regression",
+)
+def main(output, quick, only, compare_files, threshold):
+    """Benchmarks of tmr."""
+    if compare_files:
+        with open(compare_files[0]) as f_old, open(compare_files[1]) as f_new:
+            old, new = json.load(f_old), json.load(f_new)
+        sys.exit(1 if compare(old, new, threshold) else 0)
+
+    logger.remove()  # ログ出力を計測に含めない
+
+    results: dict = {}
+    for name in only or BENCHES:
+        results.update(BENCHES[name](quick))
+
+    for name, res in results.items():
+        click.echo(
+            f"{name:<24} min {res['min_us']:12.2f}us"
+            f"  median {res['median_us']:12.2f}us"
+        )
+
+    if output:
+        data = {
+            "commit": git_commit(),
+            "version": __version__,
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "quick": quick,
+            "results": results,
+        }
+        with open(output, "w") as f:
+            json.dump(data, f, indent=2)
+        click.echo(f"saved: {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,20 +1,16 @@
 #
 # (c) 2026 Yoichi Tanibayashi
 #
-from importlib.metadata import PackageNotFoundError, version
-
-from loguru import logger
-
-if __package__:
-    try:
-        __version__ = version(__package__)
-    except PackageNotFoundError:
-        __version__ = "0.0.0"
-else:
-    __version__ = "_._._"
+# 起動を速くするため、ここでは重いモジュール (loguru, blessed など) を
+# import しない。バージョンはビルド時に書き出した _version.py から読む。
+try:
+    from ._version import __version__
+except ImportError:  # ビルドしていないソースツリー
+    __version__ = "0.0.0"
 
 SEC_MIN = 60  # seconds per minute
 MIN_HOUR = 60  # minutes per hour
+HOUR_DAY = 24  # hours per day
 
 ESC = "\x1b"  # == \033, Escape
 ESQ_CSR_ON = f"{ESC}[?25h"  # Visible cursor
@@ -22,6 +18,23 @@ ESQ_CSR_OFF = f"{ESC}[?25l"  # Invisible cursor
 ESQ_EL0 = f"{ESC}[0K"  # Erase in line: カーソルから行末まで削除
 ESQ_EL1 = f"{ESC}[1K"  # Erase in line: 行頭からカーソルまで削除
 ESQ_EL2 = f"{ESC}[2K"  # Erase in line: 行全体を削除
+ESQ_ED2 = f"{ESC}[2J"  # Erase in display: 画面全体を削除
+ESQ_HOME = f"{ESC}[H"  # カーソルを左上へ
+ESQ_SGR0 = f"{ESC}[0m"  # Select graphic rendition: 属性をリセット
+ESQ_SYNC_BEGIN = f"{ESC}[?2026h"  # Synchronized output: 開始
+ESQ_SYNC_END = f"{ESC}[?2026l"  # Synchronized output: 終了
+
+
+def __getattr__(name: str):
+    """Lazy attributes.
+
+    `from tmr import logger` の時に、はじめて loguru を import する。
+    """
+    if name == "logger":
+        from loguru import logger
+
+        return logger
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 __all__ = [
@@ -29,10 +42,16 @@ __all__ = [
     "logger",
     "SEC_MIN",
     "MIN_HOUR",
+    "HOUR_DAY",
     "ESC",
     "ESQ_CSR_ON",
     "ESQ_CSR_OFF",
     "ESQ_EL0",
     "ESQ_EL1",
     "ESQ_EL2",
+    "ESQ_ED2",
+    "ESQ_HOME",
+    "ESQ_SGR0",
+    "ESQ_SYNC_BEGIN",
+    "ESQ_SYNC_END",
 ]
@@ -1,26 +1,257 @@
 #
 # (c) 2026 Yoichi Tanibayashi
 #
+# 起動を速くするため、loguru, blessed やタイマー本体は
+# サブコマンドの中で import する (`tmr --version` などでは読まない)。
+import contextlib
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
 import click
-from loguru import logger
 
 from . import SEC_MIN, __version__
-from .base_timer import BaseTimer
 from .click_utils import click_common_opts
-from .mylog import loggerInit
-from .pomodoro import PomodoroConfig, PomodoroTimer
 from .utils import TerminalContext
 
+if TYPE_CHECKING:
+    from .control import ControlSocket
+    from .stats import Stats
+    from .status import StatusFile
+    from .stream import EventStream
+
 
 @click.group()
+@click.option(
+    "--profile",
+    "profile_path",
+    type=click.Path(dir_okay=False, writable=True),
+    metavar="FILE",
+    help="profile the subcommand and write the result to FILE",
+)
+@click.option(
+    "--profile-mode",
+    type=click.Choice(["cprofile", "sample"]),
+    default="cprofile",
+    show_default=True,
+    help="cprofile: all calls (pstats), sample: low overhead (collapsed)",
+)
+@click.option(
+    "--tracemalloc",
+    "trace_malloc",
+    is_flag=True,
+    help="with --profile, write memory allocation diff to FILE.mem.txt",
+)
 @click_common_opts(__version__)
-def cli(ctx, debug):
+def cli(ctx, profile_path, profile_mode, trace_malloc, debug):
     """Timer CLI."""
+    if profile_path:
+        from .profiler import Profiler
+
+        profiler = Profiler(profile_path, profile_mode, trace_malloc)
+        profiler.start()
+
+        def stop_profiler():
+            files = profiler.stop()
+            click.echo(f"profile: {', '.join(files)}", err=True)
+
+        # サブコマンドの終了後に呼ばれる
+        ctx.call_on_close(stop_profiler)
+
+    if not debug:
+        return  # ログの初期化はサブコマンドで行う
+
+    from loguru import logger
+
+    from .mylog import loggerInit
+
     loggerInit(debug)
     logger.debug(ctx)
     logger.debug(debug)
 
 
+def open_status_file():
+    """Status file for `tmr status`, or None if it cannot be created."""
+    from loguru import logger
+
+    from .status import StatusFile
+
+    try:
+        return StatusFile()
+    except OSError as e:
+        logger.warning(f"status file: {type(e).__name__}: {e}")
+        return None
+
+
+def open_control():
+    """Control socket for `tmr ctl`, or None if it cannot be created."""
+    from loguru import logger
+
+    from .control import ControlSocket
+
+    try:
+        return ControlSocket()
+    except OSError as e:
+        logger.warning(f"control socket: {type(e).__name__}: {e}")
+        return None
+
+
+def click_run_opts():
+    """Options of a running timer (timer, pomodoro).
+
+    --stats, --stats-format, --stream, --tick, --status-file, --control
+    """
+    decorators = [
+        click.option(
+            "--stats",
+            is_flag=True,
+            envvar="TMR_STATS",
+            show_envvar=True,
+            help="print metrics (frame time, bytes, wakeups, key latency)"
+            " on exit",
+        ),
+        click.option(
+            "--stats-format",
+            type=click.Choice(["text", "json"]),
+            default="text",
+            show_default=True,
+            envvar="TMR_STATS_FORMAT",
+            show_envvar=True,
+            help="format of --stats",
+        ),
+        click.option(
+            "--stream",
+            "stream_mode",
+            type=click.Choice(["auto", "off", "json", "text"]),
+            default="auto",
+            show_default=True,
+            envvar="TMR_STREAM",
+            show_envvar=True,
+            help="write events instead of the screen"
+            " (auto: json if stdout is not a terminal)",
+        ),
+        click.option(
+            "--tick",
+            type=click.FloatRange(min=0.01),
+            default=1.0,
+            show_default=True,
+            help="interval of tick events in stream mode (sec)",
+        ),
+        click.option(
+            "--status-file/--no-status-file",
+            default=True,
+            show_default=True,
+            envvar="TMR_STATUS_FILE",
+            show_envvar=True,
+            help="publish the state for `tmr status`",
+        ),
+        click.option(
+            "--control/--no-control",
+            default=True,
+            show_default=True,
+            envvar="TMR_CONTROL",
+            show_envvar=True,
+            help="accept commands from `tmr ctl`",
+        ),
+    ]
+
+    def _decorator(func):
+        for dec in reversed(decorators):
+            func = dec(func)
+        return func
+
+    return _decorator
+
+
+def click_multi_opts():
+    """Options of the rows of a screen (multi, schedule).
+
+    --alarm-count, --alarm-sec1, --alarm-sec2, --fps, --spinner
+    """
+    decorators = [
+        click.option(
+            "--alarm-count",
+            type=int,
+            default=3,
+            show_default=True,
+            help="alarm count of each timer",
+        ),
+        click.option(
+            "--alarm-sec1",
+            "--s1",
+            type=float,
+            default=0.5,
+            show_default=True,
+            help="alarm sec1",
+        ),
+        click.option(
+            "--alarm-sec2",
+            "--s2",
+            type=float,
+            default=1.5,
+            show_default=True,
+            help="alarm sec2",
+        ),
+        click.option(
+            "--fps",
+            type=click.FloatRange(min=0.1),
+            default=5.0,
+            show_default=True,
+            help="max refresh rate of animations",
+        ),
+        click.option(
+            "--spinner/--no-spinner",
+            default=True,
+            show_default=True,
+            help="spinner animation",
+        ),
+    ]
+
+    def _decorator(func):
+        for dec in reversed(decorators):
+            func = dec(func)
+        return func
+
+    return _decorator
+
+
+@dataclass
+class RunIO:
+    """Outputs and inputs of a running timer (see click_run_opts)."""
+
+    stats: "Stats | None"
+    stream: "EventStream | None"
+    status: "StatusFile | None"
+    control: "ControlSocket | None"
+
+
+@contextlib.contextmanager
+def run_io(stats, stats_format, stream_mode, tick, status_file, control):
+    """Open the RunIO of the click_run_opts options.
+
+    終了時に状態ファイルとソケットを閉じ、--stats の結果を書く。
+    """
+    from .stats import Stats
+    from .stream import EventStream
+
+    stream_fmt = EventStream.resolve(stream_mode)
+    rio = RunIO(
+        stats=Stats() if stats else None,
+        stream=EventStream(stream_fmt, tick) if stream_fmt else None,
+        status=open_status_file() if status_file else None,
+        control=open_control() if control else None,
+    )
+    try:
+        yield rio
+    finally:
+        if rio.status:
+            rio.status.close()
+        if rio.control:
+            rio.control.close()
+
+    if rio.stats:
+        click.echo(rio.stats.report(stats_format), err=True)
+
+
 @click.command()
 @click.argument("minutes", type=int, nargs=1)
 @click.option(
@@ -63,6 +294,20 @@ def cli(ctx, debug):
     show_default=True,
     help="alarm sec2",
 )
+@click.option(
+    "--fps",
+    type=click.FloatRange(min=0.1),
+    default=5.0,
+    show_default=True,
+    help="max refresh rate of animations",
+)
+@click.option(
+    "--spinner/--no-spinner",
+    default=True,
+    show_default=True,
+    help="spinner animation",
+)
+@click_run_opts()
 @click_common_opts(__version__)
 def timer(
     ctx,
@@ -72,22 +317,50 @@ def timer(
     alarm_count,
     alarm_sec1,
     alarm_sec2,
+    fps,
+    spinner,
+    stats,
+    stats_format,
+    stream_mode,
+    tick,
+    status_file,
+    control,
     debug,
 ):
     """Simple Timer."""
+    from loguru import logger
+
+    from .base_timer import BaseTimer
+    from .mylog import loggerInit
+
     loggerInit(debug)
     logger.debug(f"command='{ctx.command.name}'")
     logger.debug(
         f"minutes={minutes},"
         f"title={title!r},title_color={title_color!r},"
-        f"alarm_count={alarm_count},alarm_sec=({alarm_sec1},{alarm_sec2})"
+        f"alarm_count={alarm_count},alarm_sec=({alarm_sec1},{alarm_sec2}),"
+        f"fps={fps},spinner={spinner},stats={stats}({stats_format}),"
+        f"stream={stream_mode},tick={tick},"
+        f"status_file={status_file},control={control}"
     )
 
     limit = int(minutes * SEC_MIN)
-
-    with TerminalContext():
+    with (
+        run_io(
+            stats, stats_format, stream_mode, tick, status_file, control
+        ) as rio,
+        TerminalContext(tty=rio.stream is None),
+    ):
         _ = BaseTimer(
-            (title, title_color), limit, (alarm_count, alarm_sec1, alarm_sec2)
+            (title, title_color),
+            limit,
+            (alarm_count, alarm_sec1, alarm_sec2),
+            fps=fps,
+            spinner=spinner,
+            stats=rio.stats,
+            stream=rio.stream,
+            status=rio.status,
+            control=rio.control,
         ).main()
 
 
@@ -123,9 +396,60 @@ cli.add_command(timer, name="t")
 @click.option(
     "--cycles", "-c", type=int, default=4, show_default=True, help="cycles"
 )
+@click.option(
+    "--fps",
+    type=click.FloatRange(min=0.1),
+    default=5.0,
+    show_default=True,
+    help="max refresh rate of animations",
+)
+@click.option(
+    "--spinner/--no-spinner",
+    default=True,
+    show_default=True,
+    help="spinner animation",
+)
+@click_run_opts()
+@click.option(
+    "--anchored/--no-anchored",
+    default=False,
+    show_default=True,
+    help="keep phases on the schedule fixed at start",
+)
+@click.option(
+    "--history/--no-history",
+    default=True,
+    show_default=True,
+    envvar="TMR_HISTORY",
+    show_envvar=True,
+    help="record each phase for `tmr stats`",
+)
 @click_common_opts(__version__)
-def pomodoro(ctx, work_time, break_time, long_break_time, cycles, debug):
+def pomodoro(
+    ctx,
+    work_time,
+    break_time,
+    long_break_time,
+    cycles,
+    fps,
+    spinner,
+    anchored,
+    history,
+    stats,
+    stats_format,
+    stream_mode,
+    tick,
+    status_file,
+    control,
+    debug,
+):
     """Pomodoro Timer."""
+    from loguru import logger
+
+    from .history import History
+    from .mylog import loggerInit
+    from .pomodoro import PomodoroConfig, PomodoroTimer
+
     loggerInit(debug)
     logger.debug(f"command='{ctx.command.name}'")
     logger.debug(
@@ -133,7 +457,12 @@ def pomodoro(ctx, work_time, break_time, long_break_time, cycles, debug):
             f"work_time={work_time}, "
             f"break_time={break_time}, "
             f"long_break_time={long_break_time}, "
-            f"cycles={cycles}"
+            f"cycles={cycles}, "
+            f"fps={fps}, spinner={spinner}, "
+            f"anchored={anchored}, history={history}, "
+            f"stats={stats}({stats_format}), "
+            f"stream={stream_mode}, tick={tick}, "
+            f"status_file={status_file}, control={control}"
         )
     )
 
@@ -143,15 +472,295 @@ def pomodoro(ctx, work_time, break_time, long_break_time, cycles, debug):
         break_sec=break_time * SEC_MIN,
         long_break_sec=long_break_time * SEC_MIN,
         cycles=cycles,
+        fps=fps,
+        spinner=spinner,
+        anchored=anchored,
     )
 
-    timer = PomodoroTimer(config)
+    with run_io(
+        stats, stats_format, stream_mode, tick, status_file, control
+    ) as rio:
+        timer = PomodoroTimer(
+            config,
+            stats=rio.stats,
+            stream=rio.stream,
+            status=rio.status,
+            control=rio.control,
+            history=History() if history else None,
+        )
 
-    click.echo("Start Pomodoro Timer: [?] for help")
+        if rio.stream is None:
+            click.echo("Start Pomodoro Timer: [?] for help")
 
-    with TerminalContext():
-        timer.run()
+        with TerminalContext(tty=rio.stream is None):
+            timer.run()
 
 
 cli.add_command(pomodoro)
 cli.add_command(pomodoro, name="p")
+
+
+@click.command()
+@click.option(
+    "--format",
+    "-f",
+    "fmt",
+    type=click.Choice(["text", "json"]),
+    default="text",
+    show_default=True,
+    help="text: one line per timer, json: list of timers",
+)
+@click_common_opts(__version__)
+def status(ctx, fmt, debug):
+    """Show running timers."""
+    # シェルのプロンプトや tmux のステータスラインから呼べるように、
+    # タイマー本体は読み込まずに、状態ファイルだけを読む。
+    # タイマーが動いていなければ、何も出力せずに終了コード 1 で終わる。
+    import time
+
+    from .status import read_all
+
+    timers = read_all()
+    if not timers:
+        ctx.exit(1)
+
+    t_now = time.time()
+    if fmt == "json":
+        import json
+
+        click.echo(
+            json.dumps(
+                [st.to_dict(t_now) for st in timers], ensure_ascii=False
+            )
+        )
+        return
+
+    for st in timers:
+        click.echo(st.line(t_now))
+
+
+cli.add_command(status)
+cli.add_command(status, name="s")
+
+
+@click.command()
+@click.option(
+    "--by",
+    "period",
+    type=click.Choice(["day", "week", "month"]),
+    default="day",
+    show_default=True,
+    help="period of each total",
+)
+@click.option(
+    "--last",
+    "-n",
+    type=click.IntRange(min=0),
+    default=7,
+    show_default=True,
+    help="number of the latest periods to show (0: all)",
+)
+@click.option(
+    "--format",
+    "-f",
+    "fmt",
+    type=click.Choice(["text", "json"]),
+    default="text",
+    show_default=True,
+    help="text: one line per period, json: object of periods",
+)
+@click_common_opts(__version__)
+def history_stats(ctx, period, last, fmt, debug):
+    """Show the totals of the Pomodoro history."""
+    # 集計はインデックスを読み、増えた分だけを足す。
+    # タイマー本体は読み込まない。記録がなければ、終了コード 1 で終わる。
+    from .history import History
+    from .utils import t_str
+
+    try:
+        totals = History().rollup(period, last)
+    except (OSError, ValueError) as e:
+        raise click.ClickException(str(e))
+    if not totals:
+        ctx.exit(1)
+
+    if fmt == "json":
+        import json
+        from dataclasses import asdict
+
+        click.echo(json.dumps({k: asdict(t) for k, t in totals.items()}))
+        return
+
+    for key, t in totals.items():
+        click.echo(
+            f"{key:10s} work {t_str(round(t.work))} "
+            f"break {t_str(round(t.rest))} "
+            f"pomodoros {t.pomodoros:3d} "
+            f"skipped {t.skipped:2d} quit {t.quit:2d}"
+        )
+
+
+cli.add_command(history_stats, name="stats")
+
+
+@click.command()
+@click.argument("cmds", metavar="COMMAND...", nargs=-1, required=True)
+@click.option(
+    "--pid",
+    "-p",
+    type=int,
+    help="timer to control  [default: the only running timer]",
+)
+@click.option(
+    "--all", "-a", "to_all", is_flag=True, help="send to all running timers"
+)
+@click_common_opts(__version__)
+def ctl(ctx, cmds, pid, to_all, debug):
+    """Send commands to running timers.
+
+    COMMAND: pause, forward1, backward1, forward10, bk10, next, quit, ...
+    """
+    # キー入力と同じく、コマンド名を送るだけ。タイマー本体は読み込まない
+    from .control import COMMANDS, send, socket_paths, socket_pid
+
+    unknown = [c for c in cmds if c not in COMMANDS]
+    if unknown:
+        raise click.BadParameter(
+            f"unknown command {', '.join(map(repr, unknown))}"
+            f" (choose from {', '.join(COMMANDS)})",
+            param_hint="COMMAND",
+        )
+
+    paths = socket_paths()
+    if pid is not None:
+        paths = [p for p in paths if socket_pid(p) == pid]
+    elif len(paths) > 1 and not to_all:
+        pids = ", ".join(str(socket_pid(p)) for p in paths)
+        raise click.UsageError(
+            f"several timers are running ({pids}): use --pid or --all"
+        )
+
+    sent = 0
+    for path in paths:
+        try:
+            send(path, list(cmds))
+            sent += 1
+        except (ConnectionRefusedError, FileNotFoundError):
+            pass  # 送る前に終了した
+
+    if not sent:
+        click.echo("no running timer", err=True)
+        ctx.exit(1)
+
+
+cli.add_command(ctl)
+
+
+@click.command()
+@click.argument("specs", metavar="MINUTES[:TITLE]...", nargs=-1)
+@click.option(
+    "--file",
+    "-f",
+    "spec_file",
+    type=click.File(),
+    help="read MINUTES[:TITLE] from FILE, one per line",
+)
+@click_multi_opts()
+@click_common_opts(__version__)
+def multi(
+    ctx,
+    specs,
+    spec_file,
+    alarm_count,
+    alarm_sec1,
+    alarm_sec2,
+    fps,
+    spinner,
+    debug,
+):
+    """Many timers in one screen."""
+    from loguru import logger
+
+    from .multi import MultiTimer, parse_spec
+    from .mylog import loggerInit
+
+    loggerInit(debug)
+    logger.debug(f"command='{ctx.command.name}'")
+
+    lines = list(specs)
+    if spec_file:
+        lines += [x.strip() for x in spec_file if x.strip()]
+    if not lines:
+        raise click.UsageError("no timers")
+    try:
+        timers = [parse_spec(x) for x in lines]
+    except ValueError as e:
+        raise click.BadParameter(str(e), param_hint="MINUTES[:TITLE]")
+    logger.debug(
+        f"timers={len(timers)},alarm_count={alarm_count},"
+        f"alarm_sec=({alarm_sec1},{alarm_sec2}),"
+        f"fps={fps},spinner={spinner}"
+    )
+
+    with TerminalContext():
+        MultiTimer(
+            timers,
+            (alarm_count, alarm_sec1, alarm_sec2),
+            fps=fps,
+            spinner=spinner,
+        ).main()
+
+
+cli.add_command(multi)
+cli.add_command(multi, name="m")
+
+
+@click.command()
+@click.argument("schedule_file", metavar="FILE", type=click.File())
+@click_multi_opts()
+@click_common_opts(__version__)
+def schedule(
+    ctx,
+    schedule_file,
+    alarm_count,
+    alarm_sec1,
+    alarm_sec2,
+    fps,
+    spinner,
+    debug,
+):
+    """Timers started by a schedule file.
+
+    Each line of FILE is "START,MINUTES[,TITLE[,COLOR]]" (CSV),
+    where START is the minutes from now until the timer starts.
+    """
+    from loguru import logger
+
+    from .mylog import loggerInit
+    from .schedule import ScheduleTimer, parse_schedule
+
+    loggerInit(debug)
+    logger.debug(f"command='{ctx.command.name}'")
+
+    try:
+        items = parse_schedule(schedule_file)
+    except ValueError as e:
+        raise click.BadParameter(str(e), param_hint="FILE")
+    if not items:
+        raise click.UsageError("no items")
+    logger.debug(
+        f"items={len(items)},alarm_count={alarm_count},"
+        f"alarm_sec=({alarm_sec1},{alarm_sec2}),"
+        f"fps={fps},spinner={spinner}"
+    )
+
+    with TerminalContext():
+        ScheduleTimer(
+            items,
+            (alarm_count, alarm_sec1, alarm_sec2),
+            fps=fps,
+            spinner=spinner,
+        ).main()
+
+
+cli.add_command(schedule)
@@ -0,0 +1,405 @@
+#
+# (c) 2026 Yoichi Tanibayashi
+#
+# asyncio のイベントループ上でタイマーを動かす。
+# キー入力やソケットは add_reader()、表示の更新とベルは call_later() で
+# ループに登録するので、スレッドを使わず、1つのループで
+# いくつでもタイマーやポモドーロを動かせる。
+import asyncio
+import signal
+from collections.abc import AsyncIterator, Callable
+
+from loguru import logger
+
+from .base_timer import BaseTimer
+from .pomodoro import PomodoroTimer
+from .stream import EventStream
+
+
+class EventQueue(EventStream):
+    """EventStream that feeds async iterators.
+
+    emit() されたイベントを dict にして、subscribe() した全ての
+    イテレータに渡す。forward を指定すると、そちらにも書く。
+
+    ```python
+    timer = BaseTimer(("Tea", "white"), 180, stream=EventQueue())
+    ```
+    """
+
+    def __init__(
+        self,
+        tick: float = EventStream.DEF_TICK,
+        forward: EventStream | None = None,
+    ):
+        """Constructor.
+
+        Args:
+            tick (float): tick イベントの間隔 (sec)。
+            forward (EventStream | None): イベントを書き出す先。
+        """
+        super().__init__("json", tick)
+        self.forward = forward
+        self.queues: list[asyncio.Queue] = []
+
+    def emit(self, event: str, ts: float, fields: dict):
+        """Pass one event to the subscribers."""
+        ev = {"ts": round(ts, 3), "event": event, **fields}
+        for q in self.queues:
+            q.put_nowait(ev)
+        if self.forward is not None:
+            self.forward.emit(event, ts, fields)
+        self.events += 1
+
+    def subscribe(self) -> AsyncIterator[dict]:
+        """Iterator of the events from now until close()."""
+        q: asyncio.Queue = asyncio.Queue()
+        self.queues.append(q)
+        return self._iter(q)
+
+    async def _iter(self, q: asyncio.Queue) -> AsyncIterator[dict]:
+        try:
+            while (ev := await q.get()) is not None:
+                yield ev
+        finally:
+            if q in self.queues:
+                self.queues.remove(q)
+
+    def close(self):
+        """End the iterators."""
+        for q in self.queues:
+            q.put_nowait(None)
+        self.queues = []
+
+
+class LoopAlarm:
+    """Alarm on the running event loop.
+
+    AlarmScheduler と同じインタフェースで、ベルと間隔を
+    loop.call_later() で登録して鳴らす。タイマーごとに1つ持つ。
+    """
+
+    def __init__(self, notify: Callable[[], None] | None = None):
+        """Constructor.
+
+        Args:
+            notify: 鳴り終わった時に、on_done の後で呼ぶ関数。
+        """
+        self.notify = notify
+        self._handle: asyncio.TimerHandle | None = None
+        self.stop_latency = 0.0
+
+    @property
+    def active(self) -> bool:
+        """Alarm is ringing."""
+        return self._handle is not None
+
+    def start(
+        self,
+        count: int,
+        sec1: float,
+        sec2: float,
+        bell: Callable[[], None],
+        on_done: Callable[[], None] | None = None,
+        owner: object = None,
+    ):
+        """Start alarm (replaces the ringing one).
+
+        タイマーごとに持つので、owner は使わない。
+        """
+        logger.debug(f"count={count},sec1={sec1},sec2={sec2}")
+        self.stop()
+        loop = asyncio.get_running_loop()
+        intervals = [sec1, sec2] * count
+
+        def step(i: int):
+            self._handle = None
+            if i >= len(intervals):
+                if on_done:
+                    on_done()
+                if self.notify:
+                    self.notify()
+                return
+            bell()
+            self._handle = loop.call_later(intervals[i], step, i + 1)
+
+        step(0)
+
+    def stop(self, owner: object = None) -> float:
+        """Stop alarm.
+
+        登録済みのベルを取り消すだけなので、待たずに止まる。
+        """
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        self.stop_latency = 0.0
+        return self.stop_latency
+
+
+class AsyncTimer:
+    """asyncio frontend of BaseTimer.
+
+    ```python
+    timer = AsyncTimer(BaseTimer(("Tea", "white"), 180, stream=EventQueue()))
+    async for ev in timer.events():  # 別のタスクで await timer.run()
+        print(ev["event"], ev["remain"])
+    ```
+    """
+
+    def __init__(self, timer: BaseTimer, keys: bool | None = None):
+        """Constructor.
+
+        Args:
+            timer (BaseTimer): 動かすタイマー。stream を指定した場合は
+                画面を描画せずにイベントを出す。
+            keys (bool | None): 端末のキー入力を読む。None の場合は、
+                画面を描画する (stream がない) 場合だけ読む。
+                1つのループでキー入力を読むタイマーは1つだけにすること。
+        """
+        self.timer = timer
+        self.keys = timer.stream is None if keys is None else keys
+        self.alarm = LoopAlarm(notify=self.kick)
+        timer.alarm = self.alarm  # type: ignore[assignment]
+
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._handle: asyncio.Handle | None = None  # 次の step
+        self._done: asyncio.Future | None = None  # メインループの終了
+        self._key_wait: asyncio.Future | None = None  # アラーム中のキー
+        self._key_names: list[str] = []
+        self._publish = False
+
+    def events(self) -> AsyncIterator[dict]:
+        """Events of the timer until run() returns.
+
+        Raises:
+            ValueError: タイマーの stream が EventQueue でない
+        """
+        return event_queue(self.timer.stream).subscribe()
+
+    def send(self, name: str):
+        """Run a command (TimerCmd.name) as if its key was pressed.
+
+        Raises:
+            ValueError: 知らないコマンド
+        """
+        key = self.timer.name_key.get(name)
+        if key is None:
+            raise ValueError(f"unknown command: {name!r}")
+        self._key_names.append(key)
+        self.kick()
+
+    async def run(self, t_start: float | None = None) -> bool:
+        """Run until the time up or quit.
+
+        Returns:
+            bool: quitコマンドで終了した場合は True
+        """
+        try:
+            return await self.run_phase(t_start)
+        finally:
+            if isinstance(self.timer.stream, EventQueue):
+                self.timer.stream.close()
+
+    async def run_phase(self, t_start: float | None = None) -> bool:
+        """Run once without closing the events (for Pomodoro)."""
+        timer = self.timer
+        loop = asyncio.get_running_loop()
+        self._loop = loop
+        self._done = loop.create_future()
+        self._publish = True
+
+        with timer.cbreak():
+            if not timer.stream:
+                timer.check_sync_output()
+            cleanup = self._add_readers(loop)
+            try:
+                timer.begin(t_start)
+                self._step()
+                await self._done
+
+                if timer.stream:
+                    quit_by_quitcmd = timer.stream_end()
+                    timer.publish()
+                    return quit_by_quitcmd
+
+                # タイマー満了、または、終了
+                key_name = ""
+                if timer.ring_alarm():
+                    while timer.alarm_active:
+                        key_name = await self._next_key(timer.next_timeout())
+                        if key_name:
+                            break
+                        timer.display()
+                return timer.finish(key_name)
+            finally:
+                if self._handle is not None:
+                    self._handle.cancel()
+                    self._handle = None
+                self.alarm.stop()
+                for fn in cleanup:
+                    fn()
+
+    def kick(self):
+        """Run the next step soon (keys, commands, resize, alarm done)."""
+        if self._loop is None:
+            return
+        if self._done is not None and not self._done.done():
+            if self._handle is not None:
+                self._handle.cancel()
+            self._handle = self._loop.call_soon(self._step)
+        elif self._key_wait is not None and not self._key_wait.done():
+            self._key_wait.set_result(None)
+
+    def _step(self):
+        """One frame, then schedule the next."""
+        self._handle = None
+        timer = self.timer
+        assert self._loop is not None and self._done is not None
+
+        timer.wakeups += 1
+        if timer.stats:
+            timer.stats.wakeup()
+        key_names, self._key_names = self._key_names, []
+        if key_names:
+            logger.debug(f"key_names={key_names}")
+        timer.step(key_names, self._publish)
+        self._publish = False
+
+        if not timer.is_active:
+            if not self._done.done():
+                self._done.set_result(None)
+            return
+
+        timeout = timer.next_timeout()
+        if timeout is not None:  # None: キー入力まで待つ
+            self._handle = self._loop.call_later(timeout, self._step)
+
+    async def _next_key(self, timeout: float | None) -> str:
+        """Wait for a key, the end of the alarm, or a timeout."""
+        if not self._key_names:
+            assert self._loop is not None
+            self._key_wait = self._loop.create_future()
+            try:
+                await asyncio.wait_for(self._key_wait, timeout)
+            except TimeoutError:
+                pass
+            finally:
+                self._key_wait = None
+        return self._key_names.pop(0) if self._key_names else ""
+
+    def _add_readers(
+        self, loop: asyncio.AbstractEventLoop
+    ) -> list[Callable[[], object]]:
+        """Watch the keyboard, the control socket and SIGWINCH.
+
+        Returns:
+            list: 登録を解除する関数
+        """
+        timer = self.timer
+        cleanup: list[Callable[[], object]] = []
+
+        kbd_fd = getattr(timer.term, "_keyboard_fd", None)
+        if self.keys and isinstance(kbd_fd, int):
+            loop.add_reader(kbd_fd, self._on_key)
+            cleanup.append(lambda: loop.remove_reader(kbd_fd))
+
+        if timer.control is not None:
+            ctl_fd = timer.control.fileno()
+            loop.add_reader(ctl_fd, self._on_control)
+            cleanup.append(lambda: loop.remove_reader(ctl_fd))
+
+        if not timer.stream and hasattr(signal, "SIGWINCH"):
+            try:
+                loop.add_signal_handler(signal.SIGWINCH, self._on_resize)
+            except (ValueError, RuntimeError, NotImplementedError):
+                pass  # メインスレッド以外のループ
+            else:
+                cleanup.append(
+                    lambda: loop.remove_signal_handler(signal.SIGWINCH)
+                )
+        return cleanup
+
+    def _on_key(self):
+        """Keyboard is readable: read all buffered keys."""
+        timer = self.timer
+        while len(self._key_names) < timer.MAX_KEYS:
+            in_key = timer.term.inkey(timeout=0)
+            if not in_key:
+                break
+            if timer.stats:
+                timer.stats.key()
+            self._key_names.append(timer.key_name(in_key))
+        self.kick()
+
+    def _on_control(self):
+        """Control socket is readable."""
+        timer = self.timer
+        timer.recv_control()
+        self._key_names.extend(timer.ctl_keys)
+        timer.ctl_keys = []
+        self.kick()
+
+    def _on_resize(self):
+        """Terminal resized."""
+        self.timer.on_resize()
+        self.kick()
+
+
+class AsyncPomodoro:
+    """asyncio frontend of PomodoroTimer."""
+
+    def __init__(self, pomodoro: PomodoroTimer, keys: bool | None = None):
+        """Constructor.
+
+        Args:
+            keys (bool | None): AsyncTimer と同じ。
+        """
+        self.pomodoro = pomodoro
+        self.keys = keys
+        self.runner: AsyncTimer | None = None  # 各フェーズで使い回す
+
+    def events(self) -> AsyncIterator[dict]:
+        """Events of all phases until run() returns.
+
+        Raises:
+            ValueError: stream が EventQueue でない
+        """
+        return event_queue(self.pomodoro.stream).subscribe()
+
+    def send(self, name: str):
+        """Send a command to the current phase."""
+        if self.runner is None:
+            raise ValueError("not running")
+        self.runner.send(name)
+
+    async def run(self) -> bool:
+        """Run the cycles until quit.
+
+        Returns:
+            bool: ユーザが中断(quit)した場合は True
+        """
+        try:
+            for phase in self.pomodoro.steps():
+                timer, t_start = self.pomodoro.prepare_timer(*phase)
+                if self.runner is None:
+                    self.runner = AsyncTimer(timer, self.keys)
+                quit_by_quitcmd = await self.runner.run_phase(t_start)
+                self.pomodoro.record_phase(quit_by_quitcmd)
+                if quit_by_quitcmd:
+                    return True
+            return False
+        finally:
+            if isinstance(self.pomodoro.stream, EventQueue):
+                self.pomodoro.stream.close()
+
+
+def event_queue(stream: EventStream | None) -> EventQueue:
+    """stream as an EventQueue.
+
+    Raises:
+        TypeError: EventQueue でない
+    """
+    if not isinstance(stream, EventQueue):
+        raise TypeError("events() needs stream=EventQueue()")
+    return stream
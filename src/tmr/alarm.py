@@ -0,0 +1,182 @@
+#
+# (c) 2026 Yoichi Tanibayashi
+#
+import threading
+from collections.abc import Callable
+
+from loguru import logger
+
+from .clock import Clock, VirtualClock
+
+
+class AlarmJob:
+    """Bells of one alarm."""
+
+    __slots__ = ("bell", "i", "intervals", "on_done", "t_next")
+
+    def __init__(
+        self,
+        intervals: list[float],
+        t_next: float,
+        bell: Callable[[], None],
+        on_done: Callable[[], None] | None,
+    ):
+        self.intervals = intervals  # 各ベルの後の間隔
+        self.i = 0  # 次に鳴らすベル
+        self.t_next = t_next  # 次に鳴らす時刻 (clock.monotonic())
+        self.bell = bell
+        self.on_done = on_done
+
+
+class AlarmScheduler:
+    """Alarm scheduler.
+
+    一つのワーカースレッドを使い回してベルを鳴らす。
+    アラームは owner (タイマー) ごとに持つので、複数のタイマーが
+    同時に満了しても、それぞれが最後まで鳴る。
+    ベルの間隔は sleep ではなく条件変数で待つので、stop() ですぐに止まる。
+    VirtualClock の場合はスレッドを使わず、ベルを時計に登録して鳴らす。
+    """
+
+    _shared: "AlarmScheduler | None" = None
+
+    def __init__(self, clock: Clock | None = None):
+        """Constructor."""
+        self.clock = clock if clock is not None else Clock()
+        self._cond = threading.Condition()
+        self._thread: threading.Thread | None = None
+
+        self._jobs: dict[object, AlarmJob] = {}  # owner -> 鳴らしている物
+
+        self.stop_latency = 0.0  # sec, 最後の stop() にかかった時間
+
+    @classmethod
+    def shared(cls) -> "AlarmScheduler":
+        """Scheduler shared by all timers."""
+        if cls._shared is None:
+            cls._shared = cls()
+        return cls._shared
+
+    @property
+    def active(self) -> bool:
+        """Any alarm is ringing."""
+        with self._cond:
+            return bool(self._jobs)
+
+    def ringing(self, owner: object = None) -> bool:
+        """The alarm of owner is ringing."""
+        with self._cond:
+            return owner in self._jobs
+
+    def start(
+        self,
+        count: int,
+        sec1: float,
+        sec2: float,
+        bell: Callable[[], None],
+        on_done: Callable[[], None] | None = None,
+        owner: object = None,
+    ):
+        """Start alarm.
+
+        同じ owner のアラームを鳴らしていれば、置き換える。
+
+        Args:
+            count (int): [sec1, sec2] の繰り返し回数。
+            sec1 (float): 1回目のベルの後の間隔。
+            sec2 (float): 2回目のベルの後の間隔。
+            bell: ベルを鳴らす関数。
+            on_done: count 回鳴り終わった時に呼ぶ関数。stop() では呼ばない。
+            owner: アラームの持ち主 (タイマー)。
+        """
+        logger.debug(f"count={count},sec1={sec1},sec2={sec2}")
+        with self._cond:
+            job = AlarmJob(
+                [sec1, sec2] * count, self.clock.monotonic(), bell, on_done
+            )
+            self._jobs[owner] = job
+
+            if isinstance(self.clock, VirtualClock):
+                self._ring_virtual(self.clock, owner, job)
+                return
+
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._worker, name="tmr-alarm", daemon=True
+                )
+                self._thread.start()
+            self._cond.notify_all()
+
+    def stop(self, owner: object = None) -> float:
+        """Stop the alarm of owner.
+
+        ベルはロックを持って鳴らすので、ロックを取れば、もう鳴らない。
+
+        Args:
+            owner: アラームの持ち主。None の場合は全て。
+
+        Returns:
+            float: 止まるまでにかかった秒数。
+        """
+        t0 = self.clock.monotonic()
+        with self._cond:
+            if owner is None:
+                self._jobs.clear()
+            else:
+                self._jobs.pop(owner, None)
+            self._cond.notify_all()
+
+        self.stop_latency = self.clock.monotonic() - t0
+        logger.debug(f"stop_latency={self.stop_latency * 1000:.3f}ms")
+        return self.stop_latency
+
+    def _worker(self):
+        """Worker thread.
+
+        次に鳴らす時刻が一番早いアラームまで待って、ベルを鳴らす。
+        """
+        with self._cond:
+            while True:
+                if not self._jobs:
+                    self._cond.wait()
+                    continue
+
+                owner, job = min(
+                    self._jobs.items(), key=lambda item: item[1].t_next
+                )
+                t_now = self.clock.monotonic()
+                if job.t_next > t_now:
+                    # start() や stop() で起きて、選び直す
+                    self._cond.wait(timeout=job.t_next - t_now)
+                    continue
+
+                self._ring(owner, job, t_now)
+
+    def _ring(self, owner: object, job: AlarmJob, t_now: float):
+        """Ring the next bell of job, or finish it."""
+        if job.i >= len(job.intervals):
+            del self._jobs[owner]
+            if job.on_done:
+                job.on_done()
+            return
+
+        job.bell()
+        job.t_next = t_now + job.intervals[job.i]
+        job.i += 1
+
+    def _ring_virtual(
+        self, clock: VirtualClock, owner: object, job: AlarmJob
+    ):
+        """Ring bells in virtual time.
+
+        _worker() と同じ順序で、ベルと間隔を時計に登録する。
+        """
+
+        def step():
+            if self._jobs.get(owner) is not job:
+                return  # stop() または start() された
+            self._ring(owner, job, clock.monotonic())
+            if self._jobs.get(owner) is job:
+                clock.call_at(job.t_next, step)
+
+        step()
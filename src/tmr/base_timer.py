@@ -1,17 +1,29 @@
 #
 # (c) 2026 Yoichi Tanibayashi
 #
+import contextlib
+import math
+import signal
 import threading
-import time
 from dataclasses import dataclass
 from typing import Callable, List
 
-import click
 from blessed import Terminal
 from loguru import logger
 
-from . import ESQ_EL2, MIN_HOUR, SEC_MIN
+from . import ESQ_ED2, ESQ_EL2, ESQ_HOME, HOUR_DAY, MIN_HOUR, SEC_MIN
+from .alarm import AlarmScheduler
+from .clock import Clock
+from .control import ControlSocket
+from .core import TimerCore
 from .progress_bar import ProgressBar
+from .renderer import Cell, LineRenderer, style, text_width
+from .stats import Stats
+from .status import StatusFile
+from .stream import EventStream
+from .tty_writer import TtyWriter
+from .utils import t_str
+from .waiter import Waiter
 
 
 @dataclass
@@ -26,6 +38,28 @@ class TimerCol:
     pause_blink: bool = False
 
 
+@dataclass(frozen=True)
+class LayoutPlan:
+    """Layout plan.
+
+    端末幅と各カラムの長さだけで決まるので、キャッシュして使い回す。
+    """
+
+    use: frozenset[str]  # 省略されなかったカラム
+    cols: tuple[str, ...]  # 表示するカラム (表示順、空の値は除く)
+    x: tuple[int, ...]  # 各カラムの表示開始位置
+    pbar_len: int  # プログレスバーの長さ (非表示の場合は 0)
+
+
+def core_attr(name: str, doc: str) -> property:
+    """Property that reads and writes an attribute of self.core."""
+    return property(
+        lambda self: getattr(self.core, name),
+        lambda self, value: setattr(self.core, name, value),
+        doc=doc,
+    )
+
+
 @dataclass
 class TimerCmd:
     """Timer Command."""
@@ -34,6 +68,7 @@ class TimerCmd:
     info: str
     keys: list[str]
     fn: Callable[[], None]  # []:引数なし、 None:戻り値なし
+    seek: float = 0.0  # sec, 時間を進める(+)/戻す(-)コマンドの場合
 
 
 class BaseTimer:
@@ -45,7 +80,13 @@ class BaseTimer:
         to ensure logs are formatted correctly.
     """
 
-    IN_KEY_TIMEOUT = 0.2  # sec
+    IN_KEY_TIMEOUT = 0.2  # sec, get_key_name() の既定値
+    DEF_FPS = 5.0  # 風車などアニメーションの最大更新頻度
+    WAKE_MARGIN = 0.005  # sec, 秒の境界を確実に越えてから起きるための余裕
+    WAIT_TAG_KEY = "key"
+    WAIT_TAG_CTL = "ctl"
+    MAX_KEYS = 256  # 1フレームでまとめて処理するキーの最大数
+    SYNC_QUERY_TIMEOUT = 0.1  # sec, synchronized output 対応の問い合わせ
 
     DEF_TITLE = ("Timer", "white")
     DEF_LIMIT = 180.0  # seconds
@@ -64,6 +105,8 @@ class BaseTimer:
 
     PBAR_LEN_MIN = 10
 
+    LAYOUT_CACHE_MAX = 64
+
     # 表示項目の優先順位（低いものから削除される）
     COL_PRIORITY = [
         "remain",
@@ -79,6 +122,13 @@ class BaseTimer:
 
     type AlarmParams = tuple[int, float, float]
 
+    # 時間の状態は TimerCore が持つ
+    t_limit = core_attr("limit", "Time limit (sec).")
+    t_start = core_attr("t_start", "Start time (clock.monotonic()).")
+    t_elapsed = core_attr("elapsed", "Elapsed time (sec).")
+    is_active = core_attr("active", "Running (not timed up or quit).")
+    is_paused = core_attr("paused", "Paused.")
+
     def __init__(
         self,
         title: tuple[str, str] = DEF_TITLE,
@@ -89,8 +139,31 @@ class BaseTimer:
             DEF_SEC2,
         ),
         enable_next: bool = False,
+        fps: float = DEF_FPS,
+        spinner: bool = True,
+        clock: Clock | None = None,
+        stats: Stats | None = None,
+        stream: EventStream | None = None,
+        status: StatusFile | None = None,
+        control: ControlSocket | None = None,
+        term: Terminal | None = None,
+        waiter: Waiter | None = None,
+        hide: tuple[str, ...] = (),
     ):
-        """Constructor."""
+        """Constructor.
+
+        Args:
+            clock (Clock | None): 時計。None の場合は実際の時計。
+            stats (Stats | None): 計測結果の記録先。None の場合は計測しない。
+            stream (EventStream | None): イベントの出力先。
+                指定した場合は、画面を描画せずにイベントを書く。
+            status (StatusFile | None): 状態を書くファイル (`tmr status`)。
+            control (ControlSocket | None): コマンドを受け取るソケット
+                (`tmr ctl`)。
+            term, waiter: 複数のタイマーで共有する場合に指定する。
+                waiter を指定した場合、キー入力は持ち主が登録する。
+            hide (tuple[str, ...]): 表示しないカラム。
+        """
         logger.debug(
             f"title={title},limit={t_limit},alarm_params={alarm_params}"
         )
@@ -99,27 +172,88 @@ class BaseTimer:
 
         self.col["title"].value = title[0]
         self.col["title"].color = title[1]
-        self.t_limit = t_limit
+        self.core = TimerCore(t_limit)
         self.alarm_params = alarm_params
         self.enable_next = enable_next
+        self.fps = fps
+        self.spinner = spinner
 
-        self.t_start = 0.0
-        self.t_elapsed = 0.0
-
-        self.is_active = False
-        self.is_paused = False
         self.alarm_active = False
         self.quit_by_quitcmd = False  # quitコマンドによる終了
-
-        self.pbar = ProgressBar(self.t_limit)
-
-        self.term = Terminal()
-        logger.debug(f"term size:{self.term.width}x{self.term.height}")
+        self.clock = clock if clock is not None else Clock()
+        if self.clock.virtual:
+            self.alarm = AlarmScheduler(self.clock)
+        else:
+            self.alarm = AlarmScheduler.shared()
+
+        self.wakeups = 0  # キー入力待ちから戻った回数
+        self.stats = stats
+        self.stream = stream
+        self.status = status
+        self.t_next_tick = 0.0  # 次の tick イベントの時刻
+        self.t_main_start = 0.0
+        self.pbar_len = 0
+
+        self.out = TtyWriter()
+        self.sync_checked = False
+
+        self.pbar = ProgressBar(self.t_limit, out=self.out)
+        self.renderer = LineRenderer()
+        self._layout_cache: dict[tuple, LayoutPlan] = {}
+        self.col_priority = [c for c in self.COL_PRIORITY if c not in hide]
+        # 現在の色の範囲 (color, lower, upper)。最初の表示で求める
+        self.rate_band: tuple[str, float, float] = ("", 0.0, 0.0)
+
+        self.term = term if term is not None else Terminal()
+        # 端末サイズは、SIGWINCH を受けた時だけ読み直す
+        self.width: int = self.term.width
+        self.height: int = self.term.height
+        logger.debug(f"term size:{self.width}x{self.height}")
+
+        self.waiter = waiter if waiter is not None else Waiter()
+        kbd_fd = getattr(self.term, "_keyboard_fd", None)
+        if waiter is None and isinstance(kbd_fd, int):
+            self.waiter.add(kbd_fd, self.WAIT_TAG_KEY)
+
+        # ソケットから受け取ったコマンドも、キー入力と同じ select で待つ
+        self.control = control
+        self.ctl_keys: list[str] = []  # 受け取ったコマンドのキー
+        if control is not None:
+            self.waiter.add(control.fileno(), self.WAIT_TAG_CTL)
 
         self.cmd: List[TimerCmd] = self.cmd_list()
         # self.cmd を {"key": fn} の形式に展開する。
         # fn = self.key_map["key"] となる。
         self.key_map = {k: item.fn for item in self.cmd for k in item.keys}
+        self.key_cmd = {k: item for item in self.cmd for k in item.keys}
+        # コマンド名 -> キー (ソケットから受け取ったコマンド用)
+        self.name_key = {item.name: item.keys[0] for item in self.cmd}
+
+    def reset(
+        self,
+        title: tuple[str, str],
+        t_limit: float,
+        alarm_params: AlarmParams | None = None,
+    ):
+        """Reset for the next run.
+
+        端末、キーマップ、キャッシュなどはそのまま使い回し、
+        タイトル、制限時間、状態だけを初期化する。
+        """
+        logger.debug(f"title={title},limit={t_limit}")
+
+        self.col["title"].value = title[0]
+        self.col["title"].color = title[1]
+        self.core.reset(t_limit)
+        if alarm_params is not None:
+            self.alarm_params = alarm_params
+
+        self.alarm_active = False
+        self.quit_by_quitcmd = False
+
+        self.pbar.total = t_limit
+        self.rate_band = ("", 0.0, 0.0)
+        self.renderer.invalidate()
 
     def col_list(self) -> dict[str, TimerCol]:
         """Column list."""
@@ -151,30 +285,34 @@ class BaseTimer:
                 info="Backward 1 second.",
                 keys=["KEY_LEFT", "KEY_CTRL_B", "H", "-", "KEY_BACKSPACE"],
                 fn=lambda: self.fn_backward(1.0),
+                seek=-1.0,
             ),
             TimerCmd(
                 name="forward1",
                 info="Forward 1 second.",
                 keys=["KEY_RIGHT", "KEY_CTRL_F", "L", "+", "="],
                 fn=lambda: self.fn_forward(1.0),
+                seek=1.0,
             ),
             TimerCmd(
                 name="bk10",
                 info="Backward 10 seconds.",
                 keys=["KEY_UP", "KEY_CTRL_P", "K"],
                 fn=lambda: self.fn_backward(10.0),
+                seek=-10.0,
             ),
             TimerCmd(
                 name="forward10",
                 info="Forward 10 seconds.",
                 keys=["KEY_DOWN", "KEY_CTRL_N", "J"],
                 fn=lambda: self.fn_forward(10.0),
+                seek=10.0,
             ),
             TimerCmd(
                 name="clear",
                 info="Clear terminal.",
                 keys=["KEY_CTRL_L"],
-                fn=click.clear,
+                fn=self.fn_clear,
             ),
             TimerCmd(
                 name="next",
@@ -225,100 +363,408 @@ class BaseTimer:
         ret = f"{self.keys_str(cmd.keys):<40}: {cmd.info}"
         return ret
 
-    def main(self) -> bool:
+    def main(self, t_start: float | None = None) -> bool:
         """Main.
 
+        Args:
+            t_start (float | None): 開始時刻 (clock.monotonic())。
+                None の場合は現在時刻。
+
         Return:
             bool: quitコマンドで終了した場合は True
         """
-        logger.debug("start.")
-
-        self.t_start = time.monotonic()
-        self.t_elapsed = 0.0
-
-        self.is_active = True
-        self.is_paused = False
+        prev_handler = self.set_sigwinch_handler(self.on_resize)
+        try:
+            return self.main_loop(t_start)
+        finally:
+            self.set_sigwinch_handler(prev_handler)
+
+    def main_loop(self, t_start: float | None = None) -> bool:
+        """Main loop."""
+        logger.debug(f"start. t_start={t_start}")
+        self.begin(t_start)
+
+        timeout: float | None = 0.0  # 最初の表示は待たない
+        publish = True  # 状態ファイルを書く (状態が変わった時だけ)
+        with self.cbreak():
+            if not self.stream:
+                self.check_sync_output()
 
-        with self.term.cbreak():
             # メインループ
             while self.is_active:
-                # if self.term.width != prev_term_width:
-                #     logger.debug(f"term.width={self.term.width}")
-                #     prev_term_width = self.term.width
-                #     click.echo(f"{ESQ_EL2}")
-
-                # キー入力
-                key_name = self.get_key_name()
-                if key_name:
-                    logger.debug(f"key_name=[{key_name}]")
-
-                # キーマップに登録されているメソッドを呼び出す
-                if key_name in self.key_map:
-                    self.key_map[key_name]()
-
-                # 時間経過
-                t_cur = time.monotonic()
-
-                if self.is_paused:
-                    # ポーズ中は、self.t_elapsed を固定し、self.t_start を調整
-                    self.t_start = t_cur - self.t_elapsed
-                else:
-                    self.t_elapsed = min(t_cur - self.t_start, self.t_limit)
-
-                # 表示
-                self.display()
-
-                # 終了判定
-                if self.t_elapsed >= self.t_limit:
-                    if not self.is_paused:
-                        self.is_active = False
-                        self.alarm_active = True
+                # キー入力 (次に表示が変わる時刻まで待つ)
+                # 溜まっているキーは全て読み、まとめて処理してから表示する
+                key_names = self.get_key_names(timeout)
+                if key_names:
+                    logger.debug(f"key_names={key_names}")
+                self.step(key_names, publish)
+                publish = False
+
+                timeout = self.next_timeout()
+
+        if self.stream:
+            quit_by_quitcmd = self.stream_end()
+            self.publish()
+            return quit_by_quitcmd
 
         # タイマー満了、または、終了
         key_name = ""
-        thr = None
-        if (
-            thr := self.ring_alarm()
-        ):  # アラーム alarm_active によっては鳴らない
-            try:
-                with self.term.cbreak():
-                    while self.alarm_active:
-                        key_name = self.get_key_name()
-                        if not key_name:
-                            self.display()
-                            continue
-                        logger.debug(f"in_key=[{key_name}]")
-                        break
-            finally:
-                pass
+        if self.ring_alarm():  # アラーム alarm_active によっては鳴らない
+            with self.term.cbreak():
+                while self.alarm_active:
+                    key_name = self.get_key_name(self.next_timeout())
+                    if not key_name:
+                        self.display()
+                        continue
+                    logger.debug(f"in_key=[{key_name}]")
+                    break
+
+        return self.finish(key_name)
+
+    def begin(self, t_start: float | None = None):
+        """Start the timer (before the first step())."""
+        t_now = self.clock.monotonic()
+        self.core.start(t_now, t_start)
+        self.wakeups = 0
+        self.t_main_start = t_now
+        self.renderer.invalidate()
+
+        if self.stream:
+            self.event("start")
+            self.t_next_tick = t_now + self.stream.tick
+
+    def step(self, key_names: list[str], publish: bool = False):
+        """One frame: run the keys, advance, display and check the time up.
+
+        Args:
+            publish (bool): 状態ファイルを書く。
+                キーを処理した場合と、終了した場合も書く。
+        """
+        if key_names:
+            self.dispatch(key_names)
+            publish = True
 
-        self.alarm_active = False
+        # 時間経過
+        self.advance(self.clock.monotonic())
+
+        # 表示
         self.display()
-        click.echo()
 
-        click.echo(f"{ESQ_EL2}[{key_name}]\r", nl=False)
+        # 終了判定
+        self.check_timeup()
+
+        if publish or not self.is_active:
+            self.publish()
+
+    def finish(self, key_name: str = "") -> bool:
+        """Stop the alarm and show the key that stopped it.
+
+        Args:
+            key_name (str): アラームを止めたキー。
+
+        Returns:
+            bool: quitコマンドで終了した場合は True
+        """
+        # ベルを止める (鳴らしていなければ、すぐに返る)
+        self.alarm_active = False
+        self.alarm.stop(self)
+        self.publish()
+
+        self.display()
+        self.out.write(f"\n{ESQ_EL2}[{key_name}]\r")
+        self.out.flush()
 
         if self.key_map.get(key_name) == self.fn_quit:
             self.quit_by_quitcmd = True
 
-        if thr:
-            thr.join()
-        click.echo(f"{ESQ_EL2}\r", nl=False)
+        self.out.write(f"{ESQ_EL2}\r")
+        self.out.flush()
 
-        logger.debug("done.")
+        logger.debug(
+            f"done. wakeups={self.wakeups}({self.wakeups_per_min():.1f}/min)"
+        )
+        return self.quit_by_quitcmd
+
+    def advance(self, t_cur: float):
+        """Update the elapsed time to t_cur."""
+        self.core.advance(t_cur)
+
+    def check_timeup(self) -> bool:
+        """Stop if the time is up.
+
+        Returns:
+            bool: 満了して止めた場合は True
+        """
+        if self.core.check_limit():
+            self.alarm_active = True
+            return True
+        return False
+
+    def cbreak(self):
+        """cbreak mode of the terminal.
+
+        ストリームの場合は、端末の設定を変えない。
+        """
+        if self.stream:
+            return contextlib.nullcontext()
+        return self.term.cbreak()
+
+    def event(self, name: str, **fields):
+        """Write an event to the stream."""
+        if not self.stream:
+            return
+        self.stream.emit(
+            name,
+            self.clock.time(),
+            {
+                "title": self.col["title"].value.strip(),
+                "elapsed": round(self.t_elapsed, 3),
+                "remain": round(max(self.t_limit - self.t_elapsed, 0.0), 3),
+                "limit": self.t_limit,
+                **fields,
+            },
+        )
+
+    def stream_tick(self):
+        """Write a tick event if it is time.
+
+        遅れた場合も、tick は1回だけ書き、次の時刻を先に進める。
+        """
+        if self.is_paused or not self.is_active or self.stream is None:
+            return
+
+        t_now = self.clock.monotonic()
+        if t_now < self.t_next_tick:
+            return
+
+        self.event("tick")
+        tick = self.stream.tick
+        self.t_next_tick += (
+            math.floor((t_now - self.t_next_tick) / tick + 1) * tick
+        )
+
+    def stream_end(self) -> bool:
+        """Write the end events.
+
+        ストリームではベルを鳴らさず、キー入力も待たない。
+
+        Returns:
+            bool: quitコマンドで終了した場合は True
+        """
+        if self.quit_by_quitcmd:
+            reason = "quit"
+        elif self.alarm_active:
+            reason = "timeup"
+            self.event("alarm")
+        else:
+            reason = "next"
+        self.alarm_active = False
+
+        self.event("end", reason=reason)
         return self.quit_by_quitcmd
 
-    def get_key_name(self) -> str:
+    def publish(self):
+        """Write the state to the status file.
+
+        読む側が経過時間を補うので、状態が変わった時だけ呼べばよい。
+        """
+        if self.status is None:
+            return
+        self.status.write(
+            self.col["title"].value.strip(),
+            self.t_limit,
+            self.t_elapsed,
+            self.clock.time(),
+            active=self.is_active,
+            paused=self.is_paused,
+            alarm=self.alarm_active,
+        )
+
+    def check_sync_output(self):
+        """Enable synchronized output if the terminal supports it.
+
+        問い合わせは最初の一回だけ。
+        """
+        if self.sync_checked:
+            return
+        self.sync_checked = True
+
+        does_sync = getattr(self.term, "does_synchronized_output", None)
+        if does_sync is None:
+            return  # 古い blessed
+
+        self.out.sync = bool(does_sync(timeout=self.SYNC_QUERY_TIMEOUT))
+        logger.debug(f"sync={self.out.sync}")
+
+    @staticmethod
+    def set_sigwinch_handler(handler):
+        """Set SIGWINCH handler.
+
+        Returns:
+            previous handler, or None if not available.
+        """
+        if handler is None or not hasattr(signal, "SIGWINCH"):
+            return None
+        if threading.current_thread() is not threading.main_thread():
+            return None  # シグナルハンドラはメインスレッドでしか設定できない
+        return signal.signal(signal.SIGWINCH, handler)
+
+    def on_resize(self, _signum=None, _frame=None):
+        """Terminal resized.
+
+        SIGWINCH ハンドラ。端末サイズを読み直し、キャッシュを無効にして、
+        待機中のメインループを起こす。
+        """
+        self.width = self.term.width
+        self.height = self.term.height
+        self._layout_cache.clear()
+        self.renderer.invalidate()
+        self.waiter.wake()
+
+    def wakeups_per_min(self) -> float:
+        """Wakeups per minute since main() started."""
+        t_run = self.clock.monotonic() - self.t_main_start
+        if t_run <= 0:
+            return 0.0
+        return self.wakeups / t_run * SEC_MIN
+
+    def next_timeout(self) -> float | None:
+        """Seconds until the display changes next.
+
+        表示中のカラムのうち、次に変化するものまでの秒数。
+        キー入力はこれを待たずに、すぐに返る。
+
+        Returns:
+            float | None: None なら、キー入力まで待つ。
+        """
+        if self.stream:
+            return self.stream_timeout()
+
+        timeouts = []
+
+        if self.col["time"].use:
+            timeouts.append(1.0 - self.clock.time() % 1.0)  # 時計の次の秒
+        elif self.col["date"].use:
+            timeouts.append(self.sec_to_midnight())
+
+        if self.is_active and not self.is_paused:
+            timeouts.extend(self.running_timeouts())
+
+        if not timeouts:
+            return None  # ポーズ中など: キー入力まで待つ
+
+        return max(min(timeouts), 0.0) + self.WAKE_MARGIN
+
+    def stream_timeout(self) -> float | None:
+        """Seconds until the next tick or the time up."""
+        if not self.is_active or self.is_paused:
+            return None
+
+        t_now = self.clock.monotonic()
+        t_remain = self.t_limit - self.t_elapsed
+        timeout = min(self.t_next_tick - t_now, t_remain)
+        return max(timeout, 0.0) + self.WAKE_MARGIN
+
+    def running_timeouts(self) -> list[float]:
+        """Seconds until each running column changes."""
+        t_elapsed = self.t_elapsed
+        t_remain = self.t_limit - t_elapsed
+        frame_sec = 1.0 / self.fps  # アニメーションの最小間隔
+
+        timeouts = [t_remain]  # 満了
+
+        if self.col["elapsed"].use:
+            timeouts.append(1.0 - t_elapsed % 1.0)
+        if self.col["remain"].use:
+            timeouts.append(t_remain - math.ceil(t_remain) + 1.0)
+
+        if self.t_limit > 0:
+            if self.col["rate"].use:
+                # 0.1% 単位で四捨五入して表示している
+                timeouts.append(max(self.t_until_round(1000.0), frame_sec))
+            if self.col["pbar"].use:
+                if self.spinner:
+                    timeouts.append(frame_sec)
+                elif self.pbar_len > 0:
+                    timeouts.append(
+                        max(self.t_until_round(self.pbar_len), frame_sec)
+                    )
+
+        return timeouts
+
+    def t_until_round(self, scale: float) -> float:
+        """Seconds until round(t_elapsed / t_limit * scale) changes."""
+        x = self.t_elapsed / self.t_limit * scale
+        dx = math.floor(x + 0.5) + 0.5 - x
+        return dx * self.t_limit / scale
+
+    def sec_to_midnight(self) -> float:
+        """Seconds until the date changes."""
+        t_now = self.clock.time()
+        lt = self.clock.localtime(t_now)
+        sec_of_day = (lt.tm_hour * MIN_HOUR + lt.tm_min) * SEC_MIN + lt.tm_sec
+        return HOUR_DAY * MIN_HOUR * SEC_MIN - sec_of_day - t_now % 1.0
+
+    def get_key_name(self, timeout: float | None = IN_KEY_TIMEOUT) -> str:
         """Get key name.
 
         **Important**
         Remember to call self.term.break() before calling this function.
+
+        Args:
+            timeout (float | None): seconds to wait.
+                None means waiting for a key.
         """
-        in_key = self.term.inkey(timeout=self.IN_KEY_TIMEOUT)
+        # 受け取り済みのコマンドやバッファ済みのキーがあれば、待たずに返す
+        if self.ctl_keys:
+            return self.ctl_keys.pop(0)
+        in_key = self.term.inkey(timeout=0)
+        if not in_key:
+            # キー入力、コマンド、SIGWINCH、タイムアウトのいずれかで起きる
+            ready = self.clock.wait(self.waiter, timeout)
+            self.wakeups += 1
+            if self.stats:
+                self.stats.wakeup()
+            if self.WAIT_TAG_CTL in ready:
+                self.recv_control()
+                if self.ctl_keys:
+                    if self.stats:
+                        self.stats.key()
+                    return self.ctl_keys.pop(0)
+            if self.WAIT_TAG_KEY in ready:
+                in_key = self.term.inkey(timeout=0)
 
         if not in_key:
             return ""
+        if self.stats:
+            self.stats.key()
 
+        return self.key_name(in_key)
+
+    def get_key_names(
+        self, timeout: float | None = IN_KEY_TIMEOUT
+    ) -> list[str]:
+        """Get all buffered key names.
+
+        最初のキーは get_key_name() と同じように待ち、
+        残りは待たずに、溜まっている分だけ読む。
+        """
+        key_name = self.get_key_name(timeout)
+        if not key_name:
+            return []
+
+        key_names = [key_name] + self.ctl_keys
+        self.ctl_keys = []
+        while len(key_names) < self.MAX_KEYS:
+            in_key = self.term.inkey(timeout=0)
+            if not in_key:
+                break
+            key_names.append(self.key_name(in_key))
+        return key_names
+
+    @staticmethod
+    def key_name(in_key) -> str:
+        """Key name of a keystroke."""
         logger.debug(
             f"Raw: {in_key!r}, Code: {in_key.code}, Name: {in_key.name}"
         )
@@ -334,21 +780,73 @@ class BaseTimer:
 
         return key_name
 
+    def recv_control(self):
+        """Receive commands from the control socket.
+
+        コマンド名をキーに直して ctl_keys に溜め、キー入力と同じく処理する。
+        """
+        if self.control is None:
+            return
+        for name in self.control.recv_all():
+            key = self.name_key.get(name)
+            if key is None:
+                logger.debug(f"unknown command: {name!r}")
+                continue
+            logger.debug(f"command: {name} -> key={key!r}")
+            self.ctl_keys.append(key)
+
+    def dispatch(self, key_names: list[str]):
+        """Run the commands of the keys.
+
+        連続する seek コマンド (進める/戻す) は、一回の seek() にまとめる。
+        タイマーが終了したら、残りのキーは捨てる。
+        """
+        seeks: list[float] = []
+        for key_name in key_names:
+            cmd = self.key_cmd.get(key_name)
+            if cmd is None:
+                continue
+            if cmd.seek:
+                seeks.append(cmd.seek)
+                continue
+
+            if seeks:
+                self.seek(seeks)
+                seeks = []
+            cmd.fn()
+            if not self.is_active:
+                return
+
+        if seeks:
+            self.seek(seeks)
+
     def fn_help(self):
-        """Quit."""
+        """Help."""
         logger.debug("")
-        click.echo(f"{ESQ_EL2}COMMAND LIST")
+        if self.stream:
+            return
+        self.out.write(f"\r{ESQ_EL2}COMMAND LIST\n")
         for c in self.cmd:
             if c.name == "next" and not self.enable_next:
                 continue
-            click.echo(f"  {self.mk_cmd_str(c)}")
-        click.echo()
+            self.out.write(f"  {self.mk_cmd_str(c)}\n")
+        self.out.write("\n")
+        self.out.flush()
+        self.renderer.invalidate()
+
+    def fn_clear(self):
+        """Clear terminal."""
+        logger.debug("")
+        if self.stream:
+            return
+        self.out.write(f"{ESQ_ED2}{ESQ_HOME}")
+        self.out.flush()
+        self.renderer.invalidate()
 
     def fn_quit(self):
         """Quit."""
         logger.debug("")
-        self.is_active = False
-        self.is_paused = False
+        self.core.stop(self.clock.monotonic())
         self.alarm_active = False
         self.quit_by_quitcmd = True
 
@@ -358,54 +856,73 @@ class BaseTimer:
         if not self.enable_next:
             return
 
-        self.is_active = False
-        self.is_paused = False
+        self.core.stop(self.clock.monotonic())
         self.alarm_active = False
 
     def fn_pause(self):
-        self.is_paused = not self.is_paused
+        t_cur = self.clock.monotonic()
+        self.core.toggle_pause(t_cur)
         logger.debug(f"is_paused={self.is_paused}")
 
+        if self.stream:
+            self.event("pause" if self.is_paused else "resume")
+            if not self.is_paused:
+                self.t_next_tick = t_cur + self.stream.tick
+
     def fn_forward(self, sec: float = 1.0):
         logger.debug(f"sec={sec}")
-        t_cur = time.monotonic()
-        self.t_start = max(self.t_start - sec, t_cur - self.t_limit)
-        self.t_elapsed = t_cur - self.t_start
+        self.seek([sec])
 
     def fn_backward(self, sec: float = 1.0):
-        t_cur = time.monotonic()
-        self.t_start = min(self.t_start + sec, t_cur)
-        self.t_elapsed = t_cur - self.t_start
+        self.seek([-sec])
+
+    def seek(self, secs: list[float]):
+        """Seek by secs in order, at once.
+
+        一つずつ進めたり戻したりした場合と同じく、各ステップで
+        経過時間を 0 から t_limit の範囲に収め、最後に一回だけ反映する。
+        """
+        logger.debug(f"secs={secs}")
+        offset = self.core.seek(self.clock.monotonic(), secs)
+        self.event("seek", offset=round(offset, 3))
 
     def display(self):
         """Display."""
         # logger.debug("")
-        t_remain = max(self.t_limit - self.t_elapsed, 0)
+        if self.stream:
+            self.stream_tick()  # 画面は描画しない
+            return
 
-        # 表示文字列パーツの生成
-        def t_str(sec: int | float, omit_sec: bool = False) -> str:
-            """Time string.
+        t_frame = self.stats.now() if self.stats else 0.0
 
-            sec -> "M:SS"
-            """
-            m, s = divmod(sec, SEC_MIN)
-            if m < MIN_HOUR:
-                if omit_sec and s == 0:
-                    return f"{m:2.0f}m"
-                return f"{m:2.0f}m{s:02.0f}s"
+        cells = self.mk_cells(self.width)
+        if cells is None:
+            # 表示する項目がなくなった場合
+            self.renderer.invalidate()
+            self.out.write(f"\r{ESQ_EL2}" + style("!?", blink=True))
+            self.out.flush()
+            return
 
-            h, m = divmod(m, MIN_HOUR)
-            if omit_sec and s == 0:
-                return f"{h:.0f}h{m:02.0f}m"
+        # 表示 (前回から変化した部分のみ)
+        self.out.write(self.renderer.render(cells))
+        n_bytes = self.out.flush()
+        if self.stats:
+            self.stats.frame(t_frame, n_bytes)
 
-            return f"{h:.0f}h{m:02.0f}m{s:02.0f}s"
+    def mk_cells(self, width: int) -> list[Cell] | None:
+        """Cells of the current state.
 
-        self.col["date"].value = f"{time.strftime('%Y-%m-%d')}"
-        self.col["time"].value = f"{time.strftime('%H:%M:%S')}"
-        self.col["limit"].value = t_str(self.t_limit, omit_sec=True)
-        self.col["elapsed"].value = t_str(self.t_elapsed)
-        self.col["remain"].value = t_str(t_remain)
-        self.col["pbar"].value = "-" * self.PBAR_LEN_MIN  # 仮の値
+        Returns:
+            list[Cell] | None: 幅が足りず、表示する項目がない場合は None
+        """
+        t_remain = max(self.t_limit - self.t_elapsed, 0)
+
+        self.col["date"].value = f"{self.clock.strftime('%Y-%m-%d')}"
+        self.col["time"].value = f"{self.clock.strftime('%H:%M:%S')}"
+        # 経過時間は切り捨て、残り時間は切り上げて、整数秒で表示する
+        self.col["limit"].value = t_str(round(self.t_limit), omit_sec=True)
+        self.col["elapsed"].value = t_str(int(self.t_elapsed))
+        self.col["remain"].value = t_str(math.ceil(t_remain))
 
         ## col["state"]
         self.col["state"].value = ""
@@ -418,109 +935,153 @@ class BaseTimer:
         t_rate = self.t_elapsed / self.t_limit * 100
         self.col["rate"].value = f"{round(t_rate, 1):5.1f}%"
 
-        ## t_rate に応じて色を変更
-        for c in self.col:
-            col = self.col[c]
-            if not col.rate_color:
-                continue
-
-            for c in self.PERCENT_COLOR:
-                if t_rate >= self.PERCENT_COLOR[c]:
-                    col.color = c
+        ## t_rate に応じて色を変更 (色の境界を越えた時だけ)
+        _, rate_lo, rate_hi = self.rate_band
+        if not rate_lo <= t_rate < rate_hi:
+            self.rate_band = self.get_rate_band(t_rate)
+            for col in self.col.values():
+                if col.rate_color:
+                    col.color = self.rate_band[0]
 
-        # 表示項目（コピーを作成して操作）
-        col_disp = self.COL_PRIORITY[:]
+        # 表示項目
+        plan = self.layout(width)
         for c in self.col:
-            self.col[c].use = True
-
-        # 行の長さを計算する関数
-        def all_len(cols: list[str]) -> int:
-            """Calculate length."""
-            # logger.debug(f"cols={cols}")
-            _len = 0
-            for c in cols:
-                val = self.col[c].value
-                if val:
-                    _len += len(val) + 1
-                # logger.debug(f"'{val}' {_len}")
-            _len -= 1 if _len > 0 else 0
-            # logger.debug(f"all_len={_len}")
-            return _len
-
-        # 長過ぎる場合、優先度に応じて表示する項目を省略する
-        while all_len(col_disp) > self.term.width:
-            c_name = col_disp.pop()  # 最低優先度項目抜く
-            # logger.debug(f"c_name={c_name},c_priority={col_disp}")
-            self.col[c_name].use = False
+            self.col[c].use = c in plan.use
 
-        if not col_disp:
-            # 表示する項目がなくなった場合
-            click.secho(f"\r{ESQ_EL2}!?", blink=True, nl=False)
-            return
+        if not plan.use:
+            return None
 
         # プログレスバーを表示する場合の処理
-        if "pbar" in col_disp:
-            # プログレスバーの長さ
-            col_disp.remove("pbar")
-            pbar_len = self.term.width - all_len(col_disp) - 1
-            # logger.debug(f"pbar_len={pbar_len}")
-
-            # ポーズ中・終了時は、風車を止める
-            pbar_stop = self.is_paused or (not self.is_active)
+        self.pbar_len = plan.pbar_len
+        if plan.pbar_len:
+            # ポーズ中・終了時・風車なしの場合は、風車を止める
+            pbar_stop = (
+                self.is_paused or (not self.is_active) or (not self.spinner)
+            )
 
             # プログレスバー生成
             self.col["pbar"].value = self.pbar.get_str(
-                self.t_elapsed, bar_len=pbar_len, stop=pbar_stop
+                self.t_elapsed, bar_len=plan.pbar_len, stop=pbar_stop
             )
 
-        # 表示する文字列を作成(スタイル付き)
-        # **注意** col_priorityを使うと順番が崩れる
-        str_disp = "\r"
-        for col_key in self.col:
-            f_blink = False
+        # 表示するセルを作成
+        cells = []
+        for col_key, x in zip(plan.cols, plan.x):
             c = self.col[col_key]
-            if c.use:
-                if c.pause_blink and self.is_paused:
-                    f_blink = True
-                if col_key == "state" and self.t_elapsed >= self.t_limit:
-                    f_blink = True
-
-                str_disp += click.style(
-                    c.value,
-                    fg=c.color,
-                    bold=c.bold,
-                    blink=f_blink,
-                )
-                if c.value:
-                    str_disp += " "
-
-        # 表示 ([:-1] .. 行末の " " は表示しない)
-        click.echo(f"{ESQ_EL2}{str_disp[:-1]}", nl=False)
-
-    def thr_alarm(self, count, sec1, sec2):
-        """Alarm thread function."""
-        logger.debug(f"count={count},sec1={sec1},sec2={sec2}")
-
-        for _ in range(count):
-            for s in [sec1, sec2]:
-                if self.alarm_active:
-                    click.echo("\a", nl=False)
-                    time.sleep(s)
 
+            f_blink = False
+            if c.pause_blink and self.is_paused:
+                f_blink = True
+            if col_key == "state" and self.t_elapsed >= self.t_limit:
+                f_blink = True
+
+            cells.append(Cell(x, c.value, c.color, c.bold, f_blink))
+
+        return cells
+
+    def get_rate_band(self, t_rate: float) -> tuple[str, float, float]:
+        """Color band of PERCENT_COLOR containing t_rate.
+
+        Returns:
+            tuple[str, float, float]: (color, lower, upper)
+        """
+        color, lower, upper = "", -math.inf, math.inf
+        for c, th in sorted(self.PERCENT_COLOR.items(), key=lambda i: i[1]):
+            if t_rate >= th:
+                color, lower = c, th
+            else:
+                upper = th
+                break
+        return color, lower, upper
+
+    def layout(self, width: int) -> LayoutPlan:
+        """Layout plan for the current values.
+
+        (端末幅, プログレスバー以外の各カラムの長さ) をキーにキャッシュする。
+        """
+        key = (
+            width,
+            tuple(
+                text_width(c.value)
+                for k, c in self.col.items()
+                if k != "pbar"
+            ),
+        )
+        if (plan := self._layout_cache.get(key)) is None:
+            if len(self._layout_cache) >= self.LAYOUT_CACHE_MAX:
+                self._layout_cache.clear()
+            plan = self._layout_cache[key] = self.mk_layout(width)
+        return plan
+
+    def mk_layout(self, width: int) -> LayoutPlan:
+        """Make layout plan.
+
+        長過ぎる場合、優先度に応じて表示する項目を省略する。
+        """
+        col_len = {
+            k: self.PBAR_LEN_MIN if k == "pbar" else text_width(c.value)
+            for k, c in self.col.items()
+        }
+
+        # 行の長さ (項目間の空白を含む)
+        col_disp = self.col_priority[:]
+        line_len = sum(col_len[c] + 1 for c in col_disp if col_len[c]) - 1
+        line_len = max(line_len, 0)
+        while col_disp and line_len > width:
+            c_name = col_disp.pop()  # 最低優先度項目抜く
+            if col_len[c_name]:
+                line_len -= col_len[c_name] + 1
+
+        pbar_len = 0
+        if "pbar" in col_disp:
+            # プログレスバーの長さ: 残りの幅すべて
+            pbar_len = width - line_len + col_len["pbar"]
+            col_len["pbar"] = pbar_len
+
+        # **注意** col_priorityを使うと順番が崩れる
+        cols = []
+        x_list = []
+        x = 0
+        for c in self.col:
+            if c in col_disp and col_len[c]:
+                cols.append(c)
+                x_list.append(x)
+                x += col_len[c] + 1
+
+        return LayoutPlan(
+            frozenset(col_disp), tuple(cols), tuple(x_list), pbar_len
+        )
+
+    def bell(self):
+        """Ring the bell once."""
+        self.out.write("\a")
+        self.out.flush()
+
+    def on_alarm_done(self):
+        """Alarm rang count times.
+
+        アラームのスレッドから呼ばれる。
+        """
         self.alarm_active = False
+        self.waiter.wake()  # キー入力待ちのアラームループを起こす
 
-    def ring_alarm(self) -> threading.Thread | None:
+    def ring_alarm(self) -> bool:
         """Ring alarm.
 
-        make thread and start.
+        共有のアラームスケジューラで鳴らす。
+
+        Returns:
+            bool: 鳴らし始めた場合は True
         """
         logger.debug(f"alarm_params={self.alarm_params}")
 
         if not self.alarm_active:
-            return None
+            return False
 
-        thr = threading.Thread(
-            target=self.thr_alarm, args=self.alarm_params, daemon=True
+        self.alarm.start(
+            *self.alarm_params,
+            bell=self.bell,
+            on_done=self.on_alarm_done,
+            owner=self,
         )
-        thr.start()
-        return thr
+        return True
@@ -0,0 +1,154 @@
+#
+# (c) 2026 Yoichi Tanibayashi
+#
+import heapq
+import itertools
+import time
+from collections.abc import Callable
+from time import struct_time
+
+from .waiter import Waiter
+
+
+class Clock:
+    """Real clock.
+
+    時刻の取得と待機をまとめたもの。
+    テストやシミュレーションでは VirtualClock に差し替える。
+    """
+
+    virtual = False
+
+    def monotonic(self) -> float:
+        """Monotonic time (sec)."""
+        return time.monotonic()
+
+    def time(self) -> float:
+        """Wall-clock time (sec since the epoch)."""
+        return time.time()
+
+    def localtime(self, secs: float | None = None) -> struct_time:
+        """Local time of secs (default: time())."""
+        return time.localtime(self.time() if secs is None else secs)
+
+    def strftime(self, fmt: str) -> str:
+        """Format local time."""
+        return time.strftime(fmt, self.localtime())
+
+    def sleep(self, sec: float):
+        """Sleep."""
+        time.sleep(sec)
+
+    def wait(self, waiter: Waiter, timeout: float | None) -> set[str]:
+        """Wait for the waiter or a timeout.
+
+        Returns:
+            set[str]: Waiter.wait() の戻り値
+        """
+        return waiter.wait(timeout)
+
+
+class VirtualClock(Clock):
+    """Virtual clock.
+
+    実際には待たずに時刻を進める。
+    call_at(), call_later() で登録した関数は、その時刻になった時に呼ぶ。
+    セッション全体を、決まった順序で、一瞬でシミュレーションできる。
+    """
+
+    virtual = True
+
+    DEF_WALL = 1_767_225_600.0  # 2026-01-01 00:00:00 UTC
+
+    def __init__(self, t_mono: float = 0.0, t_wall: float = DEF_WALL):
+        """Constructor.
+
+        Args:
+            t_mono (float): monotonic() の初期値。
+            t_wall (float): time() の初期値。
+        """
+        self.t = t_mono
+        self._wall_offset = t_wall - t_mono
+
+        # (時刻, 登録順, 関数)
+        self._events: list[tuple[float, int, Callable[[], None]]] = []
+        self._seq = itertools.count()
+        self._cancelled: set[int] = set()
+
+    def monotonic(self) -> float:
+        """Virtual monotonic time."""
+        return self.t
+
+    def time(self) -> float:
+        """Virtual wall-clock time."""
+        return self.t + self._wall_offset
+
+    def call_at(self, t: float, fn: Callable[[], None]) -> int:
+        """Call fn at monotonic time t.
+
+        Returns:
+            int: cancel() に渡す ID
+        """
+        seq = next(self._seq)
+        heapq.heappush(self._events, (t, seq, fn))
+        return seq
+
+    def call_later(self, delay: float, fn: Callable[[], None]) -> int:
+        """Call fn after delay seconds."""
+        return self.call_at(self.t + delay, fn)
+
+    def cancel(self, event_id: int):
+        """Cancel a registered call."""
+        self._cancelled.add(event_id)
+
+    def next_event(self) -> float | None:
+        """Time of the next registered call."""
+        while self._events and self._events[0][1] in self._cancelled:
+            self._cancelled.discard(heapq.heappop(self._events)[1])
+        return self._events[0][0] if self._events else None
+
+    def run_next(self, t_limit: float = float("inf")) -> bool:
+        """Advance to the next call at or before t_limit and run it.
+
+        Returns:
+            bool: 呼び出した場合は True
+        """
+        t_next = self.next_event()
+        if t_next is None or t_next > t_limit:
+            return False
+
+        _, _, fn = heapq.heappop(self._events)
+        self.t = max(self.t, t_next)
+        fn()
+        return True
+
+    def advance(self, sec: float):
+        """Advance time, running the calls on the way."""
+        t_target = self.t + sec
+        while self.run_next(t_target):
+            pass
+        self.t = max(self.t, t_target)
+
+    def sleep(self, sec: float):
+        """Sleep in virtual time."""
+        self.advance(sec)
+
+    def wait(self, waiter: Waiter, timeout: float | None) -> set[str]:
+        """Wait in virtual time.
+
+        登録された呼び出しがあれば、その時刻まで進めて呼び出し、
+        wake() された場合と同じように戻る。
+        なければ timeout だけ進める。
+        """
+        ready = waiter.wait(0)  # 実際の入力や wake() も拾う
+        if ready:
+            return ready
+
+        t_limit = float("inf") if timeout is None else self.t + timeout
+        if self.run_next(t_limit):
+            return waiter.wait(0)
+
+        if timeout is None:
+            raise RuntimeError("VirtualClock: waiting forever")
+        self.t = t_limit
+        return set()
@@ -0,0 +1,142 @@
+#
+# (c) 2026 Yoichi Tanibayashi
+#
+# `tmr ctl` から使うので、軽いモジュールだけを import すること。
+import glob
+import os
+import socket
+
+from .status import check_dir, make_dir, pid_alive, status_dir
+
+SUFFIX = ".sock"
+MSG_MAX = 256  # bytes, コマンド1つの最大長
+
+# 受け付けるコマンド名 (BaseTimer.cmd_list() の name)
+COMMANDS = (
+    "pause",
+    "backward1",
+    "forward1",
+    "bk10",
+    "forward10",
+    "clear",
+    "next",
+    "quit",
+    "help",
+)
+
+
+class ControlSocket:
+    """Control socket of a running timer.
+
+    Unix ドメインのデータグラムソケットで、1つのデータグラムに
+    1つのコマンド名 (TimerCmd.name) を受け取る。
+    fd を Waiter に登録し、キー入力と同じ select で待つ。
+    """
+
+    def __init__(self, name: str = "", directory: str | None = None):
+        """Constructor.
+
+        Args:
+            name (str): 1つのプロセスで複数のタイマーを動かす場合の名前。
+            directory (str | None): None の場合は status_dir()。
+
+        Raises:
+            PermissionError: ディレクトリが自分のものではない (make_dir())
+        """
+        self.dir = make_dir(directory or status_dir())
+
+        pid = os.getpid()
+        fname = f"{pid}-{name}" if name else f"{pid}"
+        self.path = os.path.join(self.dir, f"{fname}{SUFFIX}")
+
+        try:
+            os.unlink(self.path)  # 同じ pid で残っていたもの
+        except FileNotFoundError:
+            pass
+
+        self.sock: socket.socket | None = socket.socket(
+            socket.AF_UNIX, socket.SOCK_DGRAM
+        )
+        self.sock.setblocking(False)
+        self.sock.bind(self.path)
+
+    def fileno(self) -> int:
+        """File descriptor for Waiter."""
+        return self.sock.fileno() if self.sock else -1
+
+    def recv_all(self) -> list[str]:
+        """Receive all queued commands without waiting."""
+        cmds: list[str] = []
+        if self.sock is None:
+            return cmds
+        while True:
+            try:
+                data = self.sock.recv(MSG_MAX)
+            except (BlockingIOError, InterruptedError):
+                break
+            cmd = data.decode(errors="replace").strip()
+            if cmd:
+                cmds.append(cmd)
+        return cmds
+
+    def close(self):
+        """Close and remove the socket."""
+        if self.sock is None:
+            return
+        self.sock.close()
+        self.sock = None
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def socket_paths(directory: str | None = None) -> list[str]:
+    """Control sockets of the running timers.
+
+    終了したプロセスのソケット (異常終了で残ったもの) は削除する。
+    """
+    directory = directory or status_dir()
+    try:
+        check_dir(directory)
+    except (FileNotFoundError, PermissionError):
+        return []  # ない、または、他のユーザが作ったディレクトリ
+
+    pattern = os.path.join(directory, "*" + SUFFIX)
+    ret = []
+    for path in sorted(glob.glob(pattern)):
+        if pid_alive(socket_pid(path)):
+            ret.append(path)
+            continue
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+    return ret
+
+
+def socket_pid(path: str) -> int:
+    """Pid in the name of a control socket ("PID[-NAME].sock")."""
+    name = os.path.basename(path)[: -len(SUFFIX)]
+    try:
+        return int(name.split("-", 1)[0])
+    except ValueError:
+        return -1
+
+
+def send(path: str, cmds: list[str]):
+    """Send commands to a control socket.
+
+    Raises:
+        ConnectionRefusedError: 受け手のプロセスが終了している
+        FileNotFoundError: ソケットがない
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM) as sock:
+        for cmd in cmds:
+            sock.sendto(cmd.encode()[:MSG_MAX], path)
@@ -0,0 +1,174 @@
+#
+# (c) 2026 Yoichi Tanibayashi
+#
+# 端末や時計に依存しない、タイマーの状態だけを扱う。
+# 時刻は全て引数で渡すので、任意のループから、いくつでも動かせる。
+from typing import NamedTuple
+
+
+class Snapshot(NamedTuple):
+    """State of a TimerCore at a time."""
+
+    elapsed: float
+    remain: float
+    active: bool
+    paused: bool
+    timeup: bool
+
+
+class TimerCore:
+    """Timer state machine.
+
+    開始、ポーズ、シーク、満了の判定だけを行う。
+    時刻 (now) は、呼び出し側の単調増加する時計の値 (秒)。
+
+    ```python
+    core = TimerCore(180.0)
+    core.start(time.monotonic())
+    snap = core.tick(time.monotonic())
+    ```
+    """
+
+    __slots__ = (
+        "active",
+        "elapsed",
+        "limit",
+        "paused",
+        "paused_sec",
+        "seek_sec",
+        "t_pause",
+        "t_start",
+        "timeup",
+    )
+
+    def __init__(self, limit: float):
+        """Constructor.
+
+        Args:
+            limit (float): 制限時間 (sec)。
+        """
+        self.reset(limit)
+
+    def reset(self, limit: float):
+        """Reset to the stopped state."""
+        self.limit = limit
+        self.t_start = 0.0
+        self.elapsed = 0.0
+        self.active = False
+        self.paused = False
+        self.timeup = False
+        self.t_pause = 0.0  # ポーズした時刻
+        self.paused_sec = 0.0  # ポーズしていた時間の合計
+        self.seek_sec = 0.0  # シークで動いた時間の合計
+
+    def start(self, now: float, t_start: float | None = None):
+        """Start.
+
+        Args:
+            t_start (float | None): 開始時刻。None の場合は now。
+                過去の時刻を指定すると、その分だけ経過した状態で始まる。
+        """
+        self.t_start = now if t_start is None else t_start
+        self.elapsed = 0.0
+        self.active = True
+        self.paused = False
+        self.timeup = False
+        self.paused_sec = 0.0
+        self.seek_sec = 0.0
+
+    def stop(self, now: float | None = None):
+        """Stop without the time up.
+
+        Args:
+            now (float | None): ポーズ中の場合、ここまでをポーズした時間に
+                数える。
+        """
+        if self.paused and now is not None:
+            self.paused_sec += now - self.t_pause
+        self.active = False
+        self.paused = False
+
+    def advance(self, now: float):
+        """Update the elapsed time to now.
+
+        ポーズ中は経過時間を固定し、開始時刻をずらす。
+        """
+        if self.paused:
+            self.t_start = now - self.elapsed
+        else:
+            self.elapsed = min(now - self.t_start, self.limit)
+
+    def check_limit(self) -> bool:
+        """Stop if the limit is reached.
+
+        Returns:
+            bool: 満了して止めた場合は True
+        """
+        if self.elapsed >= self.limit and not self.paused:
+            self.active = False
+            self.timeup = True
+            return True
+        return False
+
+    def tick(self, now: float) -> Snapshot:
+        """Advance to now and return the state."""
+        if self.active:
+            self.advance(now)
+            self.check_limit()
+        return self.snapshot()
+
+    def snapshot(self) -> Snapshot:
+        """Current state."""
+        return Snapshot(
+            self.elapsed,
+            max(self.limit - self.elapsed, 0.0),
+            self.active,
+            self.paused,
+            self.timeup,
+        )
+
+    def set_paused(self, paused: bool, now: float):
+        """Pause or resume at now.
+
+        ポーズ中の時間は、経過時間に含めない。
+        """
+        if paused == self.paused:
+            return
+        if paused:
+            self.elapsed = min(max(now - self.t_start, 0.0), self.limit)
+            self.t_pause = now
+        else:
+            self.t_start = now - self.elapsed
+            self.paused_sec += now - self.t_pause
+        self.paused = paused
+
+    def toggle_pause(self, now: float) -> bool:
+        """Toggle pause.
+
+        Returns:
+            bool: ポーズ中なら True
+        """
+        self.set_paused(not self.paused, now)
+        return self.paused
+
+    def seek(self, now: float, secs: list[float]) -> float:
+        """Seek by secs in order, at once.
+
+        一つずつ進めたり戻したりした場合と同じく、各ステップで
+        経過時間を 0 から limit の範囲に収め、最後に一回だけ反映する。
+
+        Returns:
+            float: 実際に動いた時間 (sec)
+        """
+        elapsed = self.elapsed if self.paused else now - self.t_start
+        prev = elapsed
+        for sec in secs:
+            if sec > 0:
+                elapsed = min(elapsed + sec, self.limit)
+            else:
+                elapsed = max(elapsed + sec, 0.0)
+
+        self.t_start = now - elapsed
+        self.elapsed = elapsed
+        self.seek_sec += elapsed - prev
+        return elapsed - prev
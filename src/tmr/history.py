@@ -0,0 +1,249 @@
+#
+# (c) 2026 Yoichi Tanibayashi
+#
+# ポモドーロの各フェーズの記録と集計。
+# `tmr stats` から読むので、軽いモジュールだけを import すること。
+#
+# 記録は固定長のレコードを追記するだけのファイル (history.log)。
+# 日、週、月ごとの合計はインデックス (rollup.json) に持ち、
+# 前回読んだ位置より後のレコードだけを足して更新するので、
+# 何年分の記録があっても、集計は一瞬で終わる。
+import json
+import os
+import struct
+import tempfile
+import time
+from dataclasses import astuple, dataclass
+
+ENV_HISTORY_DIR = "TMR_HISTORY_DIR"
+
+LOG_NAME = "history.log"
+INDEX_NAME = "rollup.json"
+
+MAGIC = b"TMRH"
+HEADER = struct.Struct("<4sI")  # magic, version
+VERSION = 1
+
+# t_start, t_end, limit, elapsed, paused, seek, cycle, phase, result
+RECORD = struct.Struct("<ddddddHBB4x")
+
+PHASES = ("WORK", "SHORT_BREAK", "LONG_BREAK")
+RESULTS = ("completed", "skipped", "quit")
+
+PERIODS = {"day": "%Y-%m-%d", "week": "%G-W%V", "month": "%Y-%m"}
+
+
+def history_dir() -> str:
+    """Directory of the history.
+
+    環境変数 TMR_HISTORY_DIR、$XDG_DATA_HOME/tmr、~/.local/share/tmr の順。
+    """
+    if path := os.environ.get(ENV_HISTORY_DIR):
+        return path
+    data = os.environ.get("XDG_DATA_HOME") or os.path.join(
+        os.path.expanduser("~"), ".local", "share"
+    )
+    return os.path.join(data, "tmr")
+
+
+@dataclass(frozen=True)
+class PhaseRecord:
+    """One phase of a Pomodoro session."""
+
+    t_start: float  # time.time()
+    t_end: float
+    limit: float  # sec
+    elapsed: float  # sec, 数えた時間
+    paused: float  # sec, ポーズしていた時間
+    seek: float  # sec, シークで動いた時間 (負の値は戻した)
+    cycle: int
+    phase: str  # PHASES
+    result: str  # RESULTS
+
+    def pack(self) -> bytes:
+        """Record in the log."""
+        return RECORD.pack(
+            self.t_start,
+            self.t_end,
+            self.limit,
+            self.elapsed,
+            self.paused,
+            self.seek,
+            self.cycle,
+            PHASES.index(self.phase),
+            RESULTS.index(self.result),
+        )
+
+    @classmethod
+    def unpack(cls, fields: tuple) -> "PhaseRecord":
+        """PhaseRecord of RECORD.unpack()."""
+        t_start, t_end, limit, elapsed, paused, seek, cycle, phase, result = (
+            fields
+        )
+        return cls(
+            t_start,
+            t_end,
+            limit,
+            elapsed,
+            paused,
+            seek,
+            cycle,
+            PHASES[phase],
+            RESULTS[result],
+        )
+
+
+@dataclass
+class Totals:
+    """Totals of a day, a week or a month."""
+
+    work: float = 0.0  # sec
+    rest: float = 0.0  # sec, 休憩
+    pomodoros: int = 0  # 最後まで終えた WORK の数
+    skipped: int = 0
+    quit: int = 0
+
+    def add(self, rec: PhaseRecord):
+        """Add a record."""
+        if rec.phase == "WORK":
+            self.work += rec.elapsed
+            if rec.result == "completed":
+                self.pomodoros += 1
+        else:
+            self.rest += rec.elapsed
+        if rec.result == "skipped":
+            self.skipped += 1
+        elif rec.result == "quit":
+            self.quit += 1
+
+
+class History:
+    """Append-only log of the phases, and its rollup index.
+
+    ```python
+    History().append(rec)
+    totals = History().rollup("week")
+    ```
+    """
+
+    def __init__(self, directory: str | None = None):
+        """Constructor.
+
+        ファイルは、最初に書く時に作る。
+        """
+        self.directory = directory or history_dir()
+        self.log_path = os.path.join(self.directory, LOG_NAME)
+        self.index_path = os.path.join(self.directory, INDEX_NAME)
+
+    def append(self, rec: PhaseRecord):
+        """Append a record.
+
+        O_APPEND で1回の write() で書くので、複数のプロセスが同時に
+        書いても、レコードが混ざらない。
+        """
+        os.makedirs(self.directory, mode=0o700, exist_ok=True)
+        fd = os.open(
+            self.log_path,
+            os.O_WRONLY | os.O_APPEND | os.O_CREAT | os.O_NOFOLLOW,
+            0o600,
+        )
+        try:
+            data = rec.pack()
+            if os.fstat(fd).st_size == 0:
+                data = HEADER.pack(MAGIC, VERSION) + data
+            os.write(fd, data)
+        finally:
+            os.close(fd)
+
+    def records(self, offset: int = HEADER.size) -> tuple[list, int]:
+        """Records after offset (bytes).
+
+        書きかけのレコードは読まない。
+
+        Returns:
+            tuple[list[PhaseRecord], int]: (レコード, 次に読む位置)
+
+        Raises:
+            ValueError: 記録のファイルではない
+        """
+        try:
+            fd = os.open(self.log_path, os.O_RDONLY | os.O_NOFOLLOW)
+        except FileNotFoundError:
+            return [], HEADER.size
+        with os.fdopen(fd, "rb") as f:
+            head = f.read(HEADER.size)
+            if len(head) < HEADER.size:
+                return [], HEADER.size  # まだ書いていない
+            magic, version = HEADER.unpack(head)
+            if magic != MAGIC or version != VERSION:
+                raise ValueError(f"not a history log: {self.log_path}")
+            f.seek(offset)
+            data = f.read()
+        data = data[: len(data) - len(data) % RECORD.size]
+        recs = [PhaseRecord.unpack(x) for x in RECORD.iter_unpack(data)]
+        return recs, offset + len(data)
+
+    def load_index(self) -> dict:
+        """Rollup index, or an empty one."""
+        empty: dict = {"offset": HEADER.size}  # 次に読む位置
+        empty.update({period: {} for period in PERIODS})
+        try:
+            with open(self.index_path) as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            return empty
+        if not isinstance(index, dict) or set(index) != set(empty):
+            return empty
+        try:
+            size = os.stat(self.log_path).st_size
+        except FileNotFoundError:
+            return empty
+        if size < index["offset"]:
+            return empty  # 記録のファイルが作り直された
+        return index
+
+    def update_index(self) -> dict:
+        """Add the new records to the rollup index, and save it.
+
+        Returns:
+            dict: {"day": {"2026-10-18": Totals の値のリスト, ...}, ...}
+        """
+        index = self.load_index()
+        recs, offset = self.records(index["offset"])
+        if not recs:
+            return index
+
+        for period, fmt in PERIODS.items():
+            table = index[period]
+            for rec in recs:
+                key = time.strftime(fmt, time.localtime(rec.t_start))
+                totals = Totals(*table.get(key, ()))
+                totals.add(rec)
+                table[key] = astuple(totals)
+        index["offset"] = offset
+        self.save_index(index)
+        return index
+
+    def save_index(self, index: dict):
+        """Replace the index file at once."""
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(index, f, separators=(",", ":"))
+            os.replace(tmp, self.index_path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+    def rollup(self, period: str = "day", last: int = 0) -> dict[str, Totals]:
+        """Totals of each day, week ("%G-W%V") or month.
+
+        Args:
+            last (int): 最後の last 個だけ返す。0 の場合は全て。
+
+        Returns:
+            dict[str, Totals]: キーの順
+        """
+        table = self.update_index()[period]
+        keys = sorted(table)[-last:] if last else sorted(table)
+        return {key: Totals(*table[key]) for key in keys}
@@ -0,0 +1,366 @@
+#
+# (c) 2026 Yoichi Tanibayashi
+#
+from blessed import Terminal
+from loguru import logger
+
+from . import ESC, ESQ_ED2, ESQ_HOME, SEC_MIN
+from .alarm import AlarmScheduler
+from .base_timer import BaseTimer
+from .clock import Clock
+from .renderer import Cell, LineRenderer, text_width
+from .tty_writer import TtyWriter
+from .waiter import Waiter
+
+
+def parse_spec(spec: str) -> tuple[str, float]:
+    """Parse "MINUTES[:TITLE]".
+
+    Returns:
+        tuple[str, float]: (title, seconds)
+
+    Raises:
+        ValueError: MINUTES が数値でない、または0以下の場合
+    """
+    minutes, _, title = spec.partition(":")
+    sec = float(minutes) * SEC_MIN
+    if sec <= 0:
+        raise ValueError(f"MINUTES must be positive: {spec!r}")
+    return title or f"{minutes}m", sec
+
+
+class MultiTimer:
+    """Many timers in one process.
+
+    1つのタイマーを1行に表示する。全てのタイマーで端末と Waiter を共有し、
+    1つのループで、次に表示が変わる行だけを描画し直す。
+    キー操作は、選択中の行のタイマーに送る。
+    """
+
+    MARK_WIDTH = 2  # 選択マーク "> " の幅
+    HIDE_COLS = ("date", "time")  # 時計は見出しの行に1つだけ表示する
+
+    KEYS_UP = ("KEY_UP", "K")  # [Ctrl]+[P] は、選択中の行を10秒戻す
+    KEYS_DOWN = ("KEY_DOWN", "J")  # [Ctrl]+[N] は、選択中の行を10秒進める
+    KEYS_QUIT = ("Q", "KEY_ESCAPE")
+    KEYS_CLEAR = ("KEY_CTRL_L",)
+    HELP = "[↑↓]select [SPACE]pause [←→]-/+1s [^P^N]-/+10s [Q]uit"
+    CLOCK_FMT = "%Y-%m-%d %H:%M:%S"  # 見出しの時計
+    CLOCK_SEC = 1.0  # 見出しの時計が変わる間隔
+    MIN_TIMERS = 1
+
+    def __init__(
+        self,
+        specs: list[tuple[str, float]],
+        alarm_params: BaseTimer.AlarmParams = (
+            3,
+            BaseTimer.DEF_SEC1,
+            BaseTimer.DEF_SEC2,
+        ),
+        fps: float = BaseTimer.DEF_FPS,
+        spinner: bool = True,
+        clock: Clock | None = None,
+    ):
+        """Constructor.
+
+        Args:
+            specs (list[tuple[str, float]]): (title, seconds) のリスト。
+        """
+        logger.debug(f"timers={len(specs)}")
+        if len(specs) < self.MIN_TIMERS:
+            raise ValueError("no timers")
+
+        self.clock = clock if clock is not None else Clock()
+        self.term = Terminal()
+        self.out = TtyWriter()
+        self.waiter = Waiter()
+        kbd_fd = getattr(self.term, "_keyboard_fd", None)
+        if isinstance(kbd_fd, int):
+            self.waiter.add(kbd_fd, BaseTimer.WAIT_TAG_KEY)
+
+        self.alarm_params = alarm_params
+        self.fps = fps
+        self.spinner = spinner
+        # 全ての行で1つのスケジューラを使う (アラームは行ごとに鳴る)
+        self.alarm = (
+            AlarmScheduler(self.clock)
+            if self.clock.virtual
+            else AlarmScheduler.shared()
+        )
+        self.header = LineRenderer()
+
+        self.selected = 0
+        self.top = 0  # 画面の一番上に表示している行
+        self.is_active = False
+        self.width: int = self.term.width
+        self.height: int = self.term.height
+        self.frames = 0  # 描画し直した行の延べ数
+        self.wakeups = 0
+
+        self.rows: list[BaseTimer] = []
+        # 各行の、次に表示が変わる時刻 (clock.monotonic())。None は変化しない
+        self.t_due: list[float | None] = []
+        # 各行の、最後に描画した時の alarm_active
+        self.alarm_shown: list[bool] = []
+
+        # 列を揃えるため、タイトルの幅を揃える (全角文字は2桁)
+        self.title_w = max((text_width(t) for t, _ in specs), default=0)
+        for title, sec in specs:
+            self.add_row(title, sec)
+
+    def add_row(
+        self, title: str, sec: float, color: str = "cyan"
+    ) -> BaseTimer:
+        """Add a row at the bottom.
+
+        タイトルは title_w の幅に揃える。タイマーは、まだ始めない。
+        """
+        row = BaseTimer(
+            (title + " " * (self.title_w - text_width(title)), color),
+            sec,
+            self.alarm_params,
+            fps=self.fps,
+            spinner=self.spinner,
+            clock=self.clock,
+            term=self.term,
+            waiter=self.waiter,
+            hide=self.HIDE_COLS,
+        )
+        row.alarm = self.alarm
+        row.width = self.width - self.MARK_WIDTH
+        self.rows.append(row)
+        self.t_due.append(0.0)
+        self.alarm_shown.append(False)
+        return row
+
+    def remove_row(self, i: int):
+        """Remove row i.
+
+        下の行が1行ずつ上がるので、全て描画し直す。
+        """
+        row = self.rows.pop(i)
+        del self.t_due[i]
+        del self.alarm_shown[i]
+        if row.alarm_active:
+            row.alarm.stop(row)
+        if self.selected > i:
+            self.selected -= 1
+        self.select(self.selected)
+        self.top = max(0, min(self.top, len(self.rows) - self.n_visible))
+        self.redraw()
+
+    @property
+    def n_visible(self) -> int:
+        """Number of rows on the screen (without the header)."""
+        return max(self.height - 1, 1)
+
+    def main(self):
+        """Main."""
+        prev_handler = BaseTimer.set_sigwinch_handler(self.on_resize)
+        try:
+            with self.term.fullscreen(), self.term.cbreak():
+                self.main_loop()
+        finally:
+            BaseTimer.set_sigwinch_handler(prev_handler)
+            for row in self.rows:
+                if row.alarm_active:
+                    row.alarm.stop(row)
+
+    def main_loop(self):
+        """Main loop."""
+        self.begin(self.clock.monotonic())
+        self.redraw()
+
+        timeout: float | None = 0.0
+        while self.is_active:
+            key_names = self.get_key_names(timeout)
+            if key_names:
+                logger.debug(f"key_names={key_names}")
+                self.dispatch(key_names)
+
+            self.display()
+            timeout = self.next_timeout()
+
+    def begin(self, t_now: float):
+        """Start all timers."""
+        for row in self.rows:
+            row.core.start(t_now)
+        self.is_active = True
+
+    def get_key_names(self, timeout: float | None) -> list[str]:
+        """All buffered keys.
+
+        端末と Waiter は全ての行で共有しているので、ここで読む。
+        """
+        in_key = self.term.inkey(timeout=0)
+        if not in_key:
+            ready = self.clock.wait(self.waiter, timeout)
+            self.wakeups += 1
+            if BaseTimer.WAIT_TAG_KEY in ready:
+                in_key = self.term.inkey(timeout=0)
+
+        key_names: list[str] = []
+        while in_key and len(key_names) < BaseTimer.MAX_KEYS:
+            key_names.append(BaseTimer.key_name(in_key))
+            in_key = self.term.inkey(timeout=0)
+        return key_names
+
+    def dispatch(self, key_names: list[str]):
+        """Run the commands of the keys.
+
+        選択の移動と終了はここで処理し、その他は選択中の行に送る。
+        """
+        for key_name in key_names:
+            if key_name in self.KEYS_QUIT:
+                self.is_active = False
+                return
+            if key_name in self.KEYS_UP:
+                self.select(self.selected - 1)
+            elif key_name in self.KEYS_DOWN:
+                self.select(self.selected + 1)
+            elif key_name in self.KEYS_CLEAR:
+                self.redraw()
+            else:
+                self.row_cmd(self.selected, key_name)
+
+    def row_cmd(self, i: int, key_name: str):
+        """Run the command of a key on row i."""
+        row = self.rows[i]
+        cmd = row.key_cmd.get(key_name)
+        if cmd is None or cmd.name in ("quit", "next", "help", "clear"):
+            return
+
+        if row.alarm_active:
+            # 満了したタイマーは、キーでアラームを止めるだけ
+            row.alarm_active = False
+            row.alarm.stop(row)
+        elif row.is_active:
+            row.dispatch([key_name])
+        self.t_due[i] = 0.0
+
+    def select(self, i: int):
+        """Select row i, scrolling if needed."""
+        i = max(0, min(i, len(self.rows) - 1))
+        if self.rows:
+            self.t_due[self.selected] = self.t_due[i] = 0.0
+        self.selected = i
+
+        top = self.top
+        if i < top:
+            top = i
+        elif i >= top + self.n_visible:
+            top = i - self.n_visible + 1
+        if top != self.top:
+            self.top = top
+            self.redraw()
+
+    def on_resize(self, _signum=None, _frame=None):
+        """Terminal resized."""
+        self.width = self.term.width
+        self.height = self.term.height
+        self.select(self.selected)  # 選択中の行が見えるようにする
+        self.redraw()
+        self.waiter.wake()
+
+    def redraw(self):
+        """Redraw everything on the next display()."""
+        self.out.write(f"{ESQ_ED2}{ESQ_HOME}")
+        self.header.invalidate()
+        for i, row in enumerate(self.rows):
+            row.width = self.width - self.MARK_WIDTH
+            row._layout_cache.clear()
+            row.renderer.invalidate()
+            self.t_due[i] = 0.0
+
+    def display(self):
+        """Redraw the header and the rows that changed."""
+        t_cur = self.clock.monotonic()
+        self.update(t_cur)
+
+        if out := self.header.render(self.header_cells()):
+            self.out.write(f"{ESC}[1H{out}")
+
+        bottom = min(self.top + self.n_visible, len(self.rows))
+        for i in range(self.top, bottom):
+            row = self.rows[i]
+            if row.alarm_active != self.alarm_shown[i]:
+                self.t_due[i] = t_cur  # アラームが鳴り終わった
+
+            t_due = self.t_due[i]
+            if t_due is None or t_due > t_cur:
+                continue
+
+            if row.is_active:
+                row.advance(t_cur)
+            self.render_row(i, row)
+            timeout = row.next_timeout()
+            self.t_due[i] = None if timeout is None else t_cur + timeout
+
+        self.out.flush()
+
+    def update(self, t_cur: float):
+        """Advance all rows and ring the alarms of the rows that are up.
+
+        画面の外の行も時間は進めるが、描画はしない。
+        """
+        bottom = min(self.top + self.n_visible, len(self.rows))
+        for i, row in enumerate(self.rows):
+            if row.is_active:
+                row.advance(t_cur)
+                if row.check_timeup():
+                    row.ring_alarm()
+                    self.t_due[i] = t_cur
+
+            if not self.top <= i < bottom:
+                # 画面の外の行は、満了する時刻だけ見ておく
+                self.t_due[i] = self.t_timeup(row, t_cur)
+
+    def render_row(self, i: int, row: BaseTimer):
+        """Render row i (only the changed characters)."""
+        cells = row.mk_cells(row.width) or []
+        mark = ">" if i == self.selected else " "
+        cells = [Cell(0, mark, "white", True)] + [
+            Cell(c.x + self.MARK_WIDTH, c.text, c.fg, c.bold, c.blink)
+            for c in cells
+        ]
+        if out := row.renderer.render(cells):
+            self.out.write(f"{ESC}[{i - self.top + 2}H{out}")
+            self.frames += 1
+        self.alarm_shown[i] = row.alarm_active
+
+    def header_cells(self) -> list[Cell]:
+        """Cells of the header line.
+
+        幅が足りなければ、後ろの項目から省く。
+        """
+        cells = []
+        x = 0
+        for text in [
+            self.clock.strftime(self.CLOCK_FMT),
+            *self.header_items(),
+        ]:
+            if x + len(text) > self.width:
+                break
+            cells.append(Cell(x, text))
+            x += len(text) + 1
+        return cells
+
+    def header_items(self) -> list[str]:
+        """Items of the header after the clock."""
+        return [f"{len(self.rows)} timers", self.HELP]
+
+    @staticmethod
+    def t_timeup(row: BaseTimer, t_cur: float) -> float | None:
+        """Time when row will be up, or None if it is not running."""
+        if not row.is_active or row.is_paused:
+            return None
+        return t_cur + row.t_limit - row.t_elapsed
+
+    def next_timeout(self) -> float | None:
+        """Seconds until the next change of any row or the clock."""
+        t_cur = self.clock.monotonic()
+        timeout = self.CLOCK_SEC - self.clock.time() % self.CLOCK_SEC
+        for t_due in self.t_due:
+            if t_due is not None:
+                timeout = min(timeout, t_due - t_cur)
+        return max(timeout, 0.0) + BaseTimer.WAKE_MARGIN
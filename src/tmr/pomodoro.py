@@ -1,9 +1,18 @@
 #
 # (c) 2026 Yoichi Tanibayashi
 #
+from collections.abc import Iterator
 from dataclasses import dataclass
 
+from loguru import logger
+
 from .base_timer import BaseTimer
+from .clock import Clock
+from .control import ControlSocket
+from .history import History, PhaseRecord
+from .stats import Stats
+from .status import StatusFile
+from .stream import EventStream
 
 
 @dataclass
@@ -12,13 +21,62 @@ class PomodoroConfig:
     break_sec: float
     long_break_sec: float
     cycles: int
+    fps: float = BaseTimer.DEF_FPS
+    spinner: bool = True
+    anchored: bool = False  # 各フェーズを開始時に決めた予定時刻に合わせる
 
 
 class PomodoroTimer:
     """Pomodoro Timer"""
 
-    def __init__(self, config: PomodoroConfig):
+    def __init__(
+        self,
+        config: PomodoroConfig,
+        clock: Clock | None = None,
+        stats: Stats | None = None,
+        stream: EventStream | None = None,
+        status: StatusFile | None = None,
+        control: ControlSocket | None = None,
+        history: History | None = None,
+    ):
+        """Constructor.
+
+        Args:
+            history (History | None): 終えたフェーズを記録する。
+        """
         self.config = config
+        self.clock = clock if clock is not None else Clock()
+        self.stats = stats
+        self.stream = stream
+        self.status = status
+        self.control = control
+        self.history = history
+        self.cycle = 0  # 実行中のフェーズのサイクル
+        self.phase_name = ""  # 実行中のフェーズ (history.PHASES)
+        self.t_phase = 0.0  # 実行中のフェーズを始めた時刻 (clock.time())
+        # 各フェーズで使い回す (端末の初期化は最初の一回だけ)
+        self.timer: BaseTimer | None = None
+        self.offset = 0.0  # sec, 予定に対する遅れ (負の値は進み)
+
+    def phases(self) -> list[tuple[str, float, str]]:
+        """Phases of one session.
+
+        Returns:
+            list[tuple[str, float, str]]: (title, seconds, color) のリスト
+        """
+        ret = []
+        for i in range(self.config.cycles):
+            # Work
+            ret.append(("WORK       ", self.config.work_sec, "cyan"))
+
+            # Break
+            if i < self.config.cycles - 1:
+                # Short Break
+                ret.append(("SHORT_BREAK", self.config.break_sec, "yellow"))
+            else:
+                # Long Break
+                ret.append(("LONG_BREAK ", self.config.long_break_sec, "red"))
+        return ret
 
     def run(self) -> bool:
         """ポモドーロサイクルの実行
@@ -26,35 +84,146 @@ class PomodoroTimer:
         Returns:
             bool: ユーザが中断(quit)した場合は True、それ以外は False
         """
+        for title, seconds, color, t_plan in self.steps():
+            if self._run_timer(title, seconds, color, t_plan):
+                return True  # Quit
+        return False
+
+    def steps(self) -> Iterator[tuple[str, float, str, float | None]]:
+        """Phases to run, in order, forever.
+
+        (title, seconds, color, t_plan) を返す。呼び出し側は、
+        そのフェーズを実行し終えてから次を取り出す。
+
+        anchored の場合は、開始時刻から各フェーズの予定開始時刻を
+        積み上げで決めておき、前のフェーズの終了が遅れても予定通りに進める。
+        """
+        t_plan = self.clock.monotonic()  # 次のフェーズの予定開始時刻
+        cycle = 0
         while True:
-            for i in range(self.config.cycles):
-                # Work
-                if self._run_timer(
-                    "WORK       ", self.config.work_sec, "cyan"
-                ):
-                    return True  # Quit
-
-                # Break
-                if i < self.config.cycles - 1:
-                    # Short Break
-                    if self._run_timer(
-                        "SHORT_BREAK", self.config.break_sec, "yellow"
-                    ):
-                        return True  # Quit
-                else:
-                    # Long Break
-                    if self._run_timer(
-                        "LONG_BREAK ", self.config.long_break_sec, "red"
-                    ):
-                        return True  # Quit
-
-            # forループが中断されずに完了した場合、whileループで次のサイクルへ
-
-    def _run_timer(self, title_text: str, seconds: float, color: str) -> bool:
+            cycle += 1
+            for i, (title, seconds, color) in enumerate(self.phases()):
+                self.cycle = cycle
+                self.phase_name = title.strip()
+                if self.status:
+                    self.status.phase = i
+                if self.stream:
+                    self.stream.emit(
+                        "phase",
+                        self.clock.time(),
+                        {
+                            "cycle": cycle,
+                            "phase": i,
+                            "title": title.strip(),
+                            "limit": seconds,
+                        },
+                    )
+                yield (
+                    title,
+                    seconds,
+                    color,
+                    t_plan if self.config.anchored else None,
+                )
+                t_plan += seconds
+
+            # 中断されずに完了した場合、whileループで次のサイクルへ
+
+    def _run_timer(
+        self,
+        title_text: str,
+        seconds: float,
+        color: str,
+        t_plan: float | None = None,
+    ) -> bool:
         """単発タイマーの実行
 
         Returns:
             bool: BaseTimer.main() の戻り値 (True=Quit)
         """
-        timer = BaseTimer((title_text, color), seconds, enable_next=True)
-        return timer.main()
+        timer, t_start = self.prepare_timer(
+            title_text, seconds, color, t_plan
+        )
+        quit_by_quitcmd = timer.main(t_start=t_start)
+        self.record_phase(quit_by_quitcmd)
+        return quit_by_quitcmd
+
+    def record_phase(self, quit_by_quitcmd: bool):
+        """Append the phase just finished to the history.
+
+        満了 (completed)、next で飛ばした (skipped)、quit の3通り。
+        満了した後、アラームを quit で止めた場合も completed。
+        """
+        if self.history is None or self.timer is None:
+            return
+        core = self.timer.core
+        if core.timeup:
+            result = "completed"
+        elif quit_by_quitcmd:
+            result = "quit"
+        else:
+            result = "skipped"
+        rec = PhaseRecord(
+            t_start=self.t_phase,
+            t_end=self.clock.time(),
+            limit=core.limit,
+            elapsed=core.elapsed,
+            paused=core.paused_sec,
+            seek=core.seek_sec,
+            cycle=self.cycle,
+            phase=self.phase_name,
+            result=result,
+        )
+        logger.debug(f"{rec}")
+        try:
+            self.history.append(rec)
+        except OSError as e:
+            logger.warning(f"history: {type(e).__name__}: {e}")
+
+    def prepare_timer(
+        self,
+        title_text: str,
+        seconds: float,
+        color: str,
+        t_plan: float | None = None,
+    ) -> tuple[BaseTimer, float | None]:
+        """単発タイマーの準備
+
+        Args:
+            t_plan (float | None): 予定開始時刻 (clock.monotonic())。
+                指定した場合は、予定終了時刻 (t_plan + seconds) に終わる。
+
+        Returns:
+            tuple[BaseTimer, float | None]: (timer, t_start)
+        """
+        self.t_phase = self.clock.time()
+        t_start = None
+        if t_plan is not None:
+            t_now = self.clock.monotonic()
+            self.offset = t_now - t_plan
+            logger.debug(f"{title_text.strip()}: offset={self.offset:+.3f}s")
+
+            if self.offset >= 0:
+                # 遅れている: 予定開始時刻から経過しているものとする
+                t_start = t_plan
+            else:
+                # 進んでいる (next で飛ばした): 予定終了時刻まで延ばす
+                t_start = t_now
+                seconds -= self.offset
+            title_text = f"{title_text} {self.offset:+.0f}s"
+
+        if self.timer is None:
+            self.timer = BaseTimer(
+                (title_text, color),
+                seconds,
+                enable_next=True,
+                fps=self.config.fps,
+                spinner=self.config.spinner,
+                clock=self.clock,
+                stats=self.stats,
+                stream=self.stream,
+                status=self.status,
+                control=self.control,
+            )
+        else:
+            self.timer.reset((title_text, color), seconds)
+        return self.timer, t_start
@@ -0,0 +1,143 @@
+#
+# (c) 2026 Yoichi Tanibayashi
+#
+import cProfile
+import io
+import os
+import pstats
+import sys
+import threading
+import tracemalloc
+from collections import Counter
+
+
+class Profiler:
+    """Profiler for the CLI.
+
+    mode:
+        cprofile: cProfile で全ての関数呼び出しを記録する。
+            結果は pstats 形式 (`python -m pstats FILE` で読める)。
+        sample: 一定間隔でメインスレッドのスタックを記録する。
+            負荷が小さく、長時間動かせる。
+            結果は flamegraph.pl などで読める collapsed stack 形式。
+
+    tracemalloc を指定した場合は、開始時と終了時のスナップショットの
+    差分を FILE.mem.txt に書く。
+    """
+
+    MODES = ("cprofile", "sample")
+    DEF_INTERVAL = 0.01  # sec, sample の間隔
+    TOP_N = 40  # テキストの要約に出す行数
+
+    def __init__(
+        self,
+        path: str,
+        mode: str = "cprofile",
+        trace_malloc: bool = False,
+        interval: float = DEF_INTERVAL,
+    ):
+        """Constructor."""
+        if mode not in self.MODES:
+            raise ValueError(f"mode={mode!r}: not in {self.MODES}")
+
+        self.path = path
+        self.mode = mode
+        self.trace_malloc = trace_malloc
+        self.interval = interval
+
+        self.prof: cProfile.Profile | None = None
+        self.samples: Counter[str] = Counter()
+        self.n_samples = 0
+        self._thread: threading.Thread | None = None
+        self._stop = threading.Event()
+        self._target = threading.get_ident()  # 記録するスレッド
+        self._snapshot: tracemalloc.Snapshot | None = None
+
+    def start(self):
+        """Start profiling.
+
+        ログの初期化より前に呼ばれるので、ここではログを出さない。
+        """
+        if self.trace_malloc:
+            tracemalloc.start()
+            self._snapshot = tracemalloc.take_snapshot()
+
+        if self.mode == "cprofile":
+            self.prof = cProfile.Profile()
+            self.prof.enable()
+            return
+
+        self._target = threading.get_ident()
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._sampler, name="tmr-profiler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> list[str]:
+        """Stop profiling and write the results.
+
+        Returns:
+            list[str]: 書き込んだファイル
+        """
+        files = []
+
+        if self.prof is not None:
+            self.prof.disable()
+            self.prof.dump_stats(self.path)
+            files.append(self.path)
+
+            # 読みやすいように、テキストの要約も書く
+            buf = io.StringIO()
+            ps = pstats.Stats(self.prof, stream=buf)
+            ps.sort_stats("cumulative").print_stats(self.TOP_N)
+            files.append(self._write(f"{self.path}.txt", buf.getvalue()))
+            self.prof = None
+
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+            files.append(self._write(self.path, self.collapsed()))
+
+        if self._snapshot is not None:
+            snapshot = tracemalloc.take_snapshot()
+            tracemalloc.stop()
+            diff = snapshot.compare_to(self._snapshot, "lineno")
+            text = "\n".join(str(d) for d in diff[: self.TOP_N]) + "\n"
+            files.append(self._write(f"{self.path}.mem.txt", text))
+            self._snapshot = None
+
+        return files
+
+    def collapsed(self) -> str:
+        """Samples in the collapsed stack format.
+
+        "root;caller;callee count" の形式で、1行に1スタック。
+        """
+        return "".join(
+            f"{stack} {n}\n" for stack, n in self.samples.most_common()
+        )
+
+    def _sampler(self):
+        """Sampling thread."""
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._target)
+            if frame is None:
+                continue
+
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                name = os.path.basename(code.co_filename)
+                stack.append(f"{code.co_qualname} ({name})")
+                frame = frame.f_back
+            self.samples[";".join(reversed(stack))] += 1
+            self.n_samples += 1
+
+    @staticmethod
+    def _write(path: str, text: str) -> str:
+        """Write text file."""
+        with open(path, "w") as f:
+            f.write(text)
+        return path
@@ -1,9 +1,11 @@
 #
 # (c) 2026 Yoichi Tanibayashi
 #
-import click
 from loguru import logger
 
+from .renderer import style
+from .tty_writer import TtyWriter
+
 
 class ProgressBar:
     """Progress Bar."""
@@ -20,10 +22,13 @@ class ProgressBar:
         bar_length: int = DEF_BAR_LEN,
         ch: tuple[str, str] = (DEF_CH_ON, DEF_CH_OFF),
         ch_head: list[str] = DEF_CH_HEAD,
+        out: TtyWriter | None = None,
     ):
         """Constructor."""
         logger.debug(f"total={total}")
 
+        self.out = out if out is not None else TtyWriter()
+
         self.bar_len: int = bar_length
         self.total: float = total
         self.ch_on: str = ch[0]
@@ -82,4 +87,5 @@ class ProgressBar:
         """Display."""
         sbar_str = self.get_str(val, bar_len=bar_len, stop=stop)
 
-        click.secho(sbar_str, fg=fg, blink=blink, nl=False)
+        self.out.write(style(sbar_str, fg=fg, blink=blink))
+        self.out.flush()
@@ -0,0 +1,121 @@
+#
+# (c) 2026 Yoichi Tanibayashi
+#
+import functools
+from dataclasses import dataclass
+
+import click
+from wcwidth import wcswidth
+
+from . import ESC, ESQ_EL2, ESQ_SGR0
+
+
+def text_width(text: str) -> int:
+    """Display width of text (columns on the terminal).
+
+    全角文字は2桁。ASCII だけの場合は len() と同じ。
+    """
+    if text.isascii():
+        return len(text)
+    width = wcswidth(text)
+    return width if width >= 0 else len(text)  # 制御文字を含む場合
+
+
+@functools.cache
+def style_prefix(
+    fg: str | None = None, bold: bool = False, blink: bool = False
+) -> str:
+    """Escape sequence prefix of the style.
+
+    スタイルの組み合わせごとに一度だけ生成し、以後は使い回す。
+    """
+    return click.style("", fg=fg, bold=bold, blink=blink, reset=False)
+
+
+def style(
+    text: str, fg: str | None = None, bold: bool = False, blink: bool = False
+) -> str:
+    """Styled text.
+
+    click.style() と同じ文字列を返す。
+    """
+    return f"{style_prefix(fg, bold, blink)}{text}{ESQ_SGR0}"
+
+
+@dataclass(frozen=True)
+class Cell:
+    """Display cell."""
+
+    x: int  # 表示開始位置 (桁。行頭が 0)
+    text: str
+    fg: str = "white"
+    bold: bool = False
+    blink: bool = False
+
+
+class LineRenderer:
+    """Differential line renderer.
+
+    前回のフレームを保持し、変化した文字だけをカーソル移動付きで書き換える。
+    セルの位置や長さが変わった場合は、行全体を書き直す。
+    """
+
+    def __init__(self):
+        """Constructor."""
+        self.prev: list[Cell] | None = None
+
+    def invalidate(self):
+        """Force a full redraw on the next render."""
+        self.prev = None
+
+    def render(self, cells: list[Cell]) -> str:
+        """Render cells.
+
+        Returns:
+            str: 端末に書き込む文字列。変化がなければ空文字列。
+        """
+        prev = self.prev
+        self.prev = cells
+
+        if prev is None or [(c.x, text_width(c.text)) for c in cells] != [
+            (c.x, text_width(c.text)) for c in prev
+        ]:
+            return self.render_full(cells)
+
+        out = ""
+        for cur, old in zip(cells, prev):
+            if cur == old:
+                continue
+
+            start, end = 0, len(cur.text)
+            same_style = (cur.fg, cur.bold, cur.blink) == (
+                old.fg,
+                old.bold,
+                old.blink,
+            )
+            if same_style and len(cur.text) == len(old.text):
+                # 同じスタイルなら、前後の一致部分は書き直さない
+                while start < end and cur.text[start] == old.text[start]:
+                    start += 1
+                while end > start and cur.text[end - 1] == old.text[end - 1]:
+                    end -= 1
+
+            # 全角文字を含む場合は、文字数ではなく表示幅で移動する
+            out += self.move(cur.x + text_width(cur.text[:start]))
+            out += self.style(cur, cur.text[start:end])
+
+        return out
+
+    def render_full(self, cells: list[Cell]) -> str:
+        """Render whole line."""
+        return f"{ESQ_EL2}\r" + " ".join(self.style(c, c.text) for c in cells)
+
+    @staticmethod
+    def move(x: int) -> str:
+        """Move cursor to column x."""
+        return f"{ESC}[{x + 1}G"
+
+    @staticmethod
+    def style(cell: Cell, text: str) -> str:
+        """Styled text."""
+        return style(text, cell.fg, cell.bold, cell.blink)
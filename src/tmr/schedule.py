@@ -0,0 +1,262 @@
+#
+# (c) 2026 Yoichi Tanibayashi
+#
+# ファイルに書いた予定 (開始時刻、時間、タイトル、色) を順に動かす。
+# 予定の開始と満了は、全てヒープに入れた締め切りで扱うので、
+# 何千件あっても、ループは次の締め切りまで眠るだけで済む。
+import csv
+import heapq
+import itertools
+from collections.abc import Iterable
+from typing import Any, NamedTuple
+
+import click
+from loguru import logger
+
+from . import SEC_MIN
+from .base_timer import BaseTimer
+from .clock import Clock
+from .multi import MultiTimer
+from .renderer import text_width
+
+
+class ScheduleItem(NamedTuple):
+    """One item of a schedule."""
+
+    start: float  # 開始してから始めるまでの秒数
+    sec: float  # 時間 (sec)
+    title: str
+    color: str
+
+
+def parse_schedule(lines: Iterable[str]) -> list[ScheduleItem]:
+    """Parse "START,MINUTES[,TITLE[,COLOR]]" lines (CSV).
+
+    START は、開始してから始めるまでの分数。
+    空行と "#" で始まる行は読み飛ばす。
+
+    Returns:
+        list[ScheduleItem]: 開始時刻の順
+
+    Raises:
+        ValueError: 数値でない、START が負、MINUTES が0以下、知らない色
+    """
+    items = []
+    for lineno, fields in enumerate(
+        csv.reader(lines, skipinitialspace=True), 1
+    ):
+        head = fields[0].strip() if fields else ""
+        if not head or head.startswith("#"):
+            continue
+        try:
+            items.append(parse_fields(fields))
+        except (ValueError, IndexError) as e:
+            raise ValueError(f"line {lineno}: {e}") from None
+    return sorted(items, key=lambda item: item.start)
+
+
+def parse_fields(fields: list[str]) -> ScheduleItem:
+    """Parse the fields of one line."""
+    start, minutes = float(fields[0]), float(fields[1])
+    if start < 0:
+        raise ValueError(f"negative START: {fields[0]!r}")
+    if minutes <= 0:
+        raise ValueError(f"MINUTES must be positive: {fields[1]!r}")
+    title = fields[2].strip() if len(fields) > 2 else ""
+    color = fields[3].strip() if len(fields) > 3 else ""
+    color = color or "cyan"
+    try:
+        click.style("", fg=color)
+    except TypeError:
+        raise ValueError(f"unknown color: {color!r}") from None
+    return ScheduleItem(
+        start * SEC_MIN,
+        minutes * SEC_MIN,
+        title or f"{fields[1].strip()}m",
+        color,
+    )
+
+
+class DeadlineQueue:
+    """Deadlines in a heap.
+
+    add() と pop() は O(log n)。cancel() は印を付けるだけの O(1) で、
+    取り消した物は、先頭に来た時か、溜まり過ぎた時に捨てる。
+    """
+
+    _REMOVED = object()  # 取り消した物
+
+    def __init__(self):
+        """Constructor."""
+        self._heap: list[list[Any]] = []  # [時刻, 登録順, 物]
+        self._seq = itertools.count()
+        self._n_live = 0
+
+    def __len__(self) -> int:
+        """Number of deadlines not cancelled."""
+        return self._n_live
+
+    def add(self, t: float, item: object) -> list[Any]:
+        """Add item due at t.
+
+        Returns:
+            list: cancel() に渡すエントリ
+        """
+        entry = [t, next(self._seq), item]
+        heapq.heappush(self._heap, entry)
+        self._n_live += 1
+        return entry
+
+    def cancel(self, entry: list[Any]):
+        """Cancel an entry of add()."""
+        if entry[2] is self._REMOVED:
+            return
+        entry[2] = self._REMOVED
+        self._n_live -= 1
+        if len(self._heap) > 2 * self._n_live + 64:
+            self._heap = [e for e in self._heap if e[2] is not self._REMOVED]
+            heapq.heapify(self._heap)
+
+    def next_time(self) -> float | None:
+        """Time of the first deadline."""
+        while self._heap and self._heap[0][2] is self._REMOVED:
+            heapq.heappop(self._heap)
+        return self._heap[0][0] if self._heap else None
+
+    def pop(self, t_limit: float) -> tuple[float, Any] | None:
+        """Pop the first deadline at or before t_limit.
+
+        Returns:
+            tuple[float, object] | None: (時刻, 物)。なければ None
+        """
+        t_next = self.next_time()
+        if t_next is None or t_next > t_limit:
+            return None
+        t, _, item = heapq.heappop(self._heap)
+        self._n_live -= 1
+        return t, item
+
+
+class ScheduleTimer(MultiTimer):
+    """Timers started by a schedule.
+
+    予定の開始時刻になると、MultiTimer の行を1つ追加して動かし、
+    満了してアラームが鳴り終わるか止めると、その行を消す。
+    行の満了は、毎回 t_elapsed を調べるのではなく、締め切りで知る。
+    全ての予定が終わると終了する。
+    """
+
+    CLOCK_FMT = "%Y-%m-%d %H:%M"  # 何もない間は、1分に1回だけ起きる
+    CLOCK_SEC = 60.0
+    MIN_TIMERS = 0
+
+    def __init__(
+        self,
+        items: list[ScheduleItem],
+        alarm_params: BaseTimer.AlarmParams = (
+            3,
+            BaseTimer.DEF_SEC1,
+            BaseTimer.DEF_SEC2,
+        ),
+        fps: float = BaseTimer.DEF_FPS,
+        spinner: bool = True,
+        clock: Clock | None = None,
+    ):
+        """Constructor.
+
+        Args:
+            items (list[ScheduleItem]): 予定のリスト。
+        """
+        logger.debug(f"items={len(items)}")
+        if not items:
+            raise ValueError("no items")
+        super().__init__([], alarm_params, fps, spinner, clock)
+
+        self.items = items
+        self.title_w = max(text_width(item.title) for item in items)
+        self.deadlines = DeadlineQueue()
+        self.t_end: dict[BaseTimer, list[Any]] = {}  # 行 -> 満了の締め切り
+        self.n_waiting = 0  # まだ始まっていない予定の数
+
+    def begin(self, t_now: float):
+        """Register the start of all items."""
+        for item in self.items:
+            self.deadlines.add(t_now + item.start, item)
+        self.n_waiting = len(self.items)
+        self.is_active = True
+
+    def update(self, t_cur: float):
+        """Start, time up and remove the rows whose deadlines have come."""
+        while (due := self.deadlines.pop(t_cur)) is not None:
+            t_due, obj = due
+            if isinstance(obj, ScheduleItem):
+                self.start_item(obj, t_due, t_cur)
+            else:
+                self.end_row(obj, t_cur)
+
+        for i in reversed(range(len(self.rows))):
+            row = self.rows[i]
+            if not row.is_active and not row.alarm_active:
+                self.remove_row(i)
+
+        # 画面の外の行は描画しない (満了は締め切りで知る)
+        bottom = self.top + self.n_visible
+        for i in range(len(self.rows)):
+            if not self.top <= i < bottom:
+                self.t_due[i] = None
+
+        if not self.rows and not self.deadlines:
+            logger.debug("all items done")
+            self.is_active = False
+
+    def start_item(self, item: ScheduleItem, t_start: float, t_cur: float):
+        """Add the row of item started at t_start."""
+        logger.debug(f"start: {item}")
+        self.n_waiting -= 1
+        row = self.add_row(item.title, item.sec, item.color)
+        row.core.start(t_cur, t_start)  # 遅れて起きても、予定の時刻から
+        self.reschedule(row, t_cur)
+
+    def end_row(self, row: BaseTimer, t_cur: float):
+        """Time up row, or register it again if it was paused or seeked."""
+        del self.t_end[row]
+        row.advance(t_cur)
+        if row.check_timeup():
+            row.ring_alarm()
+            self.t_due[self.rows.index(row)] = t_cur
+        else:
+            self.reschedule(row, t_cur)
+
+    def reschedule(self, row: BaseTimer, t_cur: float):
+        """Register the time up of row again."""
+        row.advance(t_cur)
+        if (entry := self.t_end.pop(row, None)) is not None:
+            self.deadlines.cancel(entry)
+        if (t_up := self.t_timeup(row, t_cur)) is not None:
+            self.t_end[row] = self.deadlines.add(t_up, row)
+
+    def row_cmd(self, i: int, key_name: str):
+        """Run the command of a key on row i, and move its deadline."""
+        if not self.rows:
+            return
+        super().row_cmd(i, key_name)
+        row = self.rows[i]
+        if row.is_active:
+            self.reschedule(row, self.clock.monotonic())
+
+    def header_items(self) -> list[str]:
+        """Items of the header after the clock."""
+        return [
+            f"{len(self.rows)} running {self.n_waiting} waiting",
+            self.HELP,
+        ]
+
+    def next_timeout(self) -> float | None:
+        """Seconds until the next change of any row or deadline."""
+        timeout = super().next_timeout()
+        t_next = self.deadlines.next_time()
+        if t_next is None:
+            return timeout
+        t_next = max(t_next - self.clock.monotonic(), 0.0)
+        t_next += BaseTimer.WAKE_MARGIN
+        return t_next if timeout is None else min(timeout, t_next)
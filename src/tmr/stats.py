@@ -0,0 +1,158 @@
+#
+# (c) 2026 Yoichi Tanibayashi
+#
+import json
+import time
+
+
+class Histogram:
+    """Fixed-size log2 histogram.
+
+    値 v は、v < 2**i となる最小の i のバケットに数える。
+    バケット数は固定なので、いくら記録してもメモリは増えない。
+    """
+
+    N_BUCKETS = 32  # 2**31 まで。それ以上は最後のバケット
+
+    def __init__(self, unit: str = ""):
+        """Constructor."""
+        self.unit = unit
+        self.buckets = [0] * self.N_BUCKETS
+        self.count = 0
+        self.total = 0.0
+        self.min = float("inf")
+        self.max = 0.0
+
+    def add(self, value: float):
+        """Record a value."""
+        i = min(int(value).bit_length(), self.N_BUCKETS - 1)
+        self.buckets[i] += 1
+        self.count += 1
+        self.total += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    @property
+    def mean(self) -> float:
+        """Mean."""
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, p: float) -> float:
+        """Approximate percentile.
+
+        p (0..100) を含むバケットの上限。ただし max を超えない。
+        """
+        if not self.count:
+            return 0.0
+        rank = p / 100 * self.count
+        n = 0
+        for i, c in enumerate(self.buckets):
+            n += c
+            if n >= rank and c:
+                return min(float(2**i), self.max)
+        return self.max
+
+    def to_dict(self) -> dict:
+        """Summary as a dict."""
+        return {
+            "unit": self.unit,
+            "count": self.count,
+            "mean": self.mean,
+            "min": self.min if self.count else 0.0,
+            "max": self.max,
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99),
+            # バケットの上限 (2**i) ごとの個数。空のバケットは省く
+            "buckets": {2**i: c for i, c in enumerate(self.buckets) if c},
+        }
+
+    def summary(self) -> str:
+        """One-line summary."""
+        return (
+            f"n={self.count} mean={self.mean:.1f} "
+            f"p50={self.percentile(50):.0f} p90={self.percentile(90):.0f} "
+            f"p99={self.percentile(99):.0f} max={self.max:.1f}{self.unit}"
+        )
+
+
+class Stats:
+    """Hot-path metrics.
+
+    --stats (または環境変数 TMR_STATS) を指定した時だけ作られ、
+    BaseTimer が記録する。
+    """
+
+    FORMATS = ("text", "json")
+
+    now = staticmethod(time.perf_counter)
+
+    def __init__(self):
+        """Constructor."""
+        self.t_begin = self.now()
+
+        self.frame_us = Histogram("us")  # display() 1回の時間
+        self.frame_bytes = Histogram("B")  # display() 1回の書き込みバイト数
+        self.key_latency_us = Histogram("us")  # キー入力から表示まで
+        self.wakeups = 0  # 待機から戻った回数
+
+        self._t_key: float | None = None
+
+    def wakeup(self):
+        """Count a wakeup."""
+        self.wakeups += 1
+
+    def key(self):
+        """A key was read.
+
+        次の frame() までを、キー入力の遅延として記録する。
+        """
+        if self._t_key is None:
+            self._t_key = self.now()
+
+    def frame(self, t_frame_start: float, n_bytes: int):
+        """A frame was written.
+
+        Args:
+            t_frame_start (float): display() の開始時刻 (now())。
+            n_bytes (int): 書き込んだバイト数。
+        """
+        t_now = self.now()
+        self.frame_us.add((t_now - t_frame_start) * 1e6)
+        self.frame_bytes.add(n_bytes)
+        if self._t_key is not None:
+            self.key_latency_us.add((t_now - self._t_key) * 1e6)
+            self._t_key = None
+
+    def to_dict(self) -> dict:
+        """Metrics as a dict."""
+        t_run = self.now() - self.t_begin
+        return {
+            "run_sec": t_run,
+            "frames": self.frame_us.count,
+            "bytes": int(self.frame_bytes.total),
+            "wakeups": self.wakeups,
+            "wakeups_per_min": self.wakeups / t_run * 60 if t_run else 0.0,
+            "frame_us": self.frame_us.to_dict(),
+            "frame_bytes": self.frame_bytes.to_dict(),
+            "key_latency_us": self.key_latency_us.to_dict(),
+        }
+
+    def report(self, fmt: str = "text") -> str:
+        """Report in text or JSON."""
+        d = self.to_dict()
+        if fmt == "json":
+            return json.dumps(d, indent=2)
+
+        return "\n".join(
+            [
+                (
+                    f"stats: {d['run_sec']:.1f}s, {d['frames']} frames, "
+                    f"{d['bytes']} bytes, {d['wakeups']} wakeups "
+                    f"({d['wakeups_per_min']:.1f}/min)"
+                ),
+                f"  frame time : {self.frame_us.summary()}",
+                f"  frame bytes: {self.frame_bytes.summary()}",
+                f"  key latency: {self.key_latency_us.summary()}",
+            ]
+        )
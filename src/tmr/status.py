@@ -0,0 +1,316 @@
+#
+# (c) 2026 Yoichi Tanibayashi
+#
+# `tmr status` から読むので、軽いモジュールだけを import すること。
+import math
+import mmap
+import os
+import stat
+import struct
+import tempfile
+from dataclasses import dataclass
+
+from .utils import t_str
+
+ENV_STATUS_DIR = "TMR_STATUS_DIR"
+
+MAGIC = b"TMR1"
+
+# magic, seq, pid, flags, phase, limit, elapsed, t_update, title
+LAYOUT = struct.Struct("<4sIIIiddd64s")
+SIZE = 128  # LAYOUT.size 以上。後で項目を追加できるように余裕を持たせる
+OFS_SEQ = 4  # seq の位置
+
+TITLE_MAX = 64  # bytes
+
+FLAG_ACTIVE = 0x01
+FLAG_PAUSED = 0x02
+FLAG_ALARM = 0x04
+
+
+def status_dir() -> str:
+    """Directory of the status files.
+
+    環境変数 TMR_STATUS_DIR、$XDG_RUNTIME_DIR/tmr、/tmp/tmr-UID の順。
+    """
+    if path := os.environ.get(ENV_STATUS_DIR):
+        return path
+    if runtime := os.environ.get("XDG_RUNTIME_DIR"):
+        return os.path.join(runtime, "tmr")
+    return os.path.join(tempfile.gettempdir(), f"tmr-{os.getuid()}")
+
+
+def make_dir(path: str) -> str:
+    """Create the directory of the status files, and check it.
+
+    /tmp の下は他のユーザも作れるので、自分が所有し、
+    自分以外がアクセスできない (0o700) ディレクトリであることを確認する。
+
+    Raises:
+        PermissionError: 自分のディレクトリではない
+    """
+    os.makedirs(path, mode=0o700, exist_ok=True)
+    check_dir(path)
+    return path
+
+
+def check_dir(path: str):
+    """Check that path is a private directory of this user.
+
+    Raises:
+        PermissionError: シンボリックリンク、他のユーザの所有、
+            または、他のユーザがアクセスできる
+    """
+    st = os.lstat(path)
+    if not stat.S_ISDIR(st.st_mode):
+        raise PermissionError(f"not a directory: {path}")
+    if st.st_uid != os.getuid():
+        raise PermissionError(f"owned by uid {st.st_uid}: {path}")
+    if stat.S_IMODE(st.st_mode) != 0o700:
+        raise PermissionError(
+            f"mode {stat.S_IMODE(st.st_mode):o} (not 700): {path}"
+        )
+
+
+@dataclass(frozen=True)
+class TimerStatus:
+    """State of a running timer."""
+
+    pid: int
+    title: str
+    limit: float
+    elapsed: float  # t_update の時点の経過時間
+    t_update: float  # time.time()
+    active: bool
+    paused: bool
+    alarm: bool
+    phase: int  # ポモドーロのフェーズ。単独のタイマーは -1
+    path: str = ""
+
+    def elapsed_at(self, t_now: float) -> float:
+        """Elapsed time at t_now (time.time())."""
+        if not self.active or self.paused:
+            return self.elapsed
+        return min(self.elapsed + max(t_now - self.t_update, 0.0), self.limit)
+
+    def to_dict(self, t_now: float) -> dict:
+        """State at t_now as a dict."""
+        elapsed = self.elapsed_at(t_now)
+        return {
+            "pid": self.pid,
+            "title": self.title,
+            "limit": self.limit,
+            "elapsed": round(elapsed, 3),
+            "remain": round(max(self.limit - elapsed, 0.0), 3),
+            "active": self.active,
+            "paused": self.paused,
+            "alarm": self.alarm,
+            "phase": self.phase,
+        }
+
+    def line(self, t_now: float) -> str:
+        """One-line summary at t_now (for prompts and status bars)."""
+        remain = max(self.limit - self.elapsed_at(t_now), 0.0)
+        ret = f"{self.title} {t_str(math.ceil(remain)).strip()}"
+        if self.paused:
+            ret += " [PAUSE]"
+        elif self.alarm:
+            ret += " [TIME UP]"
+        return ret
+
+
+class StatusFile:
+    """Status file of a running timer.
+
+    固定レイアウトのファイルを mmap し、状態が変わった時だけ書く。
+    読む側は、経過時間を t_update からの時間で補うので、
+    毎フレーム書く必要はない。
+
+    seq は書き込み中は奇数になる (seqlock)。読む側は、
+    読む前後で seq が同じ偶数であることを確認する。
+    """
+
+    def __init__(self, name: str = "", directory: str | None = None):
+        """Constructor.
+
+        Args:
+            name (str): 1つのプロセスで複数のタイマーを動かす場合の名前。
+            directory (str | None): None の場合は status_dir()。
+
+        Raises:
+            PermissionError: ディレクトリが自分のものではない (make_dir())
+        """
+        self.dir = make_dir(directory or status_dir())
+
+        self.pid = os.getpid()
+        fname = f"{self.pid}-{name}" if name else f"{self.pid}"
+        self.path = os.path.join(self.dir, f"{fname}.status")
+
+        # 置かれたシンボリックリンクの先を切り詰めない
+        fd = os.open(
+            self.path,
+            os.O_RDWR | os.O_CREAT | os.O_TRUNC | os.O_NOFOLLOW,
+            0o600,
+        )
+        try:
+            os.ftruncate(fd, SIZE)
+            self.mm: mmap.mmap | None = mmap.mmap(fd, SIZE)
+        finally:
+            os.close(fd)
+
+        self.seq = 0
+        self.phase = -1
+
+    def write(
+        self,
+        title: str,
+        limit: float,
+        elapsed: float,
+        t_update: float,
+        active: bool = True,
+        paused: bool = False,
+        alarm: bool = False,
+    ):
+        """Write the state."""
+        if self.mm is None:
+            return
+
+        flags = (
+            (FLAG_ACTIVE if active else 0)
+            | (FLAG_PAUSED if paused else 0)
+            | (FLAG_ALARM if alarm else 0)
+        )
+        # マルチバイト文字の途中で切らない
+        b_title = title.encode()[:TITLE_MAX].decode(errors="ignore").encode()
+
+        self.seq += 1  # 奇数: 書き込み中
+        struct.pack_into("<I", self.mm, OFS_SEQ, self.seq)
+        self.seq += 1
+        LAYOUT.pack_into(
+            self.mm,
+            0,
+            MAGIC,
+            self.seq - 1,
+            self.pid,
+            flags,
+            self.phase,
+            limit,
+            elapsed,
+            t_update,
+            b_title,
+        )
+        struct.pack_into("<I", self.mm, OFS_SEQ, self.seq)
+
+    def close(self):
+        """Remove the status file."""
+        if self.mm is None:
+            return
+        self.mm.close()
+        self.mm = None
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def parse(data: bytes, path: str = "") -> TimerStatus | None:
+    """Parse a status file.
+
+    Returns:
+        TimerStatus | None: 書き込み中や壊れている場合は None
+    """
+    if len(data) < LAYOUT.size:
+        return None
+
+    magic, seq, pid, flags, phase, limit, elapsed, t_update, b_title = (
+        LAYOUT.unpack_from(data)
+    )
+    if magic != MAGIC or seq == 0 or seq % 2:
+        return None
+
+    return TimerStatus(
+        pid=pid,
+        title=b_title.rstrip(b"\0").decode(errors="replace"),
+        limit=limit,
+        elapsed=elapsed,
+        t_update=t_update,
+        active=bool(flags & FLAG_ACTIVE),
+        paused=bool(flags & FLAG_PAUSED),
+        alarm=bool(flags & FLAG_ALARM),
+        phase=phase,
+        path=path,
+    )
+
+
+def read_status(path: str, retry: int = 3) -> TimerStatus | None:
+    """Read a status file.
+
+    書き込み中 (seq が奇数、または読む間に変わった) なら読み直す。
+    """
+    fd = os.open(path, os.O_RDONLY | os.O_NOFOLLOW)
+    try:
+        for _ in range(retry):
+            data = os.pread(fd, SIZE, 0)
+            st = parse(data, path)
+            if st is None:
+                continue
+            # 読んだ後で seq が変わっていなければ、一貫している
+            if os.pread(fd, 4, OFS_SEQ) == data[OFS_SEQ : OFS_SEQ + 4]:
+                return st
+    finally:
+        os.close(fd)
+    return None
+
+
+def pid_alive(pid: int) -> bool:
+    """Whether the process exists."""
+    if pid <= 0:
+        return False  # 0 や負の値は、プロセスグループへの送信になる
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True  # 他のユーザのプロセス
+    return True
+
+
+def read_all(directory: str | None = None) -> list[TimerStatus]:
+    """Read the status files of the running timers.
+
+    終了したプロセスのファイル (異常終了で残ったもの) は削除する。
+    """
+    directory = directory or status_dir()
+    try:
+        check_dir(directory)
+        names = sorted(os.listdir(directory))
+    except (FileNotFoundError, PermissionError):
+        return []  # ない、または、他のユーザが作ったディレクトリ
+
+    ret = []
+    for name in names:
+        if not name.endswith(".status"):
+            continue
+        path = os.path.join(directory, name)
+        try:
+            st = read_status(path)
+        except FileNotFoundError:
+            continue  # 読む前に終了した
+        except OSError:
+            continue  # シンボリックリンクなど
+        if st is None:
+            continue
+        if not pid_alive(st.pid):
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+            continue
+        ret.append(st)
+    return ret
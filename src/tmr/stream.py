@@ -0,0 +1,78 @@
+#
+# (c) 2026 Yoichi Tanibayashi
+#
+import json
+import sys
+import time
+
+from .tty_writer import TtyWriter
+
+
+class EventStream:
+    """Event stream for pipes and logs.
+
+    端末ではない出力先に、エスケープシーケンスを使わずに、
+    1行に1イベントを書く。
+
+    format:
+        json: {"ts":1767225600.0,"event":"tick","title":"Timer",...}
+        text: 2026-01-01T09:00:00 tick title=Timer elapsed=12.0 ...
+    """
+
+    FORMATS = ("json", "text")
+    DEF_TICK = 1.0  # sec, tick イベントの間隔
+
+    def __init__(self, fmt: str = "json", tick: float = DEF_TICK, out=None):
+        """Constructor.
+
+        Args:
+            fmt (str): "json" または "text"。
+            tick (float): tick イベントの間隔 (sec)。
+            out: 出力先のファイルオブジェクト。None の場合は sys.stdout。
+        """
+        if fmt not in self.FORMATS:
+            raise ValueError(f"fmt={fmt!r}: not in {self.FORMATS}")
+
+        self.fmt = fmt
+        self.tick = tick
+        self.out = TtyWriter(stream=out)
+        self.events = 0
+
+    @staticmethod
+    def resolve(mode: str, out=None) -> str | None:
+        """Format for a --stream mode.
+
+        "auto" の場合は、出力先が端末でなければ "json"。
+
+        Returns:
+            str | None: "json", "text"、または None (端末に表示する)
+        """
+        if mode == "off":
+            return None
+        if mode == "auto":
+            out = out if out is not None else sys.stdout
+            return None if out.isatty() else "json"
+        return mode
+
+    def emit(self, event: str, ts: float, fields: dict):
+        """Write one event."""
+        self.out.write(self.format(event, ts, fields) + "\n")
+        self.out.flush()
+        self.events += 1
+
+    def format(self, event: str, ts: float, fields: dict) -> str:
+        """Format one event."""
+        if self.fmt == "json":
+            return json.dumps(
+                {"ts": round(ts, 3), "event": event, **fields},
+                separators=(",", ":"),
+                ensure_ascii=False,
+            )
+
+        t_str = time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(ts))
+        items = []
+        for k, v in fields.items():
+            if isinstance(v, str) and (not v or " " in v):
+                v = json.dumps(v, ensure_ascii=False)  # 空白を含む場合
+            items.append(f"{k}={v}")
+        return " ".join([t_str, event] + items)
@@ -0,0 +1,94 @@
+#
+# (c) 2026 Yoichi Tanibayashi
+#
+import io
+import os
+import sys
+import threading
+
+from . import ESQ_SYNC_BEGIN, ESQ_SYNC_END
+
+
+class TtyWriter:
+    """Buffered terminal writer.
+
+    1フレーム分の出力をバッファにため、flush() で一度の os.write() で
+    書き出す。sync が True なら、フレームを synchronized output
+    (DEC mode 2026) で囲み、描画途中の画面が見えないようにする。
+    """
+
+    def __init__(self, stream=None, sync: bool = False):
+        """Constructor.
+
+        Args:
+            stream: 出力先。None なら flush() 時点の sys.stdout。
+            sync (bool): synchronized output を使う。
+        """
+        self.stream = stream
+        self.sync = sync
+
+        self.buf = bytearray()  # flush() 後も使い回す
+        self.bytes_written = 0
+        self.flushes = 0
+
+        self._lock = threading.Lock()  # アラームのスレッドからも書く
+
+    def write(self, text: str):
+        """Append text to the frame buffer."""
+        if not text:
+            return
+        with self._lock:
+            if not self.buf and self.sync:
+                self.buf += ESQ_SYNC_BEGIN.encode()
+            self.buf += text.encode(self.encoding, "replace")
+
+    def flush(self) -> int:
+        """Write the frame buffer.
+
+        Returns:
+            int: 書き込んだバイト数。
+        """
+        with self._lock:
+            if not self.buf:
+                return 0
+            if self.sync:
+                self.buf += ESQ_SYNC_END.encode()
+
+            n = self._write(self.buf)
+            self.buf.clear()
+
+        self.bytes_written += n
+        self.flushes += 1
+        return n
+
+    @property
+    def encoding(self) -> str:
+        """Output encoding."""
+        return getattr(self.out_stream, "encoding", None) or "utf-8"
+
+    @property
+    def out_stream(self):
+        """Output stream."""
+        return self.stream if self.stream is not None else sys.stdout
+
+    def _write(self, data: bytearray) -> int:
+        """Write data at once."""
+        stream = self.out_stream
+        try:
+            fd = stream.fileno()
+        except (AttributeError, ValueError, io.UnsupportedOperation):
+            fd = None
+
+        if fd is None:
+            # ファイルディスクリプタが無い (テストなど)
+            stream.write(data.decode(self.encoding, "replace"))
+            stream.flush()
+            return len(data)
+
+        stream.flush()  # click.echo() などで書かれた分を先に出す
+
+        with memoryview(data) as view:
+            pos = 0
+            while pos < len(view):
+                pos += os.write(fd, view[pos:])
+        return len(data)
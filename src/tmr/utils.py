@@ -1,24 +1,69 @@
 #
 # (c) 2026 Yoichi Tanibayashi
 #
-import click
+import functools
 
-from . import ESQ_CSR_OFF, ESQ_CSR_ON, ESQ_EL2
+from . import ESQ_CSR_OFF, ESQ_CSR_ON, ESQ_EL2, HOUR_DAY, MIN_HOUR, SEC_MIN
+from .tty_writer import TtyWriter
+
+
+@functools.lru_cache(maxsize=4096)
+def t_str(sec: int, omit_sec: bool = False) -> str:
+    """Time string.
+
+    整数秒ごとにキャッシュする。
+
+    sec -> " M m SS s", "H h MM m SS s", "D d HH h MM m SS s"
+    """
+    m, s = divmod(sec, SEC_MIN)
+    if m < MIN_HOUR:
+        if omit_sec and s == 0:
+            return f"{m:2d}m"
+        return f"{m:2d}m{s:02d}s"
+
+    h, m = divmod(m, MIN_HOUR)
+    if h < HOUR_DAY:
+        if omit_sec and s == 0:
+            return f"{h}h{m:02d}m"
+        return f"{h}h{m:02d}m{s:02d}s"
+
+    d, h = divmod(h, HOUR_DAY)
+    if omit_sec and s == 0:
+        return f"{d}d{h:02d}h{m:02d}m"
+    return f"{d}d{h:02d}h{m:02d}m{s:02d}s"
 
 
 class TerminalContext:
     """端末のカーソル制御と終了処理を行うコンテキストマネージャ"""
 
+    def __init__(self, out: TtyWriter | None = None, tty: bool = True):
+        """Constructor.
+
+        Args:
+            tty (bool): False の場合 (ストリーム出力) はエスケープを書かない。
+        """
+        self.out = out if out is not None else TtyWriter()
+        self.tty = tty
+
     def __enter__(self):
         # カーソルを消す
-        click.echo(ESQ_CSR_OFF, nl=False)
+        if self.tty:
+            self.out.write(ESQ_CSR_OFF)
+            self.out.flush()
         return self
 
     def __exit__(self, exc_type, exc_value, traceback):
+        if not self.tty:
+            # ストリームの途中に余計な行を書かない
+            return exc_type is KeyboardInterrupt
+
         # 例外発生時も含め、必ずカーソルを表示に戻す
-        click.echo(f"{ESQ_CSR_ON}", nl=False)
+        self.out.write(ESQ_CSR_ON)
 
         if exc_type is KeyboardInterrupt:
             # KeyboardInterrupt はここで処理し、スタックトレースを出さずに終了
-            click.echo(f"\n{ESQ_EL2}Aborted.")
+            self.out.write(f"\n{ESQ_EL2}Aborted.\n")
+            self.out.flush()
             return True  # 例外を抑制
+
+        self.out.flush()
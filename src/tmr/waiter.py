@@ -0,0 +1,74 @@
+#
+# (c) 2026 Yoichi Tanibayashi
+#
+import selectors
+import socket
+
+
+class Waiter:
+    """Wait for input fds, a wakeup, or a timeout.
+
+    キー入力などのファイルディスクリプタと、シグナルハンドラなどからの
+    wake() をまとめて一つの select で待つ。
+    """
+
+    def __init__(self):
+        """Constructor."""
+        self.sel = selectors.DefaultSelector()
+
+        # wake() 用の自己パイプ
+        self._wake_r, self._wake_w = socket.socketpair()
+        self._wake_r.setblocking(False)
+        self._wake_w.setblocking(False)
+        self.sel.register(self._wake_r, selectors.EVENT_READ, None)
+
+    def add(self, fd, tag: str):
+        """Add fd to wait for.
+
+        Args:
+            fd: file descriptor or file object.
+            tag (str): returned by wait() when fd is ready.
+        """
+        self.sel.register(fd, selectors.EVENT_READ, tag)
+
+    def remove(self, fd):
+        """Remove fd."""
+        self.sel.unregister(fd)
+
+    def wake(self):
+        """Wake up wait().
+
+        シグナルハンドラや別スレッドから呼んでもよい。
+        """
+        try:
+            self._wake_w.send(b"\0")
+        except (BlockingIOError, OSError):
+            pass  # 既に起こされている、または close 済み
+
+    def wait(self, timeout: float | None) -> set[str]:
+        """Wait.
+
+        Returns:
+            set[str]: tags of ready fds. 空集合ならタイムアウトか wake()。
+        """
+        ready = set()
+        for key, _ in self.sel.select(timeout):
+            if key.data is None:
+                self._drain()
+                continue
+            ready.add(key.data)
+        return ready
+
+    def _drain(self):
+        """Drain wakeup bytes."""
+        try:
+            while self._wake_r.recv(64):
+                pass
+        except (BlockingIOError, OSError):
+            pass
+
+    def close(self):
+        """Close."""
+        self.sel.close()
+        self._wake_r.close()
+        self._wake_w.close()
@@ -0,0 +1,47 @@
+#
+# (c) 2026 Yoichi Tanibayashi
+#
+import contextlib
+
+from blessed.keyboard import Keystroke
+
+from tmr.clock import VirtualClock
+
+
+class FakeTerm:
+    """Terminal whose keys are pressed at given virtual times."""
+
+    def __init__(
+        self,
+        clock: VirtualClock,
+        keys: list[tuple[float, str]],
+        width: int = 80,
+        height: int = 24,
+        tty: bool = True,
+    ):
+        """Constructor.
+
+        Args:
+            tty (bool): False の場合、cbreak() を呼ぶとエラー
+                (ストリームでは端末の設定を変えない)。
+        """
+        self.width = width
+        self.height = height
+        self.tty = tty
+        self.queue: list[Keystroke] = []
+        for t, k in keys:
+            clock.call_at(t, self.press(k))
+
+    def press(self, key: str):
+        return lambda: self.queue.append(Keystroke(key))
+
+    def inkey(self, timeout=0):
+        return self.queue.pop(0) if self.queue else Keystroke("")
+
+    def cbreak(self):
+        if not self.tty:
+            raise AssertionError("stream mode must not use cbreak")
+        return contextlib.nullcontext()
+
+    def fullscreen(self):
+        return contextlib.nullcontext()
@@ -0,0 +1,185 @@
+#
+# (c) 2026 Yoichi Tanibayashi
+#
+import asyncio
+import os
+import threading
+
+import pytest
+from blessed.keyboard import Keystroke
+
+from tmr.aio import AsyncPomodoro, AsyncTimer, EventQueue, LoopAlarm
+from tmr.base_timer import BaseTimer
+from tmr.pomodoro import PomodoroConfig, PomodoroTimer
+
+
+class PipeTerm:
+    """Terminal whose keyboard is a pipe."""
+
+    width = 80
+    height = 24
+
+    def __init__(self):
+        self.r, self.w = os.pipe()
+        os.set_blocking(self.r, False)
+        self._keyboard_fd = self.r
+
+    def inkey(self, timeout=0):
+        try:
+            return Keystroke(os.read(self.r, 1).decode())
+        except BlockingIOError:
+            return Keystroke("")
+
+    def close(self):
+        os.close(self.r)
+        os.close(self.w)
+
+
+def mk_timer(limit: float, tick: float = 0.05, term=None) -> BaseTimer:
+    """Headless timer."""
+    return BaseTimer(
+        ("Tea", "white"),
+        limit,
+        alarm_params=(1, 0.01, 0.01),
+        stream=EventQueue(tick=tick),
+        term=term,
+    )
+
+
+async def collect(events) -> list[dict]:
+    return [ev async for ev in events]
+
+
+def test_run_events():
+    """Verify await run() and async for events()."""
+
+    async def main():
+        at = AsyncTimer(mk_timer(0.2))
+        # run() の前に受け取り始める
+        events = asyncio.create_task(collect(at.events()))
+        quit_by_quitcmd = await at.run()
+        return quit_by_quitcmd, await events
+
+    quit_by_quitcmd, events = asyncio.run(main())
+    assert quit_by_quitcmd is False
+
+    names = [ev["event"] for ev in events]
+    assert names[0] == "start"
+    assert "tick" in names
+    assert names[-2:] == ["alarm", "end"]
+    assert events[-1]["reason"] == "timeup"
+    assert events[-1]["remain"] == 0.0
+
+
+def test_send():
+    """Verify commands sent while running."""
+
+    async def main():
+        at = AsyncTimer(mk_timer(60.0))
+        task = asyncio.create_task(at.run())
+        events = at.events()
+        assert (await anext(events))["event"] == "start"
+        at.send("pause")
+        assert (await anext(events))["event"] == "pause"
+        at.send("forward10")
+        assert (await anext(events))["offset"] == 10.0
+        at.send("quit")
+        return await task, [ev["event"] async for ev in events]
+
+    quit_by_quitcmd, rest = asyncio.run(main())
+    assert quit_by_quitcmd is True
+    assert rest == ["end"]
+
+    with pytest.raises(ValueError):
+        AsyncTimer(mk_timer(1.0)).send("no_such_command")
+    with pytest.raises(TypeError):
+        AsyncTimer(BaseTimer(("Tea", "white"), 1.0)).events()
+
+
+def test_keys_through_loop():
+    """Verify keys are read by the loop's reader."""
+    term = PipeTerm()
+
+    async def main():
+        at = AsyncTimer(mk_timer(60.0, term=term), keys=True)
+        loop = asyncio.get_running_loop()
+        loop.call_later(0.05, os.write, term.w, b" q")
+        return await asyncio.wait_for(at.run(), 5.0)
+
+    try:
+        assert asyncio.run(main()) is True
+    finally:
+        term.close()
+
+
+def test_many_timers_one_loop():
+    """Verify many timers share one loop without extra threads."""
+    n_threads = threading.active_count()
+
+    async def main():
+        timers = [AsyncTimer(mk_timer(0.05 + i * 0.002)) for i in range(50)]
+        threads = []
+
+        async def run(at):
+            threads.append(threading.active_count())
+            return await at.run()
+
+        ret = await asyncio.gather(*(run(at) for at in timers))
+        return ret, threads
+
+    ret, threads = asyncio.run(main())
+    assert ret == [False] * 50
+    assert max(threads) == n_threads
+
+
+def test_pomodoro():
+    """Verify the phases of a Pomodoro session on the loop."""
+    config = PomodoroConfig(
+        work_sec=0.05, break_sec=0.05, long_break_sec=0.05, cycles=1
+    )
+    pomodoro = PomodoroTimer(config, stream=EventQueue(tick=1.0))
+
+    async def main():
+        ap = AsyncPomodoro(pomodoro)
+        task = asyncio.create_task(ap.run())
+        events = []
+        async for ev in ap.events():
+            events.append(ev)
+            if ev["event"] == "phase" and ev["cycle"] == 2:
+                ap.send("quit")
+        return await task, events
+
+    quit_by_quitcmd, events = asyncio.run(main())
+    assert quit_by_quitcmd is True
+
+    phases = [ev["title"] for ev in events if ev["event"] == "phase"]
+    assert phases == ["WORK", "LONG_BREAK", "WORK"]
+    reasons = [ev["reason"] for ev in events if ev["event"] == "end"]
+    assert reasons == ["timeup", "timeup", "quit"]
+
+
+def test_loop_alarm():
+    """Verify the bells are loop callbacks and stop() cancels them."""
+
+    async def main():
+        bells: list[float] = []
+        done = asyncio.Event()
+        loop = asyncio.get_running_loop()
+
+        alarm = LoopAlarm()
+        alarm.start(
+            2, 0.01, 0.02, lambda: bells.append(loop.time()), done.set
+        )
+        assert alarm.active
+        await asyncio.wait_for(done.wait(), 1.0)
+        assert not alarm.active
+        n_done = len(bells)
+
+        alarm.start(10, 0.01, 0.01, lambda: bells.append(loop.time()))
+        alarm.stop()
+        await asyncio.sleep(0.05)
+        return n_done, len(bells)
+
+    n_done, n_all = asyncio.run(main())
+    assert n_done == 4
+    assert n_all == 5  # stop() の前の1回だけ
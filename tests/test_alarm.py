@@ -0,0 +1,110 @@
+#
+# (c) 2026 Yoichi Tanibayashi
+#
+import threading
+
+import pytest
+
+from tmr.alarm import AlarmScheduler
+
+
+@pytest.fixture
+def alarm():
+    a = AlarmScheduler()
+    yield a
+    a.stop()
+
+
+def test_stop_is_immediate(alarm):
+    """Verify stop does not wait for the long interval."""
+    rang = threading.Event()
+    alarm.start(999, 0.01, 10.0, bell=rang.set)
+    assert rang.wait(timeout=1.0)
+
+    latency = alarm.stop()
+    assert latency < 0.1
+    assert alarm.stop_latency == latency
+    assert not alarm.active
+
+
+def test_stop_without_alarm(alarm):
+    """Verify stop returns at once when nothing is ringing."""
+    assert alarm.stop() < 0.1
+
+
+def test_worker_reused(alarm):
+    """Verify one worker thread serves many alarms."""
+    done = threading.Event()
+    bells = []
+
+    alarm.start(1, 0.0, 0.0, bell=lambda: bells.append(1), on_done=done.set)
+    assert done.wait(timeout=1.0)
+    thread = alarm._thread
+
+    done.clear()
+    alarm.start(2, 0.0, 0.0, bell=lambda: bells.append(2), on_done=done.set)
+    assert done.wait(timeout=1.0)
+
+    assert alarm._thread is thread
+    assert bells == [1, 1, 2, 2, 2, 2]
+
+
+def test_on_done_not_called_when_stopped(alarm):
+    """Verify on_done is called only when the alarm completes."""
+    done = threading.Event()
+    rang = threading.Event()
+    alarm.start(999, 10.0, 10.0, bell=rang.set, on_done=done.set)
+    assert rang.wait(timeout=1.0)
+
+    alarm.stop()
+    assert not done.is_set()
+
+
+def test_shared():
+    """Verify the shared scheduler is a singleton."""
+    assert AlarmScheduler.shared() is AlarmScheduler.shared()
+
+
+def test_overlapping_alarms(alarm):
+    """Verify two owners ring at the same time, each to the end."""
+    done = {"A": threading.Event(), "B": threading.Event()}
+    bells: list[str] = []
+
+    def start(owner: str, count: int):
+        alarm.start(
+            count,
+            0.02,
+            0.02,
+            bell=lambda: bells.append(owner),
+            on_done=done[owner].set,
+            owner=owner,
+        )
+
+    start("A", 3)
+    start("B", 2)
+    assert done["A"].wait(timeout=2.0)
+    assert done["B"].wait(timeout=2.0)
+    assert bells.count("A") == 6
+    assert bells.count("B") == 4
+    assert not alarm.active
+
+
+def test_stop_owner(alarm):
+    """Verify stop(owner) stops only the alarm of owner."""
+    done = threading.Event()
+    bells: list[str] = []
+
+    alarm.start(999, 0.01, 0.01, bell=lambda: bells.append("A"), owner="A")
+    alarm.start(
+        2,
+        0.01,
+        0.01,
+        bell=lambda: bells.append("B"),
+        on_done=done.set,
+        owner="B",
+    )
+    alarm.stop("A")
+    assert not alarm.ringing("A")
+    assert done.wait(timeout=2.0)
+    assert bells.count("B") == 4
+    assert bells.count("A") <= 1
@@ -1,16 +1,22 @@
 #
 # (c) 2026 Yoichi Tanibayashi
 #
-from unittest.mock import MagicMock, patch
+import itertools
+import math
+import signal
+from unittest.mock import MagicMock, call, patch
 
 import pytest
 
 from tmr.base_timer import BaseTimer
+from tmr.renderer import text_width
+from tmr.stats import Stats
 
 
 @pytest.fixture
 def mock_terminal():
     with patch("tmr.base_timer.Terminal") as mock:
+        mock.return_value.inkey.return_value = None  # キー入力なし
         yield mock
 
 
@@ -21,28 +27,38 @@ def mock_pbar():
 
 
 @pytest.fixture
-def mock_click():
-    with patch("tmr.base_timer.click") as mock:
-        yield mock
+def mock_out():
+    with patch("tmr.base_timer.TtyWriter") as mock:
+        yield mock.return_value
 
 
 @pytest.fixture
 def mock_time():
-    with patch("tmr.base_timer.time") as mock:
+    with patch("tmr.clock.time") as mock:
         yield mock
 
 
 @pytest.fixture
-def base_timer(mock_terminal, mock_pbar, mock_click, mock_time):
+def mock_alarm():
+    with patch("tmr.base_timer.AlarmScheduler") as mock:
+        alarm = mock.shared.return_value
+        alarm.stop.return_value = 0.0
+        yield alarm
+
+
+@pytest.fixture
+def base_timer(mock_terminal, mock_pbar, mock_out, mock_time, mock_alarm):
     """
     Fixture for BaseTimer with mocked dependencies.
     """
     # Set default values for terminal size to avoid comparison errors
     mock_terminal.return_value.width = 80
     mock_terminal.return_value.height = 24
+    mock_time.time.return_value = 1000.0
+    mock_time.monotonic.return_value = 1000.0
 
     # Access fixtures to satisfy linters (as they are needed for patching)
-    _ = (mock_pbar, mock_click, mock_time)
+    _ = (mock_pbar, mock_out, mock_time, mock_alarm)
 
     return BaseTimer()
 
@@ -66,6 +82,35 @@ def test_initial_state(base_timer):
     assert base_timer.quit_by_quitcmd is False
 
 
+def test_reset(base_timer, mock_terminal):
+    """
+    Verify reset() starts a new run without rebuilding the terminal.
+    """
+    term = base_timer.term
+    key_map = base_timer.key_map
+    base_timer.is_paused = True
+    base_timer.quit_by_quitcmd = True
+    base_timer.t_elapsed = 12.0
+    base_timer.rate_band = ("red", 95.0, 100.0)
+
+    base_timer.reset(("BREAK", "yellow"), 30.0)
+
+    assert base_timer.col["title"].value == "BREAK"
+    assert base_timer.col["title"].color == "yellow"
+    assert base_timer.t_limit == 30.0
+    assert base_timer.pbar.total == 30.0
+    assert base_timer.t_elapsed == 0.0
+    assert base_timer.is_paused is False
+    assert base_timer.quit_by_quitcmd is False
+    assert base_timer.rate_band == ("", 0.0, 0.0)
+    assert base_timer.renderer.prev is None
+
+    # 使い回すもの
+    assert base_timer.term is term
+    assert base_timer.key_map is key_map
+    assert mock_terminal.call_count == 1
+
+
 def test_fn_pause(base_timer):
     """
     Verify fn_pause toggles is_paused.
@@ -138,12 +183,14 @@ def test_responsive_layout(base_timer, mock_terminal):
     """
     # 広い幅: 全てのカラムが使われるはず
     base_timer.term.width = 200
+    base_timer.on_resize()
     base_timer.display()
     assert all(col.use for col in base_timer.col.values())
 
     # 非常に狭い幅: 一部のカラムが disabled になるはず
     # 表示優先順 (低優先度から削除): date, time, elapsed, rate, limit, pbar, state, title, remain
     base_timer.term.width = 10
+    base_timer.on_resize()
     base_timer.display()
 
     # 低優先度の date や time は False になっているはず
@@ -152,10 +199,83 @@ def test_responsive_layout(base_timer, mock_terminal):
 
     # 超極小幅: 全て消えるか、!? が表示される
     base_timer.term.width = 1
+    base_timer.on_resize()
     base_timer.display()
     assert not any(col.use for col in base_timer.col.values())
 
 
+def test_layout_plan(base_timer):
+    """
+    Verify the layout plan places columns and sizes the progress bar.
+    """
+    base_timer.col["date"].value = "2026-01-01"
+    base_timer.col["time"].value = "12:00:00"
+    base_timer.col["title"].value = "Timer"
+    base_timer.col["limit"].value = " 3m"
+    base_timer.col["state"].value = ""
+    base_timer.col["rate"].value = "  0.0%"
+    base_timer.col["elapsed"].value = " 0m00s"
+    base_timer.col["remain"].value = " 3m00s"
+
+    plan = base_timer.layout(80)
+    assert plan.cols == (
+        "date",
+        "time",
+        "title",
+        "limit",
+        "rate",
+        "elapsed",
+        "pbar",
+        "remain",
+    )
+    assert plan.x[:3] == (0, 11, 20)
+    # 項目間の空白を含めて、ちょうど端末幅になる
+    others = sum(len(base_timer.col[c].value) + 1 for c in plan.cols[:-2])
+    assert others + plan.pbar_len + 1 + len(" 3m00s") == 80
+
+    # 狭い幅: 低優先度の項目から省略される
+    plan = base_timer.layout(30)
+    assert "date" not in plan.use
+    assert "time" not in plan.use
+    assert "remain" in plan.use
+
+
+def test_layout_cache(base_timer):
+    """
+    Verify the layout plan is cached per width and value lengths.
+    """
+    plan = base_timer.layout(80)
+    assert base_timer.layout(80) is plan
+
+    # 幅が変われば再計算
+    assert base_timer.layout(60) is not plan
+
+    # 値の長さが変われば再計算、同じ長さなら再利用
+    base_timer.col["state"].value = "[PAUSE]"
+    plan_pause = base_timer.layout(80)
+    assert plan_pause is not plan
+    base_timer.col["state"].value = "[ABCDE]"
+    assert base_timer.layout(80) is plan_pause
+
+
+def test_sigwinch_handler_restored(base_timer):
+    """
+    Verify main installs the SIGWINCH handler and restores the previous one.
+    """
+    prev = signal.getsignal(signal.SIGWINCH)
+    installed = []
+
+    def fake_main_loop(self, _t_start=None):
+        installed.append(signal.getsignal(signal.SIGWINCH))
+        return False
+
+    with patch.object(BaseTimer, "main_loop", fake_main_loop):
+        base_timer.main()
+
+    assert installed == [base_timer.on_resize]
+    assert signal.getsignal(signal.SIGWINCH) == prev
+
+
 def test_rate_color(base_timer):
     """
     Verify that colors change based on the elapsed time rate.
@@ -178,6 +298,28 @@ def test_rate_color(base_timer):
     assert base_timer.col["remain"].color == "red"
 
 
+def test_rate_band(base_timer):
+    """
+    Verify the color band is looked up only when the rate crosses it.
+    """
+    base_timer.t_limit = 100.0
+    assert base_timer.get_rate_band(50.0) == ("white", 0, 80)
+    assert base_timer.get_rate_band(99.0) == ("red", 95, math.inf)
+
+    with patch.object(
+        base_timer, "get_rate_band", wraps=base_timer.get_rate_band
+    ) as spy:
+        for elapsed in (0.0, 10.0, 50.0, 79.0):
+            base_timer.t_elapsed = elapsed
+            base_timer.display()
+        assert spy.call_count == 1
+
+        base_timer.t_elapsed = 80.0
+        base_timer.display()
+        assert spy.call_count == 2
+        assert base_timer.col["rate"].color == "yellow"
+
+
 def test_get_key_name(base_timer, mock_terminal):
     """
     Verify get_key_name correctly identifies pressed keys.
@@ -197,7 +339,271 @@ def test_get_key_name(base_timer, mock_terminal):
 
     # Timeout (no key)
     base_timer.term.inkey.return_value = None
-    assert base_timer.get_key_name() == ""
+    assert base_timer.get_key_name(0.01) == ""
+
+
+def test_get_key_name_timeout(base_timer):
+    """
+    Verify get_key_name waits on the waiter and counts wakeups.
+    """
+    base_timer.term.inkey.return_value = None
+
+    with patch.object(base_timer.waiter, "wait", return_value=set()) as w:
+        base_timer.get_key_name(0.7)
+        w.assert_called_with(0.7)
+
+        base_timer.get_key_name()
+        w.assert_called_with(BaseTimer.IN_KEY_TIMEOUT)
+
+    assert base_timer.wakeups == 2
+
+
+def test_get_key_name_key_ready(base_timer):
+    """
+    Verify get_key_name reads the key when the keyboard becomes ready.
+    """
+    mock_key = MagicMock()
+    mock_key.name = "KEY_ENTER"
+    base_timer.term.inkey.side_effect = [None, mock_key]
+
+    with patch.object(
+        base_timer.waiter, "wait", return_value={BaseTimer.WAIT_TAG_KEY}
+    ):
+        assert base_timer.get_key_name(1.0) == "KEY_ENTER"
+
+
+def test_on_resize(base_timer):
+    """
+    Verify on_resize stores the size and invalidates caches.
+    """
+    base_timer.display()
+    assert base_timer.layout(base_timer.width) is not None
+    assert base_timer.renderer.prev is not None
+
+    base_timer.term.width = 120
+    base_timer.term.height = 40
+    with patch.object(base_timer.waiter, "wake") as mock_wake:
+        base_timer.on_resize()
+        mock_wake.assert_called_once()
+
+    assert base_timer.width == 120
+    assert base_timer.height == 40
+    assert base_timer._layout_cache == {}
+    assert base_timer.renderer.prev is None
+
+
+def test_next_timeout(base_timer, mock_time):
+    """
+    Verify next_timeout returns the time until the next display change.
+    """
+    margin = BaseTimer.WAKE_MARGIN
+    mock_time.time.return_value = 1000.25  # 時計の次の秒まで 0.75
+    base_timer.t_limit = 180.0
+    base_timer.t_elapsed = 10.9
+
+    # 停止中: 時計の秒のみ
+    base_timer.is_active = False
+    assert base_timer.next_timeout() == pytest.approx(0.75 + margin)
+
+    # ポーズ中: 時計の秒のみ
+    base_timer.is_active = True
+    base_timer.is_paused = True
+    assert base_timer.next_timeout() == pytest.approx(0.75 + margin)
+
+    # 動作中: 経過時間の次の秒
+    base_timer.is_paused = False
+    assert base_timer.next_timeout() == pytest.approx(0.1 + margin)
+
+    # 動作中: 風車
+    base_timer.t_elapsed = 10.0
+    assert base_timer.next_timeout() == pytest.approx(
+        1 / BaseTimer.DEF_FPS + margin
+    )
+
+    # 動作中: 満了
+    base_timer.t_elapsed = 179.95
+    assert base_timer.next_timeout() == pytest.approx(0.05 + margin)
+
+
+def test_next_timeout_adaptive(base_timer, mock_time):
+    """
+    Verify only visible columns wake the loop.
+    """
+    margin = BaseTimer.WAKE_MARGIN
+    mock_time.time.return_value = 1000.25
+    base_timer.t_limit = 3600.0
+    base_timer.t_elapsed = 100.0
+    base_timer.is_active = True
+    base_timer.spinner = False
+    base_timer.pbar_len = 36  # 100秒ごとに1文字
+
+    # 秒を表示するカラムが無い: 率とプログレスバーの変化まで待つ
+    for c in ("date", "time", "elapsed", "remain"):
+        base_timer.col[c].use = False
+    base_timer.col["rate"].use = False
+    assert base_timer.next_timeout() == pytest.approx(50.0 + margin)
+
+    # 率 (0.1% = 3.6秒) を表示: 2.777..% -> 2.8% (2.85%) まで
+    base_timer.col["rate"].use = True
+    assert base_timer.next_timeout() == pytest.approx(2.6 + margin)
+
+    # fps で間隔の下限が決まる
+    base_timer.fps = 0.25
+    assert base_timer.next_timeout() == pytest.approx(4.0 + margin)
+
+    # ポーズ中で時計も非表示: キー入力まで待つ
+    base_timer.is_paused = True
+    assert base_timer.next_timeout() is None
+
+
+def test_no_spinner(base_timer):
+    """
+    Verify the spinner can be turned off.
+    """
+    base_timer.spinner = False
+    base_timer.is_active = True
+    base_timer.display()
+
+    _, kwargs = base_timer.pbar.get_str.call_args
+    assert kwargs["stop"] is True
+
+
+def test_stats(base_timer, mock_terminal, mock_out):
+    """
+    Verify frames, bytes, wakeups and key latency are recorded.
+    """
+    stats = Stats()
+    base_timer.stats = stats
+    mock_out.flush.return_value = 42
+    mock_key = MagicMock()
+    mock_key.name = "KEY_ENTER"
+    base_timer.term.inkey.side_effect = [None, mock_key]
+
+    with patch.object(
+        base_timer.waiter, "wait", return_value={BaseTimer.WAIT_TAG_KEY}
+    ):
+        base_timer.get_key_name(1.0)
+    base_timer.display()
+
+    assert stats.wakeups == 1
+    assert stats.frame_us.count == 1
+    assert stats.frame_bytes.total == 42
+    assert stats.key_latency_us.count == 1
+
+
+def test_wakeups_per_min(base_timer, mock_time):
+    """
+    Verify wakeups per minute.
+    """
+    base_timer.t_main_start = 100.0
+    base_timer.wakeups = 30
+    mock_time.monotonic.return_value = 160.0
+    assert base_timer.wakeups_per_min() == 30.0
+
+
+def key(name: str) -> MagicMock:
+    k = MagicMock()
+    k.name = name
+    return k
+
+
+def test_get_key_names_drains(base_timer):
+    """
+    Verify all buffered keys are read without waiting.
+    """
+    base_timer.term.inkey.side_effect = [key("KEY_RIGHT")] * 3 + [None]
+
+    with patch.object(base_timer.waiter, "wait") as mock_wait:
+        assert base_timer.get_key_names(1.0) == ["KEY_RIGHT"] * 3
+    mock_wait.assert_not_called()
+
+
+def test_get_key_names_max(base_timer):
+    """
+    Verify draining stops at MAX_KEYS.
+    """
+    base_timer.term.inkey.return_value = key("KEY_RIGHT")
+    assert len(base_timer.get_key_names(1.0)) == BaseTimer.MAX_KEYS
+
+
+def test_dispatch_coalesces_seeks(base_timer, mock_time):
+    """
+    Verify consecutive seeks are applied at once.
+    """
+    mock_time.monotonic.return_value = 100.0
+    base_timer.t_start = 50.0  # 50秒経過
+    base_timer.t_limit = 180.0
+
+    with patch.object(base_timer, "seek", wraps=base_timer.seek) as mock_seek:
+        base_timer.dispatch(
+            ["KEY_RIGHT"] * 30 + ["KEY_DOWN", "KEY_UP", "KEY_LEFT", "X"]
+        )
+
+    mock_seek.assert_called_once_with([1.0] * 30 + [10.0, -10.0, -1.0])
+    assert base_timer.t_elapsed == 79.0
+    assert base_timer.t_start == 21.0
+
+
+def test_dispatch_seek_order(base_timer, mock_time):
+    """
+    Verify a non-seek command splits the seeks and keeps the order.
+    """
+    mock_time.monotonic.return_value = 100.0
+    base_timer.t_start = 100.0
+    base_timer.is_active = True
+
+    with patch.object(base_timer, "seek") as mock_seek:
+        base_timer.dispatch(["KEY_RIGHT", "KEY_RIGHT", "P", "KEY_LEFT"])
+
+    assert mock_seek.call_args_list == [
+        call([1.0, 1.0]),
+        call([-1.0]),
+    ]
+    assert base_timer.is_paused is True
+
+
+@pytest.mark.parametrize(
+    "t_elapsed, secs, expected",
+    [
+        (0.0, [-5.0, 3.0], 3.0),  # 0 で止まってから進める
+        (175.0, [10.0, -1.0], 179.0),  # t_limit で止まってから戻す
+        (60.0, [10.0] * 3 + [-1.0] * 5, 85.0),
+    ],
+)
+def test_seek_same_as_sequential(
+    base_timer, mock_time, t_elapsed, secs, expected
+):
+    """
+    Verify seek() gives the same result as one key at a time.
+    """
+    mock_time.monotonic.return_value = 1000.0
+    base_timer.t_limit = 180.0
+
+    base_timer.t_start = 1000.0 - t_elapsed
+    for sec in secs:
+        if sec > 0:
+            base_timer.fn_forward(sec)
+        else:
+            base_timer.fn_backward(-sec)
+    sequential = base_timer.t_elapsed
+
+    base_timer.t_start = 1000.0 - t_elapsed
+    base_timer.seek(secs)
+
+    assert base_timer.t_elapsed == sequential == expected
+
+
+def test_dispatch_stops_after_quit(base_timer):
+    """
+    Verify keys after quit are dropped.
+    """
+    base_timer.is_active = True
+    with patch.object(base_timer, "fn_pause") as mock_pause:
+        base_timer.key_cmd["P"].fn = mock_pause
+        base_timer.dispatch(["Q", "P"])
+
+    assert base_timer.is_active is False
+    mock_pause.assert_not_called()
 
 
 def test_key_mapping(base_timer):
@@ -211,14 +617,18 @@ def test_key_mapping(base_timer):
     assert base_timer.key_map["KEY_ESCAPE"] == base_timer.fn_quit
 
 
-def test_edge_cases_and_robustness(base_timer, mock_terminal, mock_click):
+def test_edge_cases_and_robustness(base_timer, mock_terminal, mock_out):
     """
     Verify behavior in edge cases like extremely small width and unknown keys.
     """
     # Extremely small width - display should print "!?"
     base_timer.term.width = 0
+    base_timer.on_resize()
     base_timer.display()
-    mock_click.secho.assert_called_with("\r\x1b[2K!?", blink=True, nl=False)
+    written = "".join(c.args[0] for c in mock_out.write.call_args_list)
+    assert written.startswith("\r\x1b[2K")
+    assert "!?" in written
+    mock_out.flush.assert_called()
 
     # Unknown key - get_key_name should handle it gracefully
     mock_key = MagicMock()
@@ -232,6 +642,7 @@ def test_edge_cases_and_robustness(base_timer, mock_terminal, mock_click):
     # Empty title
     base_timer.col["title"].value = ""
     base_timer.term.width = 80
+    base_timer.on_resize()
     base_timer.display()
     # Should not crash and should work normally
 
@@ -252,16 +663,19 @@ def test_mk_cmd_str(base_timer):
     assert "Pause timer." in base_timer.mk_cmd_str(cmd)
 
 
-def test_fn_help(base_timer, mock_click):
+def test_fn_help(base_timer, mock_out):
     """
     Verify fn_help prints command list.
     """
     base_timer.fn_help()
-    # Should call echo multiple times
-    assert mock_click.echo.called
+    # Should write the command list at once
+    written = "".join(c.args[0] for c in mock_out.write.call_args_list)
+    assert "COMMAND LIST" in written
+    assert "Pause timer." in written
+    mock_out.flush.assert_called_once()
 
 
-def test_main_loop_simple(base_timer, mock_time, mock_terminal, mock_click):
+def test_main_loop_simple(base_timer, mock_time, mock_terminal, mock_out):
     """
     Verify the main loop runs and terminates correctly.
     """
@@ -279,25 +693,56 @@ def test_main_loop_simple(base_timer, mock_time, mock_terminal, mock_click):
     assert base_timer.alarm_active is False
 
 
-def test_ring_alarm_and_thread(base_timer, mock_click):
+def test_main_loop_t_start(base_timer, mock_time):
     """
-    Verify ring_alarm starts a thread.
+    Verify main() counts elapsed time from the given start time.
     """
-    base_timer.alarm_active = True
-    base_timer.alarm_params = (1, 0.01, 0.01)
+    mock_time.monotonic.return_value = 105.0
+    base_timer.t_limit = 180.0
+
+    with (
+        patch.object(BaseTimer, "get_key_name", side_effect=["", "Q"]),
+        patch.object(BaseTimer, "ring_alarm", return_value=False),
+    ):
+        base_timer.main(t_start=100.0)
+
+    assert base_timer.t_start == 100.0
+    assert base_timer.t_elapsed == 5.0
+
 
-    with patch("threading.Thread") as mock_thread:
-        base_timer.ring_alarm()
-        mock_thread.assert_called_once()
+def test_ring_alarm(base_timer, mock_alarm, mock_out):
+    """
+    Verify ring_alarm starts the shared alarm scheduler.
+    """
+    base_timer.alarm_active = False
+    assert base_timer.ring_alarm() is False
+    mock_alarm.start.assert_not_called()
 
-    # Test the thread function itself
     base_timer.alarm_active = True
-    base_timer.thr_alarm(1, 0.001, 0.001)
-    assert mock_click.echo.called  # Should call '\a'
+    base_timer.alarm_params = (1, 0.01, 0.01)
+    assert base_timer.ring_alarm() is True
+    mock_alarm.start.assert_called_once_with(
+        1,
+        0.01,
+        0.01,
+        bell=base_timer.bell,
+        on_done=base_timer.on_alarm_done,
+        owner=base_timer,
+    )
+
+    # ベルと、鳴り終わった時の処理
+    base_timer.bell()
+    mock_out.write.assert_any_call("\a")
+
+    with patch.object(base_timer.waiter, "wake") as mock_wake:
+        base_timer.on_alarm_done()
+        mock_wake.assert_called_once()
     assert base_timer.alarm_active is False
 
 
-def test_alarm_stop_by_key(base_timer, mock_terminal, mock_click, mock_time):
+def test_alarm_stop_by_key(
+    base_timer, mock_terminal, mock_out, mock_time, mock_alarm
+):
     """
     Verify alarm stops when a key is pressed.
     """
@@ -308,14 +753,11 @@ def test_alarm_stop_by_key(base_timer, mock_terminal, mock_click, mock_time):
     # 2. main loop 1: 110.0 (elapsed 10.0 > limit 0.1) -> Limit Reached
     mock_time.monotonic.side_effect = [100.0, 110.0, 120.0]
 
-    # Mock ring_alarm to return a dummy thread
-    mock_thread = MagicMock()
-
     # Mock get_key_name:
     # 1. Main Loop 1: "" (No key)
     # 2. Alarm Loop 1: "KEY_ENTER" (Key pressed) -> Break
 
-    with patch.object(BaseTimer, "ring_alarm", return_value=mock_thread):
+    with patch.object(BaseTimer, "ring_alarm", return_value=True):
         with patch.object(
             BaseTimer, "get_key_name", side_effect=["", "KEY_ENTER"]
         ):
@@ -329,7 +771,7 @@ def test_alarm_stop_by_key(base_timer, mock_terminal, mock_click, mock_time):
 
     assert base_timer.alarm_active is False
     assert base_timer.quit_by_quitcmd is False
-    mock_thread.join.assert_called_once()
+    mock_alarm.stop.assert_called_once()
 
 
 def test_fn_next(base_timer):
@@ -367,8 +809,27 @@ def test_display_hours(base_timer, mock_terminal):
     assert base_timer.col["elapsed"].value == "1h01m01s"
 
 
+def test_display_days_and_rounding(base_timer):
+    """
+    Verify multi-day limits and whole-second elapsed/remain strings.
+    """
+    base_timer.t_limit = 2 * 86400.0 + 3600.0
+    base_timer.t_elapsed = 0.6
+    base_timer.display()
+
+    assert base_timer.col["limit"].value == "2d01h00m"
+    assert base_timer.col["elapsed"].value == " 0m00s"  # 切り捨て
+    assert base_timer.col["remain"].value == "2d01h00m00s"  # 切り上げ
+
+    base_timer.t_limit = 60.0
+    base_timer.t_elapsed = 59.5
+    base_timer.display()
+    assert base_timer.col["elapsed"].value == " 0m59s"
+    assert base_timer.col["remain"].value == " 0m01s"
+
+
 def test_alarm_quit_by_quitcmd(
-    base_timer, mock_terminal, mock_click, mock_time
+    base_timer, mock_terminal, mock_out, mock_time, mock_alarm
 ):
     """
     Verify that pressing 'q' during alarm sets quit_by_quitcmd = True.
@@ -378,11 +839,9 @@ def test_alarm_quit_by_quitcmd(
     # Advance time past limit
     mock_time.monotonic.side_effect = [100.0, 110.0, 120.0]
 
-    mock_thread = MagicMock()
-
     # Main loop: "" (no key, timer expires)
     # Alarm loop: "Q" (quit key pressed)
-    with patch.object(BaseTimer, "ring_alarm", return_value=mock_thread):
+    with patch.object(BaseTimer, "ring_alarm", return_value=True):
         with patch.object(BaseTimer, "get_key_name", side_effect=["", "Q"]):
             with patch("tmr.base_timer.Terminal.cbreak"):
                 base_timer.t_limit = 0.1
@@ -390,7 +849,7 @@ def test_alarm_quit_by_quitcmd(
 
     assert base_timer.alarm_active is False
     assert base_timer.quit_by_quitcmd is True
-    mock_thread.join.assert_called_once()
+    mock_alarm.stop.assert_called_once()
 
 
 def test_display_pause_state(base_timer):
@@ -409,3 +868,20 @@ def test_display_pause_state(base_timer):
     base_timer.is_paused = True
     base_timer.display()
     assert base_timer.col["state"].value == "[PAUSE]"
+
+
+def test_mk_cells_wide_title(base_timer):
+    """
+    Verify cell positions use the display width of a CJK title.
+    """
+    base_timer.reset(("作業", "cyan"), 300.0)
+    cells = base_timer.mk_cells(200)
+    assert cells is not None
+    assert any(c.text == "作業" for c in cells)
+
+    # 各セルは、前のセルの表示幅 + 空白1つ の位置から始まる
+    # (プログレスバーはモックなので、その手前まで)
+    for prev, cur in itertools.pairwise(cells):
+        if not isinstance(prev.text, str):
+            break
+        assert cur.x == prev.x + text_width(prev.text) + 1
@@ -0,0 +1,134 @@
+#
+# (c) 2026 Yoichi Tanibayashi
+#
+import time
+
+import pytest
+
+from tmr.alarm import AlarmScheduler
+from tmr.clock import Clock, VirtualClock
+from tmr.waiter import Waiter
+
+
+@pytest.fixture
+def clock():
+    return VirtualClock(t_mono=100.0, t_wall=1000.0)
+
+
+@pytest.fixture
+def waiter():
+    w = Waiter()
+    yield w
+    w.close()
+
+
+def test_real_clock():
+    """Verify Clock follows the time module."""
+    clock = Clock()
+    assert clock.virtual is False
+    assert abs(clock.monotonic() - time.monotonic()) < 1.0
+    assert abs(clock.time() - time.time()) < 1.0
+    assert clock.strftime("%Y") == time.strftime("%Y")
+
+
+def test_virtual_time(clock):
+    """Verify monotonic and wall-clock time advance together."""
+    assert clock.virtual is True
+    assert clock.monotonic() == 100.0
+    assert clock.time() == 1000.0
+
+    clock.sleep(2.5)
+    assert clock.monotonic() == 102.5
+    assert clock.time() == 1002.5
+    assert clock.localtime() == time.localtime(1002.5)
+
+
+def test_call_later_order(clock):
+    """Verify calls run in time order, then in registration order."""
+    called = []
+    clock.call_later(2.0, lambda: called.append(("b", clock.monotonic())))
+    clock.call_later(1.0, lambda: called.append(("a", clock.monotonic())))
+    clock.call_later(2.0, lambda: called.append(("c", clock.monotonic())))
+    clock.call_later(5.0, lambda: called.append(("d", clock.monotonic())))
+
+    clock.advance(3.0)
+
+    assert called == [("a", 101.0), ("b", 102.0), ("c", 102.0)]
+    assert clock.monotonic() == 103.0
+
+
+def test_cancel(clock):
+    """Verify a cancelled call never runs."""
+    called = []
+    event_id = clock.call_later(1.0, lambda: called.append(1))
+    clock.cancel(event_id)
+
+    clock.advance(2.0)
+    assert called == []
+    assert clock.next_event() is None
+
+
+def test_wait_timeout(clock, waiter):
+    """Verify wait advances by the timeout without sleeping."""
+    t0 = time.monotonic()
+    assert clock.wait(waiter, 3600.0) == set()
+    assert clock.monotonic() == 3700.0
+    assert time.monotonic() - t0 < 0.5
+
+
+def test_wait_wakes_at_event(clock, waiter):
+    """Verify wait returns at the next call like a wakeup."""
+    clock.call_later(1.5, waiter.wake)
+
+    assert clock.wait(waiter, 10.0) == set()
+    assert clock.monotonic() == 101.5
+
+
+def test_wait_forever_without_event(clock, waiter):
+    """Verify waiting forever with nothing scheduled is an error."""
+    with pytest.raises(RuntimeError):
+        clock.wait(waiter, None)
+
+
+def test_virtual_alarm(clock):
+    """Verify the alarm rings on virtual time without a thread."""
+    alarm = AlarmScheduler(clock)
+    bells: list[float] = []
+    done: list[float] = []
+
+    alarm.start(
+        2,
+        0.5,
+        1.5,
+        bell=lambda: bells.append(clock.monotonic()),
+        on_done=lambda: done.append(clock.monotonic()),
+    )
+    assert alarm.active
+
+    clock.advance(10.0)
+
+    assert bells == [100.0, 100.5, 102.0, 102.5]
+    assert done == [104.0]
+    assert not alarm.active
+    assert alarm._thread is None
+
+
+def test_virtual_alarm_stop(clock):
+    """Verify stop cancels the remaining bells."""
+    alarm = AlarmScheduler(clock)
+    bells: list[float] = []
+    done: list[float] = []
+
+    alarm.start(
+        999,
+        0.5,
+        1.5,
+        bell=lambda: bells.append(clock.monotonic()),
+        on_done=lambda: done.append(clock.monotonic()),
+    )
+    clock.advance(1.0)
+    assert alarm.stop() == 0.0
+
+    clock.advance(100.0)
+    assert bells == [100.0, 100.5]
+    assert done == []
@@ -0,0 +1,141 @@
+import io
+import json
+import os
+
+import pytest
+from click.testing import CliRunner
+
+from tmr.__main__ import ctl
+from tmr.base_timer import BaseTimer
+from tmr.clock import VirtualClock
+from tmr.control import (
+    COMMANDS,
+    ControlSocket,
+    send,
+    socket_paths,
+    socket_pid,
+)
+from tmr.stream import EventStream
+
+
+@pytest.fixture
+def ctl_sock(tmp_path):
+    sock = ControlSocket(directory=str(tmp_path))
+    yield sock
+    sock.close()
+
+
+def test_send_recv(ctl_sock):
+    """Verify commands are received in order without waiting"""
+    assert ctl_sock.recv_all() == []
+    send(ctl_sock.path, ["pause", " forward1\n", ""])
+    assert ctl_sock.recv_all() == ["pause", "forward1"]
+    assert ctl_sock.recv_all() == []
+
+
+def test_close(tmp_path):
+    sock = ControlSocket("a", str(tmp_path))
+    assert os.path.basename(sock.path) == f"{os.getpid()}-a.sock"
+    sock.close()
+    assert not os.path.exists(sock.path)
+    with pytest.raises(FileNotFoundError):
+        send(sock.path, ["quit"])
+
+
+def test_socket_paths(tmp_path, ctl_sock):
+    """Verify sockets of dead processes are removed"""
+    stale = tmp_path / f"{0x7FFFFFFF}.sock"
+    stale.touch()
+    assert socket_paths(str(tmp_path)) == [ctl_sock.path]
+    assert not stale.exists()
+
+
+@pytest.mark.parametrize("name", ["x.sock", "0.sock", "-1-tea.sock"])
+def test_socket_paths_malformed(tmp_path, ctl_sock, name):
+    """Verify a socket without a valid pid is not taken as running"""
+    malformed = tmp_path / name
+    malformed.touch()
+    assert socket_paths(str(tmp_path)) == [ctl_sock.path]
+    assert not malformed.exists()
+
+
+@pytest.mark.parametrize(
+    "name, expected",
+    [("123.sock", 123), ("123-tea.sock", 123), ("x.sock", -1)],
+)
+def test_socket_pid(name, expected):
+    assert socket_pid(f"/run/tmr/{name}") == expected
+
+
+def test_base_timer_control(ctl_sock):
+    """Verify commands from the socket are run like keys"""
+    clock = VirtualClock()
+    out = io.StringIO()
+    timer = BaseTimer(
+        ("Tea", "white"),
+        60.0,
+        clock=clock,
+        stream=EventStream("json", tick=100.0, out=out),
+        control=ctl_sock,
+    )
+    # 仮想時刻 5秒で、進める x2 とポーズ、10秒で終了
+    clock.call_at(
+        5.0, lambda: send(ctl_sock.path, ["forward10", "forward1", "pause"])
+    )
+    clock.call_at(10.0, lambda: send(ctl_sock.path, ["nothing", "quit"]))
+
+    assert timer.main() is True
+
+    events = [json.loads(x) for x in out.getvalue().splitlines()]
+    assert [e["event"] for e in events] == [
+        "start",
+        "seek",  # 連続する seek はまとめる
+        "pause",
+        "end",
+    ]
+    assert events[1]["offset"] == pytest.approx(11.0)
+    assert events[2]["elapsed"] == pytest.approx(16.0, abs=0.01)
+    assert events[3]["reason"] == "quit"
+
+
+def test_cli_ctl(tmp_path, monkeypatch):
+    monkeypatch.setenv("TMR_STATUS_DIR", str(tmp_path))
+    runner = CliRunner()
+
+    result = runner.invoke(ctl, ["quit"])
+    assert result.exit_code == 1
+    assert "no running timer" in result.output
+
+    with ControlSocket("a", str(tmp_path)) as a:
+        result = runner.invoke(ctl, ["pause", "quit"])
+        assert result.exit_code == 0
+        assert a.recv_all() == ["pause", "quit"]
+
+        with ControlSocket("b", str(tmp_path)) as b:
+            result = runner.invoke(ctl, ["quit"])
+            assert result.exit_code == 2  # どれに送るか分からない
+
+            result = runner.invoke(ctl, ["--all", "next"])
+            assert result.exit_code == 0
+            assert a.recv_all() == b.recv_all() == ["next"]
+
+            result = runner.invoke(ctl, ["--pid", "1", "next"])
+            assert result.exit_code == 1
+
+
+def test_cli_ctl_unknown(tmp_path, monkeypatch):
+    """Verify unknown commands are rejected before sending."""
+    monkeypatch.setenv("TMR_STATUS_DIR", str(tmp_path))
+    runner = CliRunner()
+
+    with ControlSocket("a", str(tmp_path)) as a:
+        result = runner.invoke(ctl, ["pause", "nothing"])
+        assert result.exit_code == 2
+        assert "'nothing'" in result.output
+        assert a.recv_all() == []
+
+
+def test_commands():
+    """Verify COMMANDS are the names of the timer commands."""
+    timer = BaseTimer()
+    assert set(COMMANDS) == {cmd.name for cmd in timer.cmd}
@@ -0,0 +1,109 @@
+#
+# (c) 2026 Yoichi Tanibayashi
+#
+import pytest
+
+from tmr.core import Snapshot, TimerCore
+
+
+@pytest.fixture
+def core():
+    c = TimerCore(60.0)
+    c.start(100.0)
+    return c
+
+
+def test_init():
+    """Verify a new core is stopped."""
+    c = TimerCore(60.0)
+    assert c.snapshot() == Snapshot(0.0, 60.0, False, False, False)
+    # 止まっている間は進まない
+    assert c.tick(1000.0).elapsed == 0.0
+
+
+def test_start_t_start():
+    """Verify start with a past t_start begins already elapsed."""
+    c = TimerCore(60.0)
+    c.start(100.0, t_start=90.0)
+    assert c.tick(100.0).elapsed == 10.0
+
+
+def test_tick(core):
+    """Verify tick returns the state at now."""
+    snap = core.tick(112.5)
+    assert snap == Snapshot(12.5, 47.5, True, False, False)
+
+
+def test_timeup(core):
+    """Verify tick stops at the limit."""
+    assert core.tick(159.9).timeup is False
+    snap = core.tick(170.0)
+    assert snap == Snapshot(60.0, 0.0, False, False, True)
+    # 満了した後は進まない
+    assert core.tick(200.0) == snap
+
+
+def test_pause(core):
+    """Verify paused time is not counted."""
+    core.tick(110.0)
+    assert core.toggle_pause(110.0) is True
+    assert core.tick(150.0).elapsed == 10.0
+    # ポーズ中は満了しない
+    assert core.tick(500.0).timeup is False
+
+    assert core.toggle_pause(500.0) is False
+    assert core.tick(505.0).elapsed == 15.0
+
+
+def test_pause_without_tick(core):
+    """Verify pausing takes the elapsed time at now."""
+    core.set_paused(True, 120.0)
+    assert core.elapsed == 20.0
+    core.set_paused(True, 130.0)  # 変化なし
+    assert core.elapsed == 20.0
+
+
+@pytest.mark.parametrize(
+    "secs, elapsed, offset",
+    [
+        ([5.0], 15.0, 5.0),
+        ([-5.0], 5.0, -5.0),
+        ([-30.0, 5.0], 5.0, -5.0),  # 0 で止まってから進む
+        ([100.0, -10.0], 50.0, 40.0),  # limit で止まってから戻る
+    ],
+)
+def test_seek(core, secs, elapsed, offset):
+    """Verify seek clamps each step and returns the offset."""
+    assert core.seek(110.0, secs) == pytest.approx(offset)
+    assert core.tick(110.0).elapsed == pytest.approx(elapsed)
+
+
+def test_seek_paused(core):
+    """Verify seek while paused moves the frozen elapsed time."""
+    core.set_paused(True, 110.0)
+    core.seek(150.0, [5.0])
+    assert core.tick(200.0).elapsed == 15.0
+    core.set_paused(False, 200.0)
+    assert core.tick(201.0).elapsed == 16.0
+
+
+def test_totals(core):
+    """Verify the paused and seeked times are summed."""
+    core.set_paused(True, 110.0)
+    core.set_paused(False, 130.0)
+    core.seek(140.0, [10.0, 5.0])
+    core.seek(150.0, [-3.0])
+    core.set_paused(True, 160.0)
+    core.stop(165.0)  # ポーズ中に止めた
+    assert core.paused_sec == 25.0
+    assert core.seek_sec == 12.0
+
+    core.start(200.0)
+    assert (core.paused_sec, core.seek_sec) == (0.0, 0.0)
+
+
+def test_slots(core):
+    """Verify a core has no __dict__ (many cores in one process)."""
+    assert not hasattr(core, "__dict__")
+    with pytest.raises(AttributeError):
+        core.foo = 1
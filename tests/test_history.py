@@ -0,0 +1,216 @@
+#
+# (c) 2026 Yoichi Tanibayashi
+#
+import json
+import os
+import time
+from unittest import mock
+
+import pytest
+from click.testing import CliRunner
+
+from tmr.__main__ import history_stats
+from tmr.history import (
+    ENV_HISTORY_DIR,
+    HEADER,
+    RECORD,
+    History,
+    PhaseRecord,
+    Totals,
+    history_dir,
+)
+
+# 2026-10-18 (日) 12:00 (ローカル時刻)
+T_NOON = time.mktime((2026, 10, 18, 12, 0, 0, 0, 0, -1))
+DAY = 24 * 3600.0
+
+
+def mk_rec(
+    t_start: float,
+    phase: str = "WORK",
+    elapsed: float = 1500.0,
+    result: str = "completed",
+) -> PhaseRecord:
+    return PhaseRecord(
+        t_start=t_start,
+        t_end=t_start + elapsed,
+        limit=1500.0,
+        elapsed=elapsed,
+        paused=0.0,
+        seek=0.0,
+        cycle=1,
+        phase=phase,
+        result=result,
+    )
+
+
+@pytest.fixture
+def history(tmp_path):
+    return History(str(tmp_path / "tmr"))
+
+
+def test_history_dir(monkeypatch):
+    monkeypatch.setenv(ENV_HISTORY_DIR, "/x/tmr")
+    assert history_dir() == "/x/tmr"
+    monkeypatch.delenv(ENV_HISTORY_DIR)
+    monkeypatch.setenv("XDG_DATA_HOME", "/data")
+    assert history_dir() == "/data/tmr"
+    monkeypatch.delenv("XDG_DATA_HOME")
+    assert history_dir().endswith("/.local/share/tmr")
+
+
+def test_append_records(history):
+    """Verify records round-trip through the log."""
+    assert history.records() == ([], HEADER.size)
+
+    recs = [
+        mk_rec(T_NOON),
+        PhaseRecord(
+            T_NOON,
+            T_NOON + 400.0,
+            300.0,
+            280.0,
+            90.0,
+            -10.0,
+            2,
+            "SHORT_BREAK",
+            "skipped",
+        ),
+    ]
+    for rec in recs:
+        history.append(rec)
+
+    assert os.path.getsize(history.log_path) == HEADER.size + 2 * RECORD.size
+    assert history.records() == (recs, HEADER.size + 2 * RECORD.size)
+    # 途中から読む
+    assert history.records(HEADER.size + RECORD.size)[0] == recs[1:]
+
+
+def test_partial_record(history):
+    """Verify a record being written is not read."""
+    history.append(mk_rec(T_NOON))
+    with open(history.log_path, "ab") as f:
+        f.write(mk_rec(T_NOON + 1).pack()[:10])
+
+    recs, offset = history.records()
+    assert len(recs) == 1
+    assert offset == HEADER.size + RECORD.size
+
+
+def test_not_a_log(history):
+    os.makedirs(history.directory)
+    with open(history.log_path, "wb") as f:
+        f.write(b"something else")
+    with pytest.raises(ValueError):
+        history.records()
+
+
+def test_totals():
+    totals = Totals()
+    totals.add(mk_rec(T_NOON))
+    totals.add(mk_rec(T_NOON, "WORK", 600.0, "skipped"))
+    totals.add(mk_rec(T_NOON, "SHORT_BREAK", 300.0))
+    totals.add(mk_rec(T_NOON, "LONG_BREAK", 100.0, "quit"))
+    assert totals == Totals(2100.0, 400.0, 1, 1, 1)
+
+
+def test_rollup(history):
+    """Verify the totals of each day, week and month."""
+    # 10/18 (日) は第42週、10/19 (月) から第43週
+    history.append(mk_rec(T_NOON))
+    history.append(mk_rec(T_NOON + 3600, "SHORT_BREAK", 300.0))
+    history.append(mk_rec(T_NOON + DAY))
+    history.append(mk_rec(T_NOON + 14 * DAY, result="quit", elapsed=60.0))
+
+    assert history.rollup("day") == {
+        "2026-10-18": Totals(1500.0, 300.0, 1, 0, 0),
+        "2026-10-19": Totals(1500.0, 0.0, 1, 0, 0),
+        "2026-11-01": Totals(60.0, 0.0, 0, 0, 1),
+    }
+    assert history.rollup("week") == {
+        "2026-W42": Totals(1500.0, 300.0, 1, 0, 0),
+        "2026-W43": Totals(1500.0, 0.0, 1, 0, 0),
+        "2026-W44": Totals(60.0, 0.0, 0, 0, 1),
+    }
+    assert history.rollup("day", last=1) == {
+        "2026-11-01": Totals(60.0, 0.0, 0, 0, 1),
+    }
+    assert history.rollup("month") == {
+        "2026-10": Totals(3000.0, 300.0, 2, 0, 0),
+        "2026-11": Totals(60.0, 0.0, 0, 0, 1),
+    }
+
+
+def test_rollup_incremental(history):
+    """Verify only the new records are read on the next rollup."""
+    for i in range(100):
+        history.append(mk_rec(T_NOON + i * 60))
+    assert history.rollup()["2026-10-18"].pomodoros == 100
+
+    history.append(mk_rec(T_NOON + 7000))
+    with mock.patch.object(
+        History, "records", wraps=history.records
+    ) as records:
+        totals = history.rollup()
+    # 前回の続きから読む
+    records.assert_called_once_with(HEADER.size + 100 * RECORD.size)
+    assert totals["2026-10-18"].pomodoros == 101
+
+    # 新しい記録がなければ、インデックスを書き直さない
+    mtime = os.stat(history.index_path).st_mtime_ns
+    history.rollup()
+    assert os.stat(history.index_path).st_mtime_ns == mtime
+
+
+def test_rollup_rebuild(history):
+    """Verify a broken index or a new log rebuilds the index."""
+    history.append(mk_rec(T_NOON))
+    history.append(mk_rec(T_NOON))
+    assert history.rollup()["2026-10-18"].pomodoros == 2
+
+    with open(history.index_path, "w") as f:
+        f.write("{broken")
+    assert history.rollup()["2026-10-18"].pomodoros == 2
+
+    os.unlink(history.log_path)  # 作り直した
+    history.append(mk_rec(T_NOON))
+    assert history.rollup()["2026-10-18"].pomodoros == 1
+
+
+def test_cli_stats(tmp_path, monkeypatch):
+    monkeypatch.setenv(ENV_HISTORY_DIR, str(tmp_path))
+    runner = CliRunner()
+
+    # 記録がない
+    result = runner.invoke(history_stats, [])
+    assert result.exit_code == 1
+    assert result.output == ""
+
+    history = History()
+    for i in range(10):
+        history.append(mk_rec(T_NOON + i * DAY))
+    history.append(mk_rec(T_NOON, "SHORT_BREAK", 300.0, "skipped"))
+
+    result = runner.invoke(history_stats, [])
+    assert result.exit_code == 0
+    lines = result.output.splitlines()
+    assert len(lines) == 7  # --last の既定値
+    assert lines[-1].startswith("2026-10-27 work 25m00s break  0m00s")
+
+    result = runner.invoke(history_stats, ["--by", "month", "-f", "json"])
+    assert json.loads(result.output) == {
+        "2026-10": {
+            "work": 15000.0,
+            "rest": 300.0,
+            "pomodoros": 10,
+            "skipped": 1,
+            "quit": 0,
+        }
+    }
+
+    result = runner.invoke(history_stats, ["--by", "week", "-n", "0"])
+    assert [x.split()[0] for x in result.output.splitlines()] == [
+        "2026-W42",
+        "2026-W43",
+        "2026-W44",
+    ]
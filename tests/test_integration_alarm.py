@@ -1,56 +1,60 @@
 #
 # (c) 2026 Yoichi Tanibayashi
 #
+import threading
 import time
 from unittest.mock import patch
 
+from tmr.alarm import AlarmScheduler
 from tmr.base_timer import BaseTimer
 
 
-def test_alarm_thread_lifecycle():
+def test_alarm_lifecycle():
     """
-    Integration test to verify the alarm thread starts and can be stopped.
+    Integration test to verify the alarm starts and can be stopped.
     This test uses short durations to avoid long waits.
     """
     # Use small alarm parameters
     alarm_params = (10, 0.01, 0.01)  # 10 times, total ~0.2s
 
-    with patch("tmr.base_timer.click.echo") as mock_echo:
+    with patch("tmr.base_timer.TtyWriter") as mock_writer:
+        mock_echo = mock_writer.return_value.write
         timer = BaseTimer(alarm_params=alarm_params)
+        timer.alarm = AlarmScheduler()
         timer.alarm_active = True
 
         # Start alarm
-        thr = timer.ring_alarm()
-        assert thr is not None
-        assert thr.is_alive()
+        assert timer.ring_alarm() is True
+        assert timer.alarm.active
 
         # Give it a tiny bit of time to run at least one loop
         time.sleep(0.05)
         assert mock_echo.called
 
-        # Stop alarm manually
-        timer.alarm_active = False
+        # Stop alarm: returns as soon as the bell stops
+        latency = timer.alarm.stop()
+        assert latency < 0.1
+        assert not timer.alarm.active
 
-        # Wait for thread to finish (should stop quickly due to flag check)
-        thr.join(timeout=1.0)
-        assert not thr.is_alive()
 
-
-def test_alarm_thread_completes():
+def test_alarm_completes():
     """
-    Verify the alarm thread completes naturally after count is reached.
+    Verify the alarm completes naturally after count is reached.
     """
     alarm_params = (2, 0.01, 0.01)
 
-    with patch("tmr.base_timer.click.echo") as mock_echo:
+    with patch("tmr.base_timer.TtyWriter") as mock_writer:
+        mock_echo = mock_writer.return_value.write
         timer = BaseTimer(alarm_params=alarm_params)
+        timer.alarm = AlarmScheduler()
         timer.alarm_active = True
 
-        thr = timer.ring_alarm()
-        assert thr is not None
+        done = threading.Event()
+        with patch.object(timer.waiter, "wake", side_effect=done.set):
+            assert timer.ring_alarm() is True
+            assert done.wait(timeout=1.0)
 
-        thr.join(timeout=1.0)
-        assert not thr.is_alive()
         assert timer.alarm_active is False
+        assert not timer.alarm.active
         # Expected calls: 2 * 2 (beep \a) = 4
-        assert mock_echo.call_count >= 2
+        assert mock_echo.call_count == 4
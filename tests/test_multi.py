@@ -0,0 +1,228 @@
+import io
+import time
+from unittest import mock
+
+import pytest
+from click.testing import CliRunner
+from fake_term import FakeTerm
+
+from tmr.__main__ import multi
+from tmr.clock import VirtualClock
+from tmr.multi import MultiTimer, parse_spec
+from tmr.tty_writer import TtyWriter
+
+
+def new_multi(n: int, keys=(), height: int = 5, sec: float = 60.0):
+    """MultiTimer of n timers on virtual time."""
+    clock = VirtualClock()
+    term = FakeTerm(clock, list(keys), height=height)
+    with mock.patch("tmr.multi.Terminal", return_value=term):
+        mt = MultiTimer(
+            [(f"t{i}", sec * (i + 1)) for i in range(n)],
+            clock=clock,
+            spinner=False,
+        )
+    mt.out = TtyWriter(stream=io.StringIO())
+    for row in mt.rows:
+        row.out = TtyWriter(stream=io.StringIO())
+    return mt, clock
+
+
+@pytest.mark.parametrize(
+    "spec, expected",
+    [
+        ("3", ("3m", 180.0)),
+        ("0.5:Tea", ("Tea", 30.0)),
+        ("25:Build: all", ("Build: all", 1500.0)),
+    ],
+)
+def test_parse_spec(spec, expected):
+    assert parse_spec(spec) == expected
+
+
+@pytest.mark.parametrize("spec", ["x:Tea", "-1:Tea", "", "0", "0:tea"])
+def test_parse_spec_error(spec):
+    with pytest.raises(ValueError):
+        parse_spec(spec)
+
+
+def test_no_timers():
+    with pytest.raises(ValueError):
+        MultiTimer([])
+
+
+def test_titles_aligned():
+    term = FakeTerm(VirtualClock(), [], height=5)
+    with mock.patch("tmr.multi.Terminal", return_value=term):
+        mt = MultiTimer([("Tea", 60.0), ("Build", 60.0)])
+    assert [r.col["title"].value for r in mt.rows] == ["Tea  ", "Build"]
+
+
+def test_display_only_changed_rows():
+    """Verify only visible rows that changed are redrawn"""
+    # 4 行だけ見える。%表示などが1秒以内に変わらないよう、長いタイマーにする
+    mt, clock = new_multi(10, height=5, sec=3600.0)
+    for row in mt.rows:
+        row.is_active = True
+    mt.redraw()
+
+    mt.display()
+    assert mt.frames == 4
+
+    # 0.5秒後: 秒の表示は変わらないので、描画しない
+    clock.t += 0.5
+    mt.display()
+    assert mt.frames == 4
+
+    # 1秒後: 全ての行の経過時間が変わる
+    clock.t += 0.51
+    mt.display()
+    assert mt.frames == 8
+
+    # 画面の外の行も、時間は進む
+    assert mt.rows[9].t_elapsed == pytest.approx(1.01)
+
+
+def test_next_timeout():
+    """Verify the loop sleeps until the next change"""
+    mt, _ = new_multi(10, height=5, sec=3600.0)
+    for row in mt.rows:
+        row.is_active = True
+    mt.redraw()
+    mt.display()
+
+    timeout = mt.next_timeout()
+    assert timeout is not None
+    assert 0.9 < timeout <= 1.0 + 0.01
+
+
+def test_select_scroll():
+    """Verify the selection scrolls the screen"""
+    mt, _ = new_multi(10, height=5)
+    mt.dispatch(["J"] * 5)
+    assert (mt.selected, mt.top) == (5, 2)
+    mt.dispatch(["KEY_UP"] * 4)
+    assert (mt.selected, mt.top) == (1, 1)
+    mt.dispatch(["K"] * 3)
+    assert (mt.selected, mt.top) == (0, 0)
+    mt.dispatch(["KEY_DOWN"] * 20)
+    assert (mt.selected, mt.top) == (9, 6)
+
+
+def test_row_commands():
+    """Verify keys go to the selected row"""
+    mt, _ = new_multi(3)
+    for row in mt.rows:
+        row.is_active = True
+
+    mt.dispatch(["J", " ", "KEY_CTRL_N"])
+    assert [r.is_paused for r in mt.rows] == [False, True, False]
+    assert mt.rows[1].t_elapsed == pytest.approx(10.0)
+
+    # 終了などは、行には送らない
+    mt.dispatch(["N", "?"])
+    assert all(r.is_active for r in mt.rows)
+
+
+def test_main():
+    """Verify a whole run with time up and quit"""
+    keys = [
+        (30.0, "J"),
+        (30.0, " "),  # 2つ目をポーズ
+        (70.0, "K"),
+        (70.0, " "),  # 満了した1つ目のアラームを止める
+        (100.0, "Q"),
+    ]
+    mt, clock = new_multi(3, keys, sec=60.0)
+
+    mt.main()
+
+    r0, r1, r2 = mt.rows
+    # 1つ目は満了し、スペースでアラームを止めた
+    assert r0.is_active is False
+    assert r0.t_elapsed == 60.0
+    assert r0.alarm_active is False
+    # 2つ目は 30秒でポーズして、そのまま
+    assert r1.is_paused
+    assert r1.t_elapsed == pytest.approx(30.0, abs=0.01)
+    # 3つ目は動き続けた
+    assert r2.is_active
+    assert r2.t_elapsed == pytest.approx(100.0, abs=0.01)
+    assert clock.monotonic() == pytest.approx(100.0)
+
+
+def test_cli_multi(tmp_path):
+    runner = CliRunner()
+    spec_file = tmp_path / "timers.txt"
+    spec_file.write_text("3:Tea\n\n25:Build\n")
+
+    with mock.patch("tmr.multi.MultiTimer") as MockMulti:
+        result = runner.invoke(multi, ["1", "-f", str(spec_file)])
+        assert result.exit_code == 0
+        assert MockMulti.call_args[0][0] == [
+            ("1m", 60.0),
+            ("Tea", 180.0),
+            ("Build", 1500.0),
+        ]
+        assert MockMulti.call_args[0][1] == (3, 0.5, 1.5)
+        MockMulti.return_value.main.assert_called_once()
+
+        result = runner.invoke(multi, ["1", "--s1", "0.2", "--s2", "1"])
+        assert MockMulti.call_args[0][1] == (3, 0.2, 1.0)
+
+        result = runner.invoke(multi, [])
+        assert result.exit_code == 2
+
+        result = runner.invoke(multi, ["x"])
+        assert result.exit_code == 2
+
+
+def test_overlapping_alarms():
+    """Verify rows that time up together each ring to the end"""
+    mt, clock = new_multi(2, sec=60.0)
+    bells = []
+    for i, row in enumerate(mt.rows):
+        row.alarm_params = (2, 0.5, 1.5)
+        row.bell = lambda i=i: bells.append((i, clock.monotonic()))
+        row.core.start(0.0)
+
+    # 2つ目 (120秒) は 59秒前に始めたことにして、1つ目が鳴る間に満了させる
+    mt.rows[1].core.start(0.0, -59.0)
+    for t in (60.0, 61.0, 70.0):
+        clock.advance(t - clock.monotonic())
+        mt.display()
+
+    assert [b for b in bells if b[0] == 0] == [
+        (0, 60.0),
+        (0, 60.5),
+        (0, 62.0),
+        (0, 62.5),
+    ]
+    assert [b[1] for b in bells if b[0] == 1] == [61.0, 61.5, 63.0, 63.5]
+    assert not any(row.alarm_active for row in mt.rows)
+
+
+def test_overlapping_alarms_real_clock():
+    """Verify overlapping alarms with the shared alarm thread"""
+    with mock.patch(
+        "tmr.multi.Terminal",
+        return_value=FakeTerm(VirtualClock(), [], height=5),
+    ):
+        mt = MultiTimer(
+            [("a", 0.05), ("b", 0.08)], alarm_params=(2, 0.02, 0.02)
+        )
+    mt.out = TtyWriter(stream=io.StringIO())
+    outs = [io.StringIO() for _ in mt.rows]
+    for row, out in zip(mt.rows, outs):
+        row.out = TtyWriter(stream=out)  # ベルは row.out に書く
+        row.core.start(mt.clock.monotonic())
+
+    t_end = time.monotonic() + 2.0
+    while time.monotonic() < t_end:
+        mt.display()
+        if not any(r.alarm_active or r.is_active for r in mt.rows):
+            break
+        time.sleep(0.005)
+
+    assert [out.getvalue().count("\a") for out in outs] == [4, 4]
+    assert not any(row.alarm_active for row in mt.rows)
@@ -1,9 +1,19 @@
+import io
+import json
+import time
 from unittest import mock
 
+import pytest
 from click.testing import CliRunner
+from fake_term import FakeTerm
 
 from tmr.__main__ import pomodoro
+from tmr.base_timer import BaseTimer
+from tmr.clock import VirtualClock
+from tmr.history import History
 from tmr.pomodoro import PomodoroConfig, PomodoroTimer
+from tmr.stream import EventStream
+from tmr.tty_writer import TtyWriter
 
 
 def test_pomodoro_args():
@@ -54,7 +64,7 @@ def test_pomodoro_cli_exec():
     """Verify CLI command invokes PomodoroTimer correctly"""
     runner = CliRunner()
 
-    with mock.patch("tmr.__main__.PomodoroTimer") as MockTimer:
+    with mock.patch("tmr.pomodoro.PomodoroTimer") as MockTimer:
         instance = MockTimer.return_value
         instance.run.return_value = True  # Simulate quit
 
@@ -70,6 +80,9 @@ def test_pomodoro_cli_exec():
         config_arg = MockTimer.call_args[0][0]
         assert isinstance(config_arg, PomodoroConfig)
         assert config_arg.cycles == 2
+        assert config_arg.fps == 5.0
+        assert config_arg.spinner is True
+        assert config_arg.anchored is False
         # Verify run called
         instance.run.assert_called_once()
 
@@ -144,3 +157,264 @@ def test_pomodoro_timer_run_timer():
         assert args[0][1] == 10.0
         assert args[1]["enable_next"] is True
         instance.main.assert_called_once()
+
+
+def test_pomodoro_timer_reuses_base_timer():
+    """Verify phases after the first reuse one BaseTimer via reset()"""
+    config = PomodoroConfig(
+        work_sec=0.1,
+        break_sec=0.1,
+        long_break_sec=0.1,
+        cycles=1,
+    )
+    timer = PomodoroTimer(config)
+
+    with mock.patch("tmr.pomodoro.BaseTimer") as MockTimer:
+        instance = MockTimer.return_value
+        instance.main.return_value = False
+
+        timer._run_timer("WORK", 10.0, "cyan")
+        timer._run_timer("BREAK", 5.0, "yellow")
+
+        MockTimer.assert_called_once()
+        instance.reset.assert_called_once_with(("BREAK", "yellow"), 5.0)
+        assert instance.main.call_count == 2
+
+
+def test_pomodoro_timer_anchored():
+    """Verify anchored phases start on the precomputed schedule"""
+    config = PomodoroConfig(
+        work_sec=10.0,
+        break_sec=2.0,
+        long_break_sec=5.0,
+        cycles=2,
+        anchored=True,
+    )
+    timer = PomodoroTimer(config, clock=VirtualClock(100.0))
+
+    with mock.patch.object(timer, "_run_timer") as mock_run_timer:
+        mock_run_timer.side_effect = [False, False, False, True]
+        assert timer.run() is True
+
+    t_plans = [c.args[3] for c in mock_run_timer.call_args_list]
+    assert t_plans == [100.0, 110.0, 112.0, 122.0]
+
+
+def test_pomodoro_timer_not_anchored():
+    """Verify phases have no schedule unless anchored"""
+    config = PomodoroConfig(
+        work_sec=10.0,
+        break_sec=2.0,
+        long_break_sec=5.0,
+        cycles=1,
+    )
+    timer = PomodoroTimer(config)
+
+    with mock.patch.object(timer, "_run_timer") as mock_run_timer:
+        mock_run_timer.side_effect = [False, True]
+        timer.run()
+
+    assert all(c.args[3] is None for c in mock_run_timer.call_args_list)
+
+
+@pytest.mark.parametrize(
+    "t_now, expected_offset, expected_start, expected_limit",
+    [
+        (103.0, 3.0, 100.0, 10.0),  # 遅れ: 予定開始時刻から数える
+        (98.0, -2.0, 98.0, 12.0),  # 進み: 予定終了時刻まで延ばす
+    ],
+)
+def test_pomodoro_run_timer_anchored(
+    t_now, expected_offset, expected_start, expected_limit
+):
+    """Verify an anchored phase ends at its planned deadline"""
+    config = PomodoroConfig(
+        work_sec=10.0,
+        break_sec=2.0,
+        long_break_sec=5.0,
+        cycles=1,
+        anchored=True,
+    )
+    timer = PomodoroTimer(config, clock=VirtualClock(t_now))
+
+    with mock.patch("tmr.pomodoro.BaseTimer") as MockTimer:
+        MockTimer.return_value.main.return_value = False
+        timer._run_timer("WORK", 10.0, "cyan", 100.0)
+
+    assert timer.offset == expected_offset
+    title, limit = MockTimer.call_args[0][:2]
+    assert title == (f"WORK {expected_offset:+.0f}s", "cyan")
+    assert limit == expected_limit
+    MockTimer.return_value.main.assert_called_once_with(
+        t_start=expected_start
+    )
+
+
+def test_pomodoro_session_virtual_clock():
+    """Verify a whole 25/5/15 x 4 session runs on virtual time"""
+    config = PomodoroConfig(
+        work_sec=25 * 60.0,
+        break_sec=5 * 60.0,
+        long_break_sec=15 * 60.0,
+        cycles=4,
+        spinner=False,
+    )
+    clock = VirtualClock()
+
+    # 最初のフェーズで10秒進め、各フェーズの終了の1秒後にアラームを止める。
+    # 最後のアラームは quit で止める。
+    keys = [(10.0, "J")]
+    expected_starts = []
+    t_start = 0.0
+    for i, (title, sec, _) in enumerate(PomodoroTimer(config).phases()):
+        expected_starts.append((title.strip(), t_start))
+        t_end = t_start + sec - (10.0 if i == 0 else 0.0)
+        t_start = t_end + 1.0
+        keys.append((t_start, " "))
+    keys[-1] = (t_start, "q")
+
+    term = FakeTerm(clock, keys)
+    out = io.StringIO()
+
+    starts = []
+    orig_main_loop = BaseTimer.main_loop
+
+    def main_loop(self, t_start=None):
+        starts.append((self.col["title"].value.strip(), clock.monotonic()))
+        return orig_main_loop(self, t_start)
+
+    t0 = time.monotonic()
+    with (
+        mock.patch("tmr.base_timer.Terminal", return_value=term),
+        mock.patch(
+            "tmr.base_timer.TtyWriter",
+            side_effect=lambda: TtyWriter(stream=out),
+        ),
+        mock.patch.object(BaseTimer, "main_loop", main_loop),
+    ):
+        assert PomodoroTimer(config, clock=clock).run() is True
+    t_real = time.monotonic() - t0
+
+    assert [n for n, _ in starts] == [n for n, _ in expected_starts]
+    assert [t for _, t in starts] == pytest.approx(
+        [t for _, t in expected_starts], abs=0.1
+    )
+    assert clock.monotonic() == pytest.approx(t_start)
+    assert out.getvalue().count("\a") >= len(expected_starts)
+    assert t_real < 5.0  # 実際には 2時間以上待たない
+
+
+def test_pomodoro_stream():
+    """Verify phase events are written before each phase"""
+    config = PomodoroConfig(
+        work_sec=60.0, break_sec=30.0, long_break_sec=90.0, cycles=1
+    )
+    clock = VirtualClock()
+    term = FakeTerm(clock, [(100.0, "Q")])
+    out = io.StringIO()
+    stream = EventStream("json", tick=60.0, out=out)
+
+    with mock.patch("tmr.base_timer.Terminal", return_value=term):
+        assert PomodoroTimer(config, clock=clock, stream=stream).run()
+
+    events = [json.loads(x) for x in out.getvalue().splitlines()]
+    phases = [e for e in events if e["event"] == "phase"]
+    assert [(e["phase"], e["title"], e["limit"]) for e in phases] == [
+        (0, "WORK", 60.0),
+        (1, "LONG_BREAK", 90.0),
+    ]
+    assert [e["event"] for e in events] == [
+        "phase",
+        "start",
+        "tick",  # tick=60 と満了が同時
+        "alarm",
+        "end",
+        "phase",
+        "start",
+        "end",
+    ]
+    assert [e["reason"] for e in events if e["event"] == "end"] == [
+        "timeup",
+        "quit",
+    ]
+
+
+def test_pomodoro_history(tmp_path):
+    """Verify each phase is recorded with its result and totals"""
+    config = PomodoroConfig(
+        work_sec=60.0, break_sec=30.0, long_break_sec=90.0, cycles=1
+    )
+    clock = VirtualClock()
+    keys = [
+        (10.0, " "),  # 10秒ポーズ
+        (20.0, " "),
+        (25.0, "L"),  # 1秒進める -> 69秒で満了
+        (70.0, " "),  # アラームを止める
+        (80.0, "N"),  # LONG_BREAK を飛ばす
+        (90.0, "Q"),
+    ]
+    term = FakeTerm(clock, keys)
+    history = History(str(tmp_path))
+
+    with (
+        mock.patch("tmr.base_timer.Terminal", return_value=term),
+        mock.patch(
+            "tmr.base_timer.TtyWriter",
+            side_effect=lambda: TtyWriter(stream=io.StringIO()),
+        ),
+    ):
+        timer = PomodoroTimer(config, clock=clock, history=history)
+        assert timer.run() is True
+
+    recs, _ = history.records()
+    assert [(r.cycle, r.phase, r.result) for r in recs] == [
+        (1, "WORK", "completed"),
+        (1, "LONG_BREAK", "skipped"),
+        (2, "WORK", "quit"),
+    ]
+    work = recs[0]
+    assert (work.limit, work.elapsed) == (60.0, 60.0)
+    assert work.paused == pytest.approx(10.0, abs=0.01)
+    assert work.seek == pytest.approx(1.0)
+    assert work.t_end - work.t_start == pytest.approx(70.0, abs=0.1)
+    assert recs[1].elapsed == pytest.approx(10.0, abs=0.01)
+    assert recs[2].t_start == pytest.approx(clock.DEF_WALL + 80.0, abs=0.1)
+
+
+def test_pomodoro_history_quit_in_alarm(tmp_path):
+    """Verify a phase quit during its alarm is recorded as completed"""
+    config = PomodoroConfig(
+        work_sec=60.0, break_sec=30.0, long_break_sec=90.0, cycles=1
+    )
+    clock = VirtualClock()
+    term = FakeTerm(clock, [(61.0, "Q")])  # アラーム中に quit
+    history = History(str(tmp_path))
+
+    with (
+        mock.patch("tmr.base_timer.Terminal", return_value=term),
+        mock.patch(
+            "tmr.base_timer.TtyWriter",
+            side_effect=lambda: TtyWriter(stream=io.StringIO()),
+        ),
+    ):
+        timer = PomodoroTimer(config, clock=clock, history=history)
+        assert timer.run() is True
+
+    recs, _ = history.records()
+    assert [(r.phase, r.result) for r in recs] == [("WORK", "completed")]
+    assert [t.pomodoros for t in history.rollup().values()] == [1]
+
+
+def test_pomodoro_cli_history(tmp_path, monkeypatch):
+    """Verify --no-history disables the history"""
+    monkeypatch.setenv("TMR_HISTORY_DIR", str(tmp_path))
+    runner = CliRunner()
+
+    with mock.patch("tmr.pomodoro.PomodoroTimer") as MockTimer:
+        runner.invoke(pomodoro, [])
+        history = MockTimer.call_args.kwargs["history"]
+        assert isinstance(history, History)
+        assert history.directory == str(tmp_path)
+
+        runner.invoke(pomodoro, ["--no-history"])
+        assert MockTimer.call_args.kwargs["history"] is None
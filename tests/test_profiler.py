@@ -0,0 +1,82 @@
+#
+# (c) 2026 Yoichi Tanibayashi
+#
+import pstats
+import time
+from unittest import mock
+
+import pytest
+from click.testing import CliRunner
+
+from tmr.__main__ import cli
+from tmr.profiler import Profiler
+
+
+def busy(sec: float):
+    t_end = time.monotonic() + sec
+    while time.monotonic() < t_end:
+        pass
+
+
+def test_cprofile(tmp_path):
+    """Verify cProfile results are written as pstats and text."""
+    path = str(tmp_path / "out.prof")
+    profiler = Profiler(path)
+    profiler.start()
+    busy(0.01)
+    files = profiler.stop()
+
+    assert files == [path, f"{path}.txt"]
+    ps = pstats.Stats(path)
+    assert "busy" in ps.get_stats_profile().func_profiles
+    assert "busy" in (tmp_path / "out.prof.txt").read_text()
+
+
+def test_sample(tmp_path):
+    """Verify sampled stacks are written in the collapsed format."""
+    path = str(tmp_path / "out.txt")
+    profiler = Profiler(path, "sample", interval=0.001)
+    profiler.start()
+    busy(0.1)
+    files = profiler.stop()
+
+    assert files == [path]
+    assert profiler.n_samples > 0
+    lines = (tmp_path / "out.txt").read_text().splitlines()
+    assert any("busy (test_profiler.py)" in line for line in lines)
+    stack, count = lines[0].rsplit(" ", 1)
+    assert ";" in stack
+    assert int(count) > 0
+
+
+def test_tracemalloc(tmp_path):
+    """Verify the allocation diff is written."""
+    path = str(tmp_path / "out.prof")
+    profiler = Profiler(path, trace_malloc=True)
+    profiler.start()
+    data = [bytearray(1000) for _ in range(100)]
+    files = profiler.stop()
+
+    assert f"{path}.mem.txt" in files
+    assert "test_profiler.py" in (tmp_path / "out.prof.mem.txt").read_text()
+    assert data
+
+
+def test_invalid_mode():
+    """Verify an unknown mode is rejected."""
+    with pytest.raises(ValueError):
+        Profiler("x", "perf")
+
+
+def test_cli_profile(tmp_path):
+    """Verify --profile wraps the subcommand."""
+    path = tmp_path / "out.prof"
+    runner = CliRunner()
+    with mock.patch("tmr.base_timer.BaseTimer") as MockTimer:
+        result = runner.invoke(cli, ["--profile", str(path), "t", "1"])
+
+    assert result.exit_code == 0
+    MockTimer.return_value.main.assert_called_once()
+    assert f"profile: {path}" in result.output
+    ps = pstats.Stats(str(path))
+    assert "timer" in ps.get_stats_profile().func_profiles
@@ -6,6 +6,7 @@ from unittest.mock import patch
 import pytest
 
 from tmr.progress_bar import ProgressBar
+from tmr.renderer import style
 
 
 @pytest.fixture
@@ -78,7 +79,7 @@ def test_get_str_dynamic_bar_len(progress_bar, bar_len, val, expected):
 
 
 def test_display(progress_bar):
-    """TDD Green Phase: Verify display method calls click.secho correctly."""
+    """Verify display method writes the styled bar at once."""
     val = 50.0
     fg = "green"
     blink = True
@@ -89,9 +90,10 @@ def test_display(progress_bar):
     expected_char = progress_bar.ch_head[0]
     expected_str = f"{'>' * 4}{expected_char}{'_' * 5}"
 
-    with patch("tmr.progress_bar.click.secho") as mock_secho:
+    with patch.object(progress_bar, "out") as mock_out:
         progress_bar.display(val, bar_len=bar_len, fg=fg, blink=blink)
 
-        mock_secho.assert_called_once_with(
-            expected_str, fg=fg, blink=blink, nl=False
+        mock_out.write.assert_called_once_with(
+            style(expected_str, fg=fg, blink=blink)
         )
+        mock_out.flush.assert_called_once()
@@ -0,0 +1,117 @@
+#
+# (c) 2026 Yoichi Tanibayashi
+#
+import click
+import pytest
+
+from tmr import ESC, ESQ_EL2
+from tmr.renderer import (
+    Cell,
+    LineRenderer,
+    style,
+    style_prefix,
+    text_width,
+)
+
+
+@pytest.fixture
+def renderer():
+    return LineRenderer()
+
+
+def cells(pbar: str = "|____", fg: str = "white") -> list[Cell]:
+    return [Cell(0, "Timer", bold=True), Cell(6, pbar, fg=fg)]
+
+
+def test_first_render_is_full(renderer):
+    """Verify the first frame rewrites the whole line."""
+    out = renderer.render(cells())
+    assert out.startswith(f"{ESQ_EL2}\r")
+    assert "Timer" in out
+    assert "|____" in out
+
+
+def test_unchanged_frame_writes_nothing(renderer):
+    """Verify an unchanged frame produces zero bytes."""
+    renderer.render(cells())
+    assert renderer.render(cells()) == ""
+
+
+def test_changed_char_only(renderer):
+    """Verify only the changed character is rewritten."""
+    renderer.render(cells())
+    out = renderer.render(cells("/____"))
+
+    assert ESQ_EL2 not in out
+    assert out.startswith(f"{ESC}[7G")
+    assert "/" in out
+    assert "Timer" not in out
+    assert "_" not in out
+
+
+def test_style_change_rewrites_cell(renderer):
+    """Verify a style change rewrites the whole cell."""
+    renderer.render(cells())
+    out = renderer.render(cells(fg="red"))
+
+    assert ESQ_EL2 not in out
+    assert "|____" in out
+    assert "Timer" not in out
+
+
+@pytest.mark.parametrize(
+    "text, width", [("Timer", 5), ("作業", 4), ("作業 A", 6), ("", 0)]
+)
+def test_text_width(text, width):
+    assert text_width(text) == width
+
+
+def test_wide_chars(renderer):
+    """Verify the cursor moves by display width, not by characters."""
+    # 全角のタイトル (4桁) の後ろに、x=5 から表示する
+    renderer.render([Cell(0, "作業", bold=True), Cell(5, "12.0%")])
+    out = renderer.render([Cell(0, "作業", bold=True), Cell(5, "12.5%")])
+    assert out.startswith(f"{ESC}[9G")
+
+    # 同じ幅でも文字数が違う場合
+    renderer.render([Cell(0, "作a"), Cell(4, "x")])
+    out = renderer.render([Cell(0, "abc"), Cell(4, "x")])
+    assert out.startswith(f"{ESC}[1G")
+    assert "abc" in out
+
+
+def test_layout_change_is_full(renderer):
+    """Verify a length change rewrites the whole line."""
+    renderer.render(cells())
+    out = renderer.render(cells("|_____"))
+    assert out.startswith(f"{ESQ_EL2}\r")
+
+
+def test_invalidate(renderer):
+    """Verify invalidate forces a full redraw."""
+    renderer.render(cells())
+    renderer.invalidate()
+    assert renderer.render(cells()).startswith(f"{ESQ_EL2}\r")
+
+
+@pytest.mark.parametrize(
+    "fg, bold, blink",
+    [("white", False, False), ("red", True, False), ("cyan", False, True)],
+)
+def test_style_same_as_click(fg, bold, blink):
+    """Verify style() returns the same string as click.style()."""
+    assert style("abc", fg, bold, blink) == click.style(
+        "abc", fg=fg, bold=bold, blink=blink
+    )
+
+
+def test_style_prefix_cached():
+    """Verify the style prefix is built once per style."""
+    style_prefix.cache_clear()
+    style("a", "red", True, False)
+    style("b", "red", True, False)
+    style("c", "red", False, False)
+
+    info = style_prefix.cache_info()
+    assert info.misses == 2
+    assert info.hits == 1
@@ -0,0 +1,217 @@
+#
+# (c) 2026 Yoichi Tanibayashi
+#
+import io
+from unittest import mock
+
+import pytest
+from click.testing import CliRunner
+from fake_term import FakeTerm
+
+from tmr.__main__ import schedule
+from tmr.clock import VirtualClock
+from tmr.schedule import (
+    DeadlineQueue,
+    ScheduleItem,
+    ScheduleTimer,
+    parse_schedule,
+)
+from tmr.tty_writer import TtyWriter
+
+
+class BellLog(io.StringIO):
+    """Output of a row that records when the bell rings."""
+
+    def __init__(self, title: str, clock: VirtualClock, bells: list):
+        super().__init__()
+        self.title, self.clock, self.bells = title, clock, bells
+
+    def write(self, s: str) -> int:
+        for _ in range(s.count("\a")):
+            self.bells.append((self.title, self.clock.monotonic()))
+        return super().write(s)
+
+
+def new_schedule(items, keys=()):
+    """ScheduleTimer on virtual time, with a bell counter."""
+    clock = VirtualClock()
+    term = FakeTerm(clock, list(keys), height=5)
+    with mock.patch("tmr.multi.Terminal", return_value=term):
+        st = ScheduleTimer(
+            items, alarm_params=(1, 0.5, 1.5), clock=clock, spinner=False
+        )
+    st.out = TtyWriter(stream=io.StringIO())
+    bells: list[tuple[str, float]] = []
+
+    add_row = st.add_row
+
+    def add_row_with_bell(title, sec, color="cyan"):
+        row = add_row(title, sec, color)
+        row.out = TtyWriter(stream=BellLog(title, clock, bells))
+        return row
+
+    st.add_row = add_row_with_bell  # type: ignore[method-assign]
+    return st, clock, bells
+
+
+def titles(st: ScheduleTimer) -> list[str]:
+    return [r.col["title"].value.strip() for r in st.rows]
+
+
+def test_parse_schedule():
+    lines = [
+        "# start, minutes, title, color",
+        "10, 5, Break, yellow",
+        "",
+        '0, 25, "Write, review"',
+        "  # indented comment",
+        "30,1",
+    ]
+    assert parse_schedule(lines) == [
+        ScheduleItem(0.0, 1500.0, "Write, review", "cyan"),
+        ScheduleItem(600.0, 300.0, "Break", "yellow"),
+        ScheduleItem(1800.0, 60.0, "1m", "cyan"),
+    ]
+
+
+@pytest.mark.parametrize(
+    "line",
+    ["x, 5", "0", "-1, 5", "0, -5", "0, 0", "0, 5, Tea, no_such_color"],
+)
+def test_parse_schedule_error(line):
+    with pytest.raises(ValueError, match="line 2"):
+        parse_schedule(["0, 1", line])
+
+
+def test_deadline_queue():
+    q = DeadlineQueue()
+    a = q.add(30.0, "a")
+    q.add(10.0, "b")
+    q.add(10.0, "c")  # 同じ時刻は登録順
+    assert len(q) == 3
+
+    q.cancel(a)
+    q.cancel(a)  # 2回目は何もしない
+    assert len(q) == 2
+    assert q.next_time() == 10.0
+
+    assert q.pop(5.0) is None
+    assert q.pop(10.0) == (10.0, "b")
+    assert q.pop(100.0) == (10.0, "c")
+    assert q.pop(100.0) is None
+    assert len(q) == 0 and q.next_time() is None
+
+
+def test_deadline_queue_cancel_many():
+    """Verify cancelled entries do not pile up in the heap."""
+    q = DeadlineQueue()
+    entries = [q.add(float(i), i) for i in range(10000)]
+    for e in entries[:-1]:
+        q.cancel(e)
+    assert len(q) == 1
+    assert len(q._heap) < 200
+    assert q.pop(1e9) == (9999.0, 9999)
+
+
+def test_no_items():
+    with pytest.raises(ValueError):
+        ScheduleTimer([])
+
+
+def test_main():
+    """Verify items start, ring and leave the screen on time."""
+    items = [
+        ScheduleItem(0.0, 60.0, "A", "cyan"),
+        ScheduleItem(30.0, 60.0, "Bee", "green"),
+        ScheduleItem(600.0, 1.0, "C", "cyan"),
+    ]
+    st, clock, bells = new_schedule(items)
+    seen = []
+    display = st.display
+
+    def display_and_record():
+        display()
+        seen.append((clock.monotonic(), titles(st)))
+
+    st.display = display_and_record  # type: ignore[method-assign]
+    st.main()
+
+    # 満了した時に、2回ずつ鳴る
+    assert [b[0] for b in bells] == ["A", "A", "Bee", "Bee", "C", "C"]
+    assert [b[1] for b in bells] == pytest.approx(
+        [60.0, 60.5, 90.0, 90.5, 601.0, 601.5], abs=0.01
+    )
+    assert titles_at(seen, 30.5) == ["A", "Bee"]
+    assert titles_at(seen, 65.0) == ["Bee"]  # 鳴り終わった行は消える
+    assert st.rows == [] and st.is_active is False
+    assert clock.monotonic() == pytest.approx(603.0, abs=0.1)
+    # 何もない間は、見出しの時計 (1分) と締め切りでしか起きない
+    assert len([t for t, _ in seen if 92.0 < t < 600.0]) <= 9
+
+
+def titles_at(seen, t: float) -> list[str]:
+    """Titles on the screen at t."""
+    return [titles for t_seen, titles in seen if t_seen <= t][-1]
+
+
+def test_pause_moves_deadline():
+    """Verify a paused item times up later by the paused time."""
+    items = [ScheduleItem(0.0, 60.0, "A", "cyan")]
+    keys = [(10.0, " "), (40.0, " ")]  # 30秒ポーズ
+    st, _, bells = new_schedule(items, keys)
+
+    st.main()
+    assert bells[0] == ("A", pytest.approx(90.0, abs=0.01))
+
+
+def test_ack_alarm_removes_row():
+    """Verify a key on a ringing row stops it and removes the row."""
+    items = [
+        ScheduleItem(0.0, 60.0, "A", "cyan"),
+        ScheduleItem(0.0, 120.0, "B", "cyan"),
+    ]
+    st, _, bells = new_schedule(items, [(60.2, " "), (60.3, "Q")])
+    st.main()
+
+    assert bells == [("A", pytest.approx(60.0, abs=0.01))]
+    assert titles(st) == ["B"]
+
+
+def test_many_items():
+    """Verify thousands of items in one process."""
+    items = [
+        ScheduleItem(float(i), 1.0, f"t{i}", "cyan") for i in range(3000)
+    ]
+    st, _, bells = new_schedule(items)
+    st.main()
+
+    assert len(bells) == 6000
+    assert [b[1] for b in bells[::2]] == pytest.approx(
+        [i + 1.0 for i in range(3000)], abs=0.01
+    )
+
+
+def test_cli_schedule(tmp_path):
+    runner = CliRunner()
+    schedule_file = tmp_path / "schedule.csv"
+    schedule_file.write_text("# comment\n0, 3, Tea\n1, 25, Build, red\n")
+
+    with mock.patch("tmr.schedule.ScheduleTimer") as MockSchedule:
+        result = runner.invoke(
+            schedule, [str(schedule_file), "--s1", "0.2", "--s2", "1"]
+        )
+        assert result.exit_code == 0
+        assert MockSchedule.call_args[0][0] == [
+            ScheduleItem(0.0, 180.0, "Tea", "cyan"),
+            ScheduleItem(60.0, 1500.0, "Build", "red"),
+        ]
+        assert MockSchedule.call_args[0][1] == (3, 0.2, 1.0)
+        MockSchedule.return_value.main.assert_called_once()
+
+        schedule_file.write_text("# comment only\n")
+        result = runner.invoke(schedule, [str(schedule_file)])
+        assert result.exit_code == 2
+
+        schedule_file.write_text("0, x\n")
+        result = runner.invoke(schedule, [str(schedule_file)])
+        assert result.exit_code == 2
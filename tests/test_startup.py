@@ -0,0 +1,58 @@
+#
+# (c) 2026 Yoichi Tanibayashi
+#
+import subprocess
+import sys
+import time
+
+import pytest
+
+# `tmr --version`, `tmr --help` の起動時間の上限 (sec)。
+# 目標は 0.1 秒程度。遅いマシンでも落ちないよう余裕を持たせている。
+STARTUP_BUDGET = 0.3
+
+HEAVY_MODULES = ["blessed", "loguru", "importlib.metadata", "tmr.base_timer"]
+
+
+def run_cli(*args: str) -> float:
+    """Run the CLI in a new interpreter and return the best wall time."""
+    cmd = [sys.executable, "-c", "from tmr.__main__ import cli; cli()", *args]
+    times = []
+    for _ in range(3):
+        t0 = time.perf_counter()
+        subprocess.run(cmd, check=True, capture_output=True)
+        times.append(time.perf_counter() - t0)
+    return min(times)
+
+
+@pytest.mark.parametrize(
+    "module", ["tmr.__main__", "tmr.status", "tmr.control", "tmr.history"]
+)
+def test_cli_import_is_light(module):
+    """Verify importing the CLI does not load the heavy modules."""
+    code = (
+        f"import sys; import {module}; "
+        f"print([m for m in {HEAVY_MODULES!r} if m in sys.modules])"
+    )
+    ret = subprocess.run(
+        [sys.executable, "-c", code],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    assert ret.stdout.strip() == "[]"
+
+
+def test_lazy_logger():
+    """Verify tmr.logger is still available."""
+    import tmr
+
+    assert tmr.logger.debug
+
+
+@pytest.mark.parametrize(
+    "args", [["--version"], ["--help"], ["t", "--help"], ["p", "--help"]]
+)
+def test_startup_budget(args):
+    """Verify cold start stays within the budget."""
+    assert run_cli(*args) < STARTUP_BUDGET
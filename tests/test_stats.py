@@ -0,0 +1,83 @@
+#
+# (c) 2026 Yoichi Tanibayashi
+#
+import json
+from unittest.mock import patch
+
+import pytest
+
+from tmr.stats import Histogram, Stats
+
+
+def test_histogram_buckets():
+    """Verify values go to fixed log2 buckets."""
+    h = Histogram("us")
+    for v in [0, 1, 3, 4, 100]:
+        h.add(v)
+    h.add(1e12)  # 範囲外は最後のバケット
+
+    assert len(h.buckets) == Histogram.N_BUCKETS
+    assert h.buckets[0] == 1  # 0
+    assert h.buckets[1] == 1  # 1
+    assert h.buckets[2] == 1  # 3
+    assert h.buckets[3] == 1  # 4
+    assert h.buckets[7] == 1  # 100
+    assert h.buckets[-1] == 1
+    assert h.count == 6
+    assert h.min == 0
+    assert h.max == 1e12
+
+
+def test_histogram_percentile():
+    """Verify percentiles are bucket upper bounds capped at max."""
+    h = Histogram()
+    assert h.percentile(50) == 0.0
+
+    for _ in range(90):
+        h.add(10)  # < 16
+    for _ in range(10):
+        h.add(1000)  # < 1024
+
+    assert h.mean == pytest.approx(109.0)
+    assert h.percentile(50) == 16
+    assert h.percentile(90) == 16
+    assert h.percentile(99) == 1000  # max を超えない
+    assert h.to_dict()["buckets"] == {16: 90, 1024: 10}
+
+
+def test_stats_frame_and_key_latency():
+    """Verify a key is measured until the next frame."""
+    stats = Stats()
+    with patch.object(Stats, "now", side_effect=[1.0, 1.0005, 1.001]):
+        stats.key()  # 1.0
+        t_frame = stats.now()  # 1.0005
+        stats.frame(t_frame, 12)  # 1.001
+
+    assert stats.frame_us.count == 1
+    assert stats.frame_us.total == pytest.approx(500)
+    assert stats.frame_bytes.total == 12
+    assert stats.key_latency_us.count == 1
+    assert stats.key_latency_us.total == pytest.approx(1000)
+
+    # キー入力がなければ、遅延は記録しない
+    stats.frame(stats.now(), 0)
+    assert stats.key_latency_us.count == 1
+
+
+@pytest.mark.parametrize("fmt", Stats.FORMATS)
+def test_stats_report(fmt):
+    """Verify text and JSON reports."""
+    stats = Stats()
+    stats.wakeup()
+    stats.frame(stats.now(), 10)
+
+    report = stats.report(fmt)
+    if fmt == "json":
+        d = json.loads(report)
+        assert d["frames"] == 1
+        assert d["bytes"] == 10
+        assert d["wakeups"] == 1
+        assert set(d["key_latency_us"]) >= {"p50", "p99", "buckets"}
+    else:
+        assert report.startswith("stats: ")
+        assert "1 frames, 10 bytes, 1 wakeups" in report
@@ -0,0 +1,195 @@
+import json
+import os
+import struct
+
+import pytest
+from click.testing import CliRunner
+
+from tmr.__main__ import status
+from tmr.base_timer import BaseTimer
+from tmr.clock import VirtualClock
+from tmr.status import (
+    LAYOUT,
+    OFS_SEQ,
+    StatusFile,
+    TimerStatus,
+    make_dir,
+    parse,
+    read_all,
+    read_status,
+)
+
+
+@pytest.fixture
+def status_file(tmp_path):
+    st = StatusFile(directory=str(tmp_path))
+    yield st
+    st.close()
+
+
+def test_write_read(status_file):
+    """Verify the written state is read back"""
+    status_file.phase = 2
+    status_file.write("WORK", 1500.0, 12.5, 1000.0, paused=True)
+
+    st = read_status(status_file.path)
+    assert st == TimerStatus(
+        pid=os.getpid(),
+        title="WORK",
+        limit=1500.0,
+        elapsed=12.5,
+        t_update=1000.0,
+        active=True,
+        paused=True,
+        alarm=False,
+        phase=2,
+        path=status_file.path,
+    )
+
+
+def test_title_truncated(status_file):
+    """Verify a long title is cut at a character boundary"""
+    status_file.write("あ" * 30, 60.0, 0.0, 0.0)  # 90 bytes
+
+    st = read_status(status_file.path)
+    assert st is not None
+    assert st.title == "あ" * 21  # 63 bytes
+
+
+def test_parse_while_writing(status_file):
+    """Verify a file being written (odd seq) is not parsed"""
+    status_file.write("WORK", 60.0, 0.0, 0.0)
+    with open(status_file.path, "rb") as f:
+        data = bytearray(f.read())
+
+    assert parse(bytes(data)) is not None
+    struct.pack_into("<I", data, OFS_SEQ, 3)
+    assert parse(bytes(data)) is None
+    assert parse(bytes(data[: LAYOUT.size - 1])) is None
+
+
+@pytest.mark.parametrize(
+    "active, paused, t_now, expected",
+    [
+        (True, False, 110.0, 20.0),
+        (True, False, 200.0, 60.0),  # limit を超えない
+        (True, True, 110.0, 10.0),  # ポーズ中は進まない
+        (False, False, 110.0, 10.0),
+    ],
+)
+def test_elapsed_at(active, paused, t_now, expected):
+    st = TimerStatus(0, "T", 60.0, 10.0, 100.0, active, paused, False, -1)
+    assert st.elapsed_at(t_now) == expected
+
+
+def test_line():
+    st = TimerStatus(0, "Tea", 180.0, 0.0, 100.0, True, False, False, -1)
+    assert st.line(100.5) == "Tea 3m00s"  # 残り時間は切り上げ
+    st = TimerStatus(0, "Tea", 180.0, 60.0, 100.0, True, True, False, -1)
+    assert st.line(200.0) == "Tea 2m00s [PAUSE]"
+    st = TimerStatus(0, "Tea", 180.0, 180.0, 100.0, False, False, True, -1)
+    assert st.line(200.0) == "Tea 0m00s [TIME UP]"
+
+
+def test_read_all(tmp_path):
+    """Verify many timers are read and stale files are removed"""
+    files = [StatusFile(f"t{i}", str(tmp_path)) for i in range(3)]
+    for i, f in enumerate(files):
+        f.write(f"timer {i}", 60.0, 0.0, 0.0)
+
+    stale = StatusFile("stale", str(tmp_path))
+    stale.pid = 0x7FFFFFFF  # 存在しないプロセス
+    stale.write("stale", 60.0, 0.0, 0.0)
+
+    assert [st.title for st in read_all(str(tmp_path))] == [
+        "timer 0",
+        "timer 1",
+        "timer 2",
+    ]
+    assert not os.path.exists(stale.path)
+
+    for f in files:
+        f.close()
+    assert read_all(str(tmp_path)) == []
+    assert read_all(str(tmp_path / "none")) == []
+
+
+def test_make_dir(tmp_path):
+    """Verify only a private directory of this user is used."""
+    d = make_dir(str(tmp_path / "new"))
+    assert os.stat(d).st_mode & 0o777 == 0o700
+
+    loose = tmp_path / "loose"
+    loose.mkdir(mode=0o755)
+    loose.chmod(0o755)
+    with pytest.raises(PermissionError):
+        StatusFile(directory=str(loose))
+    assert read_all(str(loose)) == []
+
+    link = tmp_path / "link"
+    link.symlink_to(d)
+    with pytest.raises(PermissionError):
+        StatusFile(directory=str(link))
+
+
+def test_no_follow(tmp_path):
+    """Verify a planted symlink is not followed."""
+    victim = tmp_path / "victim"
+    victim.write_text("keep")
+    d = make_dir(str(tmp_path / "st"))
+    os.symlink(victim, os.path.join(d, f"{os.getpid()}.status"))
+
+    with pytest.raises(OSError):
+        StatusFile(directory=d)
+    assert victim.read_text() == "keep"
+    assert read_all(d) == []
+
+
+def test_base_timer_publish(status_file, monkeypatch):
+    """Verify BaseTimer writes its state only when it changes"""
+    clock = VirtualClock()
+    monkeypatch.setattr(
+        BaseTimer, "display", lambda self: None
+    )  # 画面は使わない
+    timer = BaseTimer(
+        ("Tea ", "white"), 30.0, clock=clock, status=status_file
+    )
+
+    states: list[TimerStatus] = []
+    orig_write = status_file.write
+
+    def write(*args, **kwargs):
+        orig_write(*args, **kwargs)
+        st = read_status(status_file.path)
+        assert st is not None
+        states.append(st)
+
+    monkeypatch.setattr(status_file, "write", write)
+    monkeypatch.setattr(timer, "ring_alarm", lambda: False)
+    timer.main()
+
+    # 開始時と満了時 (と終了処理) だけ書く。毎フレームは書かない
+    assert len(states) == 3
+    assert states[0].title == "Tea"
+    assert (states[0].active, states[0].elapsed) == (True, 0.0)
+    assert (states[1].active, states[1].alarm) == (False, True)
+    assert states[1].elapsed == 30.0
+    assert (states[2].active, states[2].alarm) == (False, False)
+
+
+def test_cli_status(tmp_path, monkeypatch):
+    monkeypatch.setenv("TMR_STATUS_DIR", str(tmp_path))
+    runner = CliRunner()
+
+    result = runner.invoke(status, [])
+    assert result.exit_code == 1
+    assert result.output == ""
+
+    with StatusFile("a", str(tmp_path)) as f:
+        f.write("WORK", 1500.0, 0.0, 0.0, paused=True)
+        result = runner.invoke(status, [])
+        assert result.exit_code == 0
+        assert result.output == "WORK 25m00s [PAUSE]\n"
+
+        result = runner.invoke(status, ["-f", "json"])
+        assert json.loads(result.output)[0]["remain"] == 1500.0
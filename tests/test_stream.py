@@ -0,0 +1,142 @@
+import contextlib
+import io
+import json
+
+import pytest
+from fake_term import FakeTerm
+
+from tmr.base_timer import BaseTimer
+from tmr.clock import VirtualClock
+from tmr.stream import EventStream
+
+TS = VirtualClock.DEF_WALL
+
+
+def test_format_json():
+    """Verify JSON lines are compact and keep non-ASCII"""
+    stream = EventStream("json")
+    line = stream.format("tick", TS + 0.12345, {"title": "作業", "n": 1})
+    assert line == (
+        f'{{"ts":{round(TS + 0.12345, 3)},"event":"tick",'
+        '"title":"作業","n":1}'
+    )
+
+
+def test_format_text():
+    """Verify the text format quotes values with spaces"""
+    stream = EventStream("text")
+    line = stream.format("end", TS, {"title": "My timer", "reason": "quit"})
+    date, event, *fields = line.split(" ", 2)
+    assert event == "end"
+    assert fields == ['title="My timer" reason=quit']
+    assert len(date) == len("2026-01-01T00:00:00")
+
+
+def test_invalid_format():
+    with pytest.raises(ValueError):
+        EventStream("xml")
+
+
+@pytest.mark.parametrize(
+    "mode, isatty, expected",
+    [
+        ("auto", True, None),
+        ("auto", False, "json"),
+        ("off", False, None),
+        ("text", True, "text"),
+        ("json", True, "json"),
+    ],
+)
+def test_resolve(mode, isatty, expected):
+    """Verify --stream modes"""
+
+    class Out(io.StringIO):
+        def isatty(self):
+            return isatty
+
+    assert EventStream.resolve(mode, Out()) == expected
+
+
+def test_emit():
+    """Verify one line is written per event"""
+    out = io.StringIO()
+    stream = EventStream("json", out=out)
+    stream.emit("start", TS, {"limit": 60})
+    stream.emit("end", TS, {"reason": "timeup"})
+
+    lines = out.getvalue().splitlines()
+    assert [json.loads(x)["event"] for x in lines] == ["start", "end"]
+    assert stream.events == 2
+
+
+def run_stream(
+    monkeypatch, keys: list[tuple[float, str]], limit: float = 30.0
+) -> tuple[BaseTimer, list[dict], str]:
+    """Run a BaseTimer in stream mode on virtual time."""
+    clock = VirtualClock()
+    term = FakeTerm(clock, keys, tty=False)
+    monkeypatch.setattr("tmr.base_timer.Terminal", lambda: term)
+
+    out = io.StringIO()
+    timer = BaseTimer(
+        ("Work ", "cyan"),
+        limit,
+        clock=clock,
+        stream=EventStream("json", tick=10.0, out=out),
+    )
+    screen = io.StringIO()
+    timer.out.stream = screen
+    with contextlib.redirect_stdout(screen):
+        timer.main()
+
+    events = [json.loads(x) for x in out.getvalue().splitlines()]
+    return timer, events, screen.getvalue()
+
+
+def test_base_timer_stream(monkeypatch):
+    """Verify the events of a run with pause and seek"""
+    keys = [(5.0, " "), (8.0, " "), (12.0, "J")]
+    timer, events, screen = run_stream(monkeypatch, keys)
+
+    names = [e["event"] for e in events]
+    assert names == [
+        "start",
+        "pause",
+        "resume",
+        "seek",
+        "tick",  # 8 + 10 = 18
+        "alarm",
+        "end",
+    ]
+    ev = {e["event"]: e for e in events}
+
+    assert ev["start"]["title"] == "Work"
+    assert ev["start"]["elapsed"] == 0.0
+    assert ev["start"]["limit"] == 30.0
+    assert ev["pause"]["elapsed"] == pytest.approx(5.0)
+    assert ev["resume"]["elapsed"] == pytest.approx(5.0)  # ポーズ中は止まる
+    assert ev["seek"]["offset"] == pytest.approx(10.0)
+    assert ev["seek"]["elapsed"] == pytest.approx(19.0, abs=0.01)
+    assert ev["tick"]["elapsed"] == pytest.approx(25.0, abs=0.01)
+    assert ev["end"]["reason"] == "timeup"
+    assert ev["end"]["remain"] == 0.0
+    assert ev["end"]["ts"] == pytest.approx(TS + 30.0 - 10.0 + 3.0, abs=0.1)
+
+    assert screen == ""  # 画面には何も書かない
+    assert timer.alarm_active is False
+
+
+def test_base_timer_stream_quit(monkeypatch):
+    """Verify quit ends the stream without an alarm"""
+    _, events, _ = run_stream(monkeypatch, [(25.0, "Q")])
+
+    assert [e["event"] for e in events] == [
+        "start",
+        "tick",
+        "tick",
+        "end",
+    ]
+    assert [e["elapsed"] for e in events[1:3]] == pytest.approx(
+        [10.0, 20.0], abs=0.01
+    )
+    assert events[-1]["reason"] == "quit"
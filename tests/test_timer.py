@@ -3,6 +3,8 @@ from unittest import mock
 from click.testing import CliRunner
 
 from tmr.__main__ import timer
+from tmr.stats import Stats
+from tmr.stream import EventStream
 
 
 def test_timer_help():
@@ -16,7 +18,7 @@ def test_timer_help():
 
 def test_timer_exec():
     runner = CliRunner()
-    with mock.patch("tmr.__main__.BaseTimer") as MockTimer:
+    with mock.patch("tmr.base_timer.BaseTimer") as MockTimer:
         instance = MockTimer.return_value
         instance.main.return_value = False
 
@@ -32,5 +34,49 @@ def test_timer_exec():
         # args[0][1] is limit (1 * 60 = 60)
         assert args[0][1] == 60
 
+        # default refresh options
+        assert args[1]["fps"] == 5.0
+        assert args[1]["spinner"] is True
+        assert args[1]["stats"] is None
+
         # Verify main called
         instance.main.assert_called_once()
+
+
+def test_timer_refresh_opts():
+    runner = CliRunner()
+    with mock.patch("tmr.base_timer.BaseTimer") as MockTimer:
+        result = runner.invoke(timer, ["1", "--fps", "1", "--no-spinner"])
+
+        assert result.exit_code == 0
+        args = MockTimer.call_args
+        assert args[1]["fps"] == 1.0
+        assert args[1]["spinner"] is False
+
+
+def test_timer_stats():
+    runner = CliRunner()
+    with mock.patch("tmr.base_timer.BaseTimer") as MockTimer:
+        result = runner.invoke(
+            timer, ["1", "--stats-format", "json"], env={"TMR_STATS": "1"}
+        )
+
+        assert result.exit_code == 0
+        stats = MockTimer.call_args[1]["stats"]
+        assert isinstance(stats, Stats)
+        assert '"frames": 0' in result.output
+
+
+def test_timer_stream():
+    runner = CliRunner()
+    with mock.patch("tmr.base_timer.BaseTimer") as MockTimer:
+        # CliRunner の出力先は端末ではないので、auto ならストリームになる
+        result = runner.invoke(timer, ["1", "--tick", "5"])
+        assert result.exit_code == 0
+        stream = MockTimer.call_args[1]["stream"]
+        assert isinstance(stream, EventStream)
+        assert (stream.fmt, stream.tick) == ("json", 5.0)
+
+        result = runner.invoke(timer, ["1", "--stream", "off"])
+        assert result.exit_code == 0
+        assert MockTimer.call_args[1]["stream"] is None
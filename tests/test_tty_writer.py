@@ -0,0 +1,61 @@
+#
+# (c) 2026 Yoichi Tanibayashi
+#
+import io
+import os
+
+from tmr import ESQ_SYNC_BEGIN, ESQ_SYNC_END
+from tmr.tty_writer import TtyWriter
+
+
+def test_buffered_until_flush():
+    """Verify text is buffered and written on flush."""
+    stream = io.StringIO()
+    out = TtyWriter(stream=stream)
+
+    out.write("abc")
+    out.write("")
+    out.write("def")
+    assert stream.getvalue() == ""
+
+    assert out.flush() == 6
+    assert stream.getvalue() == "abcdef"
+    assert out.bytes_written == 6
+    assert out.flushes == 1
+
+    # 空のバッファは書かない
+    assert out.flush() == 0
+    assert out.flushes == 1
+
+
+def test_sync_markers():
+    """Verify a frame is wrapped in synchronized output markers."""
+    stream = io.StringIO()
+    out = TtyWriter(stream=stream, sync=True)
+
+    out.write("frame")
+    out.flush()
+    assert stream.getvalue() == f"{ESQ_SYNC_BEGIN}frame{ESQ_SYNC_END}"
+
+
+def test_single_os_write(tmp_path, monkeypatch):
+    """Verify a frame goes to the file descriptor in one os.write."""
+    calls = []
+    orig_write = os.write
+
+    def counting_write(fd, data):
+        calls.append(bytes(data))
+        return orig_write(fd, data)
+
+    monkeypatch.setattr(os, "write", counting_write)
+
+    path = tmp_path / "out.txt"
+    with open(path, "w") as stream:
+        out = TtyWriter(stream=stream)
+        out.write("\r")
+        out.write("12:00:00")
+        out.write(" Timer")
+        out.flush()
+
+    assert calls == [b"\r12:00:00 Timer"]
+    assert path.read_bytes() == b"\r12:00:00 Timer"
@@ -1,46 +1,96 @@
-from unittest import mock
+import io
 
-from tmr.utils import ESQ_CSR_OFF, ESQ_CSR_ON, ESQ_EL2, TerminalContext
+import pytest
+
+from tmr.tty_writer import TtyWriter
+from tmr.utils import (
+    ESQ_CSR_OFF,
+    ESQ_CSR_ON,
+    ESQ_EL2,
+    TerminalContext,
+    t_str,
+)
+
+
+def new_writer() -> tuple[TtyWriter, io.StringIO]:
+    stream = io.StringIO()
+    return TtyWriter(stream=stream), stream
 
 
 def test_terminal_context_normal():
     """Verify cursor is hidden on enter and shown on exit"""
-    with mock.patch("click.echo") as mock_echo:
-        with TerminalContext():
-            pass
-
+    out, stream = new_writer()
+    with TerminalContext(out):
         # Enter: hide cursor
-        mock_echo.assert_any_call(ESQ_CSR_OFF, nl=False)
-        # Exit: show cursor
-        mock_echo.assert_any_call(f"{ESQ_CSR_ON}", nl=False)
+        assert stream.getvalue() == ESQ_CSR_OFF
+
+    # Exit: show cursor
+    assert stream.getvalue() == f"{ESQ_CSR_OFF}{ESQ_CSR_ON}"
+    assert out.flushes == 2
 
 
 def test_terminal_context_keyboard_interrupt():
     """Verify KeyboardInterrupt is suppressed and cursor is shown"""
-    with mock.patch("click.echo") as mock_echo:
-        with TerminalContext():
-            raise KeyboardInterrupt()
+    out, stream = new_writer()
+    with TerminalContext(out):
+        raise KeyboardInterrupt()
 
-        # Enter: hide cursor
-        mock_echo.assert_any_call(ESQ_CSR_OFF, nl=False)  # type: ignore[unreachable]
-        # Exit: show cursor
-        mock_echo.assert_any_call(f"{ESQ_CSR_ON}", nl=False)
-        # Exit: handle interrupt
-        mock_echo.assert_any_call(f"\n{ESQ_EL2}Aborted.")
+    # Enter: hide cursor, Exit: show cursor and handle interrupt
+    assert stream.getvalue() == (  # type: ignore[unreachable]
+        f"{ESQ_CSR_OFF}{ESQ_CSR_ON}\n{ESQ_EL2}Aborted.\n"
+    )
+
+
+def test_terminal_context_not_tty():
+    """Verify no escapes are written for a stream"""
+    out, stream = new_writer()
+    with TerminalContext(out, tty=False):
+        raise KeyboardInterrupt()
+
+    assert stream.getvalue() == ""  # type: ignore[unreachable]
 
 
 def test_terminal_context_other_exception():
     """Verify other exceptions are NOT suppressed"""
-    with mock.patch("click.echo") as mock_echo:
-        try:
-            with TerminalContext():
-                raise ValueError("Test Error")
-        except ValueError:
-            pass
-        else:
-            assert False, "ValueError should be raised"  # type: ignore[unreachable]
+    out, stream = new_writer()
+    try:
+        with TerminalContext(out):
+            raise ValueError("Test Error")
+    except ValueError:
+        pass
+    else:
+        assert False, "ValueError should be raised"  # type: ignore[unreachable]
 
-        # Enter: hide cursor
-        mock_echo.assert_any_call(ESQ_CSR_OFF, nl=False)
-        # Exit: show cursor (always called in finally)
-        mock_echo.assert_any_call(f"{ESQ_CSR_ON}", nl=False)
+    # Enter: hide cursor, Exit: show cursor (always called)
+    assert stream.getvalue() == f"{ESQ_CSR_OFF}{ESQ_CSR_ON}"
+
+
+@pytest.mark.parametrize(
+    "sec, omit_sec, expected",
+    [
+        (0, False, " 0m00s"),
+        (59, False, " 0m59s"),
+        (180, True, " 3m"),
+        (181, True, " 3m01s"),
+        (3661, False, "1h01m01s"),
+        (7200, True, "2h00m"),
+        (86399, False, "23h59m59s"),
+        (90061, False, "1d01h01m01s"),
+        (2 * 86400, True, "2d00h00m"),
+    ],
+)
+def test_t_str(sec, omit_sec, expected):
+    """Verify time string formatting, including days"""
+    assert t_str(sec, omit_sec) == expected
+
+
+def test_t_str_cached():
+    """Verify time strings are cached per integer second"""
+    t_str.cache_clear()
+    t_str(100)
+    t_str(100)
+    t_str(100, True)
+
+    info = t_str.cache_info()
+    assert info.misses == 2
+    assert info.hits == 1
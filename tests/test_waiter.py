@@ -0,0 +1,53 @@
+#
+# (c) 2026 Yoichi Tanibayashi
+#
+import os
+import threading
+import time
+
+import pytest
+
+from tmr.waiter import Waiter
+
+
+@pytest.fixture
+def waiter():
+    w = Waiter()
+    yield w
+    w.close()
+
+
+def test_wait_timeout(waiter):
+    """Verify wait returns an empty set on timeout."""
+    t0 = time.monotonic()
+    assert waiter.wait(0.05) == set()
+    assert time.monotonic() - t0 >= 0.04
+
+
+def test_wake(waiter):
+    """Verify wake interrupts wait immediately."""
+    threading.Timer(0.01, waiter.wake).start()
+
+    t0 = time.monotonic()
+    assert waiter.wait(5.0) == set()
+    assert time.monotonic() - t0 < 1.0
+
+    # wake のバイトは読み捨てられている
+    assert waiter.wait(0) == set()
+
+
+def test_fd_ready(waiter):
+    """Verify the tag of a ready fd is returned."""
+    r, w = os.pipe()
+    try:
+        waiter.add(r, "pipe")
+        assert waiter.wait(0) == set()
+
+        os.write(w, b"x")
+        assert waiter.wait(1.0) == {"pipe"}
+
+        waiter.remove(r)
+        assert waiter.wait(0) == set()
+    finally:
+        os.close(r)
+        os.close(w)